@@ -0,0 +1,123 @@
+"""
+Per-request latency for each database connection mode.
+
+    python -m benchmarks.connections --requests 500
+
+Every mode runs in a fresh interpreter because database settings are read
+once at startup. Requests go through the WSGI handler, so connections are
+opened and closed exactly as they are behind a real server. Point the
+POSTGRES_* variables at a migrated local database, or set DB_ENGINE=sqlite
+to use the SQLite stand-in (the pool mode only applies to Postgres).
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+MODES = {
+    "new connection per request": {
+        "POSTGRES_CONN_MAX_AGE": "0",
+        "POSTGRES_POOL": "false",
+    },
+    "persistent connections": {
+        "POSTGRES_CONN_MAX_AGE": "60",
+        "POSTGRES_CONN_HEALTH_CHECKS": "true",
+        "POSTGRES_POOL": "false",
+    },
+    "connection pool": {
+        "POSTGRES_CONN_MAX_AGE": "0",
+        "POSTGRES_CONN_HEALTH_CHECKS": "true",
+        "POSTGRES_POOL": "true",
+    },
+}
+
+
+def measure(path, requests):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_service.settings")
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    path, _, query = path.partition("?")
+    timings = []
+
+    def start_response(status, headers):
+        if not status.startswith("200"):
+            raise RuntimeError(f"GET {path} returned {status}")
+
+    for _ in range(requests):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "localhost",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.url_scheme": "http",
+        }
+        start = time.perf_counter()
+        result = application(environ, start_response)
+        b"".join(result)
+        result.close()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def summarize(timings):
+    percentiles = statistics.quantiles(timings, n=100)
+    return {
+        "mean": statistics.fmean(timings),
+        "p50": percentiles[49],
+        "p95": percentiles[94],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument(
+        "--path", default="/api/theatre/performances/?page_size=1"
+    )
+    parser.add_argument("--worker", action="store_true", help="internal")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(summarize(measure(args.path, args.requests))))
+        return
+
+    print(f"{'mode':<30}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, env in MODES.items():
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.connections",
+                "--worker",
+                "--requests",
+                str(args.requests),
+                "--path",
+                args.path,
+            ],
+            env={**os.environ, **env},
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode:
+            print(f"{mode:<30}failed: {completed.stderr.strip()[-200:]}")
+            continue
+        result = json.loads(completed.stdout.splitlines()[-1])
+        print(
+            f"{mode:<30}{result['mean']:>10.2f}"
+            f"{result['p50']:>10.2f}{result['p95']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
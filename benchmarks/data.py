@@ -0,0 +1,170 @@
+"""Synthetic catalogue and booking data for benchmarks."""
+
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Actor,
+    Genre,
+    Reservation,
+    Ticket,
+)
+from theatre.search import rebuild_index
+from theatre.seat_map import SeatMap
+
+
+PASSWORD = "benchmark"
+
+
+@contextmanager
+def test_database():
+    """Run the block against a fresh test database dropped afterwards."""
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate(
+    halls=10,
+    plays=200,
+    performances=2000,
+    tickets=100_000,
+    users=200,
+    batch_size=5000,
+    seed=0,
+):
+    """
+    Fill the database and return the created users. Tickets fill each
+    performance row by row from the first seat, so the first free seat of
+    every performance is simply its ticket count.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    password = make_password(PASSWORD)
+    user_objects = get_user_model().objects.bulk_create(
+        get_user_model()(username=f"user{number}", password=password)
+        for number in range(users)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f"Genre {number}") for number in range(20)
+    )
+    Actor.objects.bulk_create(
+        Actor(first_name=f"First{number}", last_name=f"Last{number}")
+        for number in range(500)
+    )
+    hall_objects = [
+        TheatreHall(
+            name=f"Hall {number}",
+            rows=rng.randint(10, 30),
+            seats_in_row=rng.randint(10, 40),
+        )
+        for number in range(halls)
+    ]
+    for hall in hall_objects:
+        hall.capacity = hall.get_layout().capacity
+    TheatreHall.objects.bulk_create(hall_objects)
+    play_objects = Play.objects.bulk_create(
+        Play(title=f"Play {number}", description=f"Description {number}")
+        for number in range(plays)
+    )
+    performance_objects = []
+    for batch in batched(
+        (
+            Performance(
+                play=rng.choice(play_objects),
+                theatre_hall=rng.choice(hall_objects),
+                show_time=now + timedelta(minutes=rng.randint(0, 525_600)),
+            )
+            for _ in range(performances)
+        ),
+        batch_size,
+    ):
+        performance_objects.extend(Performance.objects.bulk_create(batch))
+
+    # Bulk inserts skip the signals that keep the search index current
+    rebuild_index(batch_size)
+    _generate_tickets(
+        rng, performance_objects, user_objects, tickets, batch_size
+    )
+    return user_objects
+
+
+def _seats(rng, performance_objects, tickets):
+    remaining = tickets
+    for performance in performance_objects:
+        hall = performance.theatre_hall
+        sold = min(remaining, rng.randint(0, hall.capacity))
+        remaining -= sold
+        seat_map = SeatMap(
+            hall.rows, hall.seats_in_row, layout=hall.get_layout()
+        )
+        for index in range(sold):
+            row, seat = divmod(index, hall.seats_in_row)
+            seat_map.take(row + 1, seat + 1)
+            yield performance, row + 1, seat + 1
+        performance.seat_bitmap = bytes(seat_map.bitmap)
+        performance.seat_bitmap_layout = seat_map.layout.key
+        performance.tickets_sold = sold
+        if not remaining:
+            break
+
+
+def _generate_tickets(
+    rng, performance_objects, user_objects, tickets, batch_size
+):
+    reservation = None
+    for batch in batched(
+        _seats(rng, performance_objects, tickets), batch_size
+    ):
+        reservations = []
+        ticket_objects = []
+        for performance, row, seat in batch:
+            if reservation is None or rng.random() < 0.3:
+                reservation = Reservation(user=rng.choice(user_objects))
+                reservations.append(reservation)
+            ticket_objects.append(
+                Ticket(
+                    performance=performance,
+                    reservation=reservation,
+                    row=row,
+                    seat=seat,
+                )
+            )
+        Reservation.objects.bulk_create(reservations)
+        Ticket.objects.bulk_create(ticket_objects)
+
+    Performance.objects.bulk_update(
+        performance_objects,
+        ["seat_bitmap", "seat_bitmap_layout", "tickets_sold"],
+        batch_size=batch_size,
+    )
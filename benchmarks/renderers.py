@@ -0,0 +1,81 @@
+"""
+Compare DRF's JSONRenderer with the orjson-backed FastJSONRenderer.
+
+    python -m benchmarks.renderers --rows 5000 --repeat 20
+
+Large ticket and performance list payloads are built once from a
+generated throwaway database, then rendered by both renderers. The
+outputs are checked to be identical.
+"""
+
+import argparse
+import os
+
+from benchmarks.serializers import cases, timed
+
+
+def payloads(rows):
+    payloads = {}
+    for name, (serializer_class, values_class, queryset) in cases().items():
+        values_serializer = values_class()
+        page = list(values_serializer.get_queryset(queryset)[:rows])
+        payloads[f"{name} (values)"] = values_serializer.to_representation(
+            page
+        )
+        payloads[f"{name} (model)"] = serializer_class(
+            queryset[:rows], many=True
+        ).data
+    return payloads
+
+
+def compare(rows, repeat):
+    from rest_framework.renderers import JSONRenderer
+
+    from theatre_service.renderers import FastJSONRenderer
+
+    json_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+    results = {}
+    for name, data in payloads(rows).items():
+        if json_renderer.render(data) != fast_renderer.render(data):
+            raise RuntimeError(f"{name}: outputs differ")
+        results[name] = (
+            len(fast_renderer.render(data)),
+            timed(lambda: json_renderer.render(data), repeat),
+            timed(lambda: fast_renderer.render(data), repeat),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--tickets", type=int, default=20_000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_service.settings")
+    import django
+
+    django.setup()
+    from benchmarks import data
+
+    with data.test_database():
+        data.generate(
+            performances=max(args.rows, 500),
+            tickets=max(args.tickets, args.rows),
+        )
+        results = compare(args.rows, args.repeat)
+
+    print(
+        f"{'payload':<24}{'KiB':>8}{'json ms':>10}{'orjson ms':>11}"
+        f"{'speedup':>10}"
+    )
+    for name, (size, json_ms, fast_ms) in results.items():
+        print(
+            f"{name:<24}{size / 1024:>8.0f}{json_ms:>10.2f}{fast_ms:>11.2f}"
+            f"{json_ms / fast_ms:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare the ModelSerializer and .values() paths of the list endpoints.
+
+    python -m benchmarks.serializers --rows 1000 --repeat 20
+
+Both paths read the same rows from a generated throwaway database and
+render them to JSON, so the numbers include the query, building the
+representation and rendering.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def cases():
+    from django.db.models import Count
+
+    from theatre import serializers, values_serializers
+    from theatre.models import Performance, Reservation, Ticket
+
+    return {
+        "performances": (
+            serializers.PerformanceListSerializer,
+            values_serializers.PerformanceListValuesSerializer,
+            Performance.objects.for_listing().order_by("show_time", "id"),
+        ),
+        "tickets": (
+            serializers.TicketListSerializer,
+            values_serializers.TicketListValuesSerializer,
+            Ticket.objects.select_related(
+                "performance__play", "performance__theatre_hall"
+            )
+            .defer("performance__seat_bitmap")
+            .order_by("-created_at", "-id"),
+        ),
+        "reservations": (
+            serializers.ReservationListSerializer,
+            values_serializers.ReservationListValuesSerializer,
+            Reservation.objects.prefetch_related("tickets")
+            .annotate(tickets_count=Count("tickets"))
+            .order_by("-created_at", "-id"),
+        ),
+    }
+
+
+def compare(rows, repeat):
+    from rest_framework.renderers import JSONRenderer
+
+    renderer = JSONRenderer()
+    results = {}
+    for name, (serializer_class, values_class, queryset) in cases().items():
+        values_serializer = values_class()
+
+        def model_path():
+            return renderer.render(
+                serializer_class(queryset[:rows], many=True).data
+            )
+
+        def values_path():
+            page = list(values_serializer.get_queryset(queryset)[:rows])
+            return renderer.render(values_serializer.to_representation(page))
+
+        if model_path() != values_path():
+            raise RuntimeError(f"{name}: outputs differ")
+        results[name] = (timed(model_path, repeat), timed(values_path, repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--tickets", type=int, default=20_000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_service.settings")
+    import django
+
+    django.setup()
+    from benchmarks import data
+
+    with data.test_database():
+        data.generate(performances=max(args.rows, 500), tickets=args.tickets)
+        results = compare(args.rows, args.repeat)
+
+    print(f"{'list':<16}{'model ms':>12}{'values ms':>12}{'speedup':>10}")
+    for name, (model_ms, values_ms) in results.items():
+        print(
+            f"{name:<16}{model_ms:>12.2f}{values_ms:>12.2f}"
+            f"{model_ms / values_ms:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
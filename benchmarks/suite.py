@@ -0,0 +1,247 @@
+"""
+Replay booking traffic against a generated catalogue.
+
+    python -m benchmarks.suite --performances 2000 --tickets 100000
+
+The suite creates a throwaway test database (SQLite with DB_ENGINE=sqlite,
+otherwise the Postgres server from the POSTGRES_* variables), fills it with
+benchmarks.data and sends every scenario through the Django test client.
+Each endpoint reports p50/p95/p99 latency, database queries per request and
+the peak memory allocated while serving one request.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Traffic:
+    """Requests of the scripted scenarios, keyed by endpoint name."""
+
+    def __init__(self, client, users, seed=0):
+        from django.db.models import Count
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from theatre.models import Performance
+
+        self.client = client
+        self.rng = random.Random(seed)
+        self.users = users
+        self.tokens = {
+            user.id: f"Bearer {AccessToken.for_user(user)}" for user in users
+        }
+        self.performances = list(
+            Performance.objects.select_related("theatre_hall")
+            .defer("seat_bitmap")
+            .annotate(sold=Count("tickets"))
+        )
+        self.dates = sorted(
+            {performance.show_time.date() for performance in self.performances}
+        )
+
+    def headers(self, user):
+        return {"HTTP_AUTHORIZATION": self.tokens[user.id]}
+
+    def plays(self):
+        return self.client.get("/api/theatre/plays/")
+
+    def performances_by_date(self):
+        date = self.rng.choice(self.dates).isoformat()
+        return self.client.get(
+            f"/api/theatre/performances/?date_from={date}&date_to={date}"
+        )
+
+    def seat_map(self):
+        performance = self.rng.choice(self.performances)
+        return self.client.get(
+            f"/api/theatre/performances/{performance.id}/seat-map/"
+        )
+
+    def book_seats(self):
+        user = self.rng.choice(self.users)
+        performance = self.rng.choice(self.performances)
+        hall = performance.theatre_hall
+        tickets = []
+        for _ in range(min(2, hall.capacity - performance.sold)):
+            row, seat = divmod(performance.sold, hall.seats_in_row)
+            performance.sold += 1
+            tickets.append(
+                {
+                    "performance": performance.id,
+                    "row": row + 1,
+                    "seat": seat + 1,
+                }
+            )
+        return self.client.post(
+            "/api/theatre/reservations/",
+            data=json.dumps({"user": user.id, "tickets": tickets}),
+            content_type="application/json",
+            **self.headers(user),
+        )
+
+    def my_reservations(self):
+        user = self.rng.choice(self.users)
+        return self.client.get(
+            "/api/theatre/reservations/mine/", **self.headers(user)
+        )
+
+    def scenarios(self):
+        return {
+            "browse catalogue": [self.plays, self.performances_by_date],
+            "view seat map": [self.seat_map],
+            "book seats": [self.seat_map, self.book_seats],
+            "list my reservations": [self.my_reservations],
+        }
+
+
+def percentile(timings, point):
+    if len(timings) == 1:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[point - 1]
+
+
+def measure(requests, iterations, allocations):
+    from django.db import connection
+
+    results = {}
+    for name, request in requests.items():
+        timings = []
+        queries = []
+        for _ in range(iterations):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                response = request()
+                timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(
+                    f"{name} returned {response.status_code}: "
+                    f"{response.content[:200]!r}"
+                )
+            queries.append(counter.count)
+
+        peaks = []
+        tracemalloc.start()
+        for _ in range(allocations):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            request()
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        tracemalloc.stop()
+
+        results[name] = {
+            "requests": iterations,
+            "p50": percentile(timings, 50),
+            "p95": percentile(timings, 95),
+            "p99": percentile(timings, 99),
+            "queries": statistics.fmean(queries),
+            "allocated_kib": (
+                statistics.fmean(peaks) / 1024 if peaks else None
+            ),
+        }
+    return results
+
+
+def report(scenarios):
+    print(
+        f"{'endpoint':<34}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'queries':>9}{'KiB':>9}"
+    )
+    for scenario, endpoints in scenarios.items():
+        print(scenario)
+        for name, result in endpoints.items():
+            allocated = result["allocated_kib"]
+            allocated = "-" if allocated is None else f"{allocated:.1f}"
+            print(
+                f"  {name:<32}{result['p50']:>9.2f}{result['p95']:>9.2f}"
+                f"{result['p99']:>9.2f}{result['queries']:>9.1f}"
+                f"{allocated:>9}"
+            )
+
+
+def run(args):
+    from django.conf import settings
+    from django.test import Client, override_settings
+
+    from benchmarks import data
+
+    # All traffic comes from one client, so lift the throttle rates while
+    # keeping the checks in every request
+    unthrottled = override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": dict.fromkeys(
+                settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+                "1000000/s",
+            ),
+        }
+    )
+    with data.test_database(), unthrottled:
+        start = time.perf_counter()
+        users = data.generate(
+            halls=args.halls,
+            plays=args.plays,
+            performances=args.performances,
+            tickets=args.tickets,
+            users=args.users,
+            seed=args.seed,
+        )
+        print(f"generated data in {time.perf_counter() - start:.1f}s")
+
+        traffic = Traffic(Client(), users, seed=args.seed)
+        scenarios = {
+            scenario: measure(
+                {request.__name__: request for request in requests},
+                args.requests,
+                args.allocations,
+            )
+            for scenario, requests in traffic.scenarios().items()
+        }
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--halls", type=int, default=10)
+    parser.add_argument("--plays", type=int, default=200)
+    parser.add_argument("--performances", type=int, default=2000)
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--allocations",
+        type=int,
+        default=20,
+        help="requests per endpoint traced with tracemalloc",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_service.settings")
+    import django
+
+    django.setup()
+
+    scenarios = run(args)
+    report(scenarios)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(scenarios, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Production server settings, read by gunicorn from the working directory:
+
+    gunicorn theatre_service.asgi:application
+
+Every knob can be overridden through the environment.
+"""
+
+import multiprocessing
+import os
+import shutil
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8001")
+workers = int(
+    os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+)
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+# Request metrics of all the workers are added up from files in this
+# directory (prometheus_client multiprocess mode). Workers inherit the
+# variable, which has to be set before they import prometheus_client.
+if os.getenv("REQUEST_METRICS", "false") == "true":
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", "/tmp/theatre-prometheus"
+    )
+
+
+def on_starting(server):
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        # Files left by a previous run would be counted again
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
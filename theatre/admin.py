@@ -5,29 +5,47 @@ from .models import (
     Performance,
     Actor,
     Genre,
+    PlayActor,
+    PlayGenre,
     Reservation,
     Ticket,
+    SeatHold,
+    HeldSeat,
 )
 
 
 @admin.register(TheatreHall)
 class TheatreHallAdmin(admin.ModelAdmin):
-    list_display = ("name", "rows", "seats_in_row")
+    list_display = ("name", "rows", "seats_in_row", "capacity")
+
+
+class PlayActorInline(admin.TabularInline):
+    model = PlayActor
+    autocomplete_fields = ("actor",)
+    extra = 1
+
+
+class PlayGenreInline(admin.TabularInline):
+    model = PlayGenre
+    extra = 1
 
 
 @admin.register(Play)
 class PlayAdmin(admin.ModelAdmin):
     list_display = ("title", "description")
+    inlines = (PlayActorInline, PlayGenreInline)
 
 
 @admin.register(Performance)
 class PerformanceAdmin(admin.ModelAdmin):
     list_display = ("play", "theatre_hall", "show_time")
+    list_select_related = ("play", "theatre_hall")
 
 
 @admin.register(Actor)
 class ActorAdmin(admin.ModelAdmin):
     list_display = ("first_name", "last_name")
+    search_fields = ("first_name", "last_name")
 
 
 @admin.register(Genre)
@@ -38,8 +56,31 @@ class GenreAdmin(admin.ModelAdmin):
 @admin.register(Reservation)
 class ReservationAdmin(admin.ModelAdmin):
     list_display = ("created_at", "user")
+    list_select_related = ("user",)
 
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
     list_display = ("row", "seat", "performance", "reservation")
+    list_select_related = (
+        "performance__play",
+        "performance__theatre_hall",
+        "reservation__user",
+    )
+
+
+class HeldSeatInline(admin.TabularInline):
+    model = HeldSeat
+    fields = ("row", "seat")
+    extra = 0
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ("performance", "user", "created_at", "expires_at")
+    list_select_related = (
+        "performance__play",
+        "performance__theatre_hall",
+        "user",
+    )
+    inlines = (HeldSeatInline,)
@@ -0,0 +1,92 @@
+"""
+Async versions of the hottest read endpoints. They run on the event loop
+under ASGI, so slow clients do not hold a worker thread, and they answer
+exactly like the viewset action they mirror: the same authentication,
+permission and throttle classes run first, and the same serializers,
+pagination and renderers build the response.
+"""
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.http import require_GET
+from rest_framework.response import Response
+
+from theatre.seat_map import get_seat_map, stored_seat_map
+from theatre.serializers import SeatMapSerializer
+from theatre.views import PerformanceViewSet, ReservationViewSet
+
+
+async def run_action(viewset_class, action, request, handler, **kwargs):
+    """
+    Answer request with the async handler(view, request) as the action
+    of viewset_class would, after the checks of DRF's APIView.initial.
+    """
+    view = viewset_class(action_map={"get": action}, detail=bool(kwargs))
+    view.args, view.kwargs = (), kwargs
+    view.headers = view.default_response_headers
+    request = view.initialize_request(request, **kwargs)
+    view.request = request
+    try:
+        # Token authentication and shared throttle buckets may hit the DB
+        await sync_to_async(view.initial)(request, **kwargs)
+        response = await handler(view, request)
+    except Exception as exc:
+        response = view.handle_exception(exc)
+    response = view.finalize_response(request, response, **kwargs)
+    return response.render()
+
+
+async def get_object(view):
+    """The async counterpart of GenericAPIView.get_object."""
+    queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+    obj = await aget_object_or_404(queryset, pk=view.kwargs["pk"])
+    view.check_object_permissions(view.request, obj)
+    return obj
+
+
+async def list_performances(view, request):
+    """ValuesListMixin.list with the page read by the async ORM."""
+    values_serializer = view.values_serializer_class()
+    # The filterset validates ?play= and ?theatre_hall= against the DB
+    queryset = await sync_to_async(view.get_values_queryset)(
+        values_serializer
+    )
+    page = await view.paginator.apaginate_queryset(queryset, request, view)
+    return view.get_paginated_response(
+        values_serializer.to_representation(page)
+    )
+
+
+async def retrieve_seat_map(view, request):
+    performance = await get_object(view)
+    seat_map = stored_seat_map(performance)
+    if seat_map is None:
+        seat_map = await sync_to_async(get_seat_map)(performance)
+    serializer = SeatMapSerializer(seat_map)
+    return Response({"performance": performance.id, **serializer.data})
+
+
+async def retrieve_reservation(view, request):
+    reservation = await get_object(view)
+    return Response(view.get_serializer(reservation).data)
+
+
+@require_GET
+async def performance_list(request):
+    return await run_action(
+        PerformanceViewSet, "list", request, list_performances
+    )
+
+
+@require_GET
+async def performance_seat_map(request, pk):
+    return await run_action(
+        PerformanceViewSet, "seat_map", request, retrieve_seat_map, pk=pk
+    )
+
+
+@require_GET
+async def reservation_detail(request, pk):
+    return await run_action(
+        ReservationViewSet, "retrieve", request, retrieve_reservation, pk=pk
+    )
@@ -0,0 +1,196 @@
+"""
+In-process prefix index behind the autocomplete endpoint. Play titles and
+actor names are kept as casefolded keys in a sorted list, one key from
+every word on, so "lear" finds "King Lear". Lookups bisect to the first
+key with the prefix and walk forward, without touching the database.
+
+The index is built from the database on first use and kept current by
+save and delete signals of this process. Other worker processes catch up
+when their copy is rebuilt, every AUTOCOMPLETE_REFRESH seconds, in a
+background thread: requests keep reading the current index meanwhile,
+and the new one replaces it in a single assignment.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import connections
+
+from theatre.models import Actor, Play
+
+
+def _keys(label):
+    words = label.casefold().split()
+    return {" ".join(words[start:]) for start in range(len(words))}
+
+
+def label_of(instance):
+    if isinstance(instance, Play):
+        return "play", instance.pk, instance.title
+    return "actor", instance.pk, f"{instance.first_name} {instance.last_name}"
+
+
+class PrefixIndex:
+    def __init__(self, entries=()):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._objects = {}
+        for kind, object_id, label in entries:
+            self._objects[kind, object_id] = label
+            self._keys.extend(
+                (key, kind, object_id) for key in _keys(label)
+            )
+        self._keys.sort()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def _remove(self, kind, object_id):
+        label = self._objects.pop((kind, object_id), None)
+        if label is None:
+            return
+        for key in _keys(label):
+            index = bisect_left(self._keys, (key, kind, object_id))
+            del self._keys[index]
+
+    def update(self, kind, object_id, label):
+        with self._lock:
+            self._remove(kind, object_id)
+            self._objects[kind, object_id] = label
+            for key in _keys(label):
+                insort(self._keys, (key, kind, object_id))
+
+    def remove(self, kind, object_id):
+        with self._lock:
+            self._remove(kind, object_id)
+
+    def complete(self, prefix, limit=10, kind=None):
+        """Up to limit (kind, id, label) matches in key order."""
+        prefix = " ".join(prefix.casefold().split())
+        matches = {}
+        with self._lock:
+            index = bisect_left(self._keys, (prefix,))
+            while index < len(self._keys) and len(matches) < limit:
+                key, entry_kind, object_id = self._keys[index]
+                if not key.startswith(prefix):
+                    break
+                if kind in (None, entry_kind):
+                    matches.setdefault(
+                        (entry_kind, object_id),
+                        self._objects[entry_kind, object_id],
+                    )
+                index += 1
+        return [
+            (entry_kind, object_id, label)
+            for (entry_kind, object_id), label in matches.items()
+        ]
+
+
+def build_index():
+    plays = Play.objects.values_list("id", "title")
+    actors = Actor.objects.values_list("id", "first_name", "last_name")
+    return PrefixIndex(
+        [("play", pk, title) for pk, title in plays.iterator()]
+        + [
+            ("actor", pk, f"{first_name} {last_name}")
+            for pk, first_name, last_name in actors.iterator()
+        ]
+    )
+
+
+_index = None
+_built_at = 0.0
+# Changes seen while a rebuild reads the database, None when idle
+_pending = None
+_scheduled = False
+_state_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def _rebuild():
+    global _index, _built_at, _pending
+    with _state_lock:
+        _pending = []
+    try:
+        index = build_index()
+        with _state_lock:
+            # Changes made before the query ran are replayed harmlessly
+            for method, args in _pending:
+                getattr(index, method)(*args)
+            _index = index
+            _built_at = time.monotonic()
+    finally:
+        with _state_lock:
+            _pending = None
+
+
+def rebuild_index():
+    """Build a fresh index and swap it in, keeping concurrent changes."""
+    with _build_lock:
+        _rebuild()
+
+
+def run_in_background(function):
+    def run():
+        try:
+            function()
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _scheduled_rebuild():
+    global _scheduled
+    try:
+        rebuild_index()
+    finally:
+        with _state_lock:
+            _scheduled = False
+
+
+def schedule_rebuild():
+    """Rebuild in a background thread unless one is on its way."""
+    global _scheduled
+    with _state_lock:
+        if _scheduled:
+            return
+        _scheduled = True
+    run_in_background(_scheduled_rebuild)
+
+
+def get_index():
+    index = _index
+    if index is None:
+        # Only the first requests of a worker wait for the index
+        with _build_lock:
+            if _index is None:
+                _rebuild()
+        return _index
+    if time.monotonic() - _built_at > settings.AUTOCOMPLETE_REFRESH:
+        schedule_rebuild()
+    return index
+
+
+def reset_index():
+    """Forget the index, so the next use builds it again."""
+    global _index
+    _index = None
+
+
+def _apply(method, *args):
+    with _state_lock:
+        if _index is not None:
+            getattr(_index, method)(*args)
+        if _pending is not None:
+            _pending.append((method, args))
+
+
+def index_object(instance):
+    _apply("update", *label_of(instance))
+
+
+def remove_object(kind, object_id):
+    _apply("remove", kind, object_id)
@@ -0,0 +1,189 @@
+import hashlib
+import threading
+from collections import namedtuple
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag, urlencode
+from django.utils.module_loading import import_string
+
+
+CachedResponse = namedtuple(
+    "CachedResponse", ("content", "content_type", "etag")
+)
+
+
+class LocalResponseCache:
+    """In-process LRU cache with a TTL, private to every worker."""
+
+    def __init__(self, maxsize=1024, timeout=300):
+        self._responses = TTLCache(maxsize=maxsize, ttl=timeout)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._responses.get(key)
+
+    def get_many(self, keys):
+        with self._lock:
+            return {
+                key: self._responses[key]
+                for key in keys
+                if key in self._responses
+            }
+
+    def set(self, key, value):
+        with self._lock:
+            self._responses[key] = value
+
+    def get_generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def get_generations(self, namespaces):
+        return {
+            namespace: self._generations.get(namespace, 0)
+            for namespace in namespaces
+        }
+
+    def invalidate(self, namespace):
+        with self._lock:
+            self._generations[namespace] = (
+                self._generations.get(namespace, 0) + 1
+            )
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+            self._generations.clear()
+
+
+class DjangoResponseCache:
+    """Cache stored in a Django cache alias, shared between workers."""
+
+    def __init__(self, alias="shared", timeout=300):
+        self._cache = caches[alias]
+        self._timeout = timeout
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def get_many(self, keys):
+        return self._cache.get_many(keys)
+
+    def set(self, key, value):
+        self._cache.set(key, value, self._timeout)
+
+    def get_generation(self, namespace):
+        return self._cache.get(f"generation:{namespace}", 0)
+
+    def get_generations(self, namespaces):
+        generations = self._cache.get_many(
+            [f"generation:{namespace}" for namespace in namespaces]
+        )
+        return {
+            namespace: generations.get(f"generation:{namespace}", 0)
+            for namespace in namespaces
+        }
+
+    def invalidate(self, namespace):
+        key = f"generation:{namespace}"
+        if not self._cache.add(key, 1, None):
+            self._cache.incr(key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None:
+        config = settings.RESPONSE_CACHE
+        backend = import_string(config["BACKEND"])
+        _response_cache = backend(**config.get("OPTIONS", {}))
+    return _response_cache
+
+
+@receiver(setting_changed)
+def reset_response_cache(setting, **kwargs):
+    global _response_cache
+    if setting == "RESPONSE_CACHE":
+        _response_cache = None
+
+
+def invalidate_namespace(namespace):
+    get_response_cache().invalidate(namespace)
+
+
+def _http_response(request, cached):
+    if cached.etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(
+            cached.content, content_type=cached.content_type
+        )
+    response["ETag"] = cached.etag
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Serve list and detail GETs from the response cache. Entries are keyed
+    by the model, its invalidation generation and the full request path,
+    and carry an ETag so repeat clients get a 304 without a body.
+    """
+
+    def get_cache_namespace(self):
+        return self.queryset.model._meta.label_lower
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return handler(request, *args, **kwargs)
+
+        cache = get_response_cache()
+        namespace = self.get_cache_namespace()
+        url = "?".join(
+            (request.path, urlencode(sorted(request.GET.lists()), True))
+        )
+        key = ":".join(
+            (
+                "response",
+                namespace,
+                str(cache.get_generation(namespace)),
+                hashlib.md5(
+                    f"{request.accepted_media_type} {url}".encode()
+                ).hexdigest(),
+            )
+        )
+        cached = cache.get(key)
+        if cached is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            cached = CachedResponse(
+                response.content,
+                response["Content-Type"],
+                quote_etag(hashlib.md5(response.content).hexdigest()),
+            )
+            cache.set(key, cached)
+        return _http_response(request, cached)
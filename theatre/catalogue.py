@@ -0,0 +1,199 @@
+"""
+Streaming import and export of the catalogue (halls, plays, actors, genres
+and performances) as JSONL or CSV. Records are read and written one at a
+time and saved in fixed-size batches, so memory use does not grow with
+the size of the file.
+"""
+
+import csv
+import json
+from datetime import datetime
+from itertools import chain
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import JSONField
+from django.utils import timezone
+
+from theatre.autocomplete import reset_index
+from theatre.cache import invalidate_namespace
+from theatre.models import TheatreHall, Play, Performance, Actor, Genre
+from theatre.schedule import invalidate_schedule
+from theatre.search import index_objects
+
+
+CATALOGUE = {
+    "theatre_hall": (
+        TheatreHall,
+        ("name", "rows", "seats_in_row", "layout"),
+    ),
+    "play": (Play, ("title", "description")),
+    "actor": (Actor, ("first_name", "last_name")),
+    "genre": (Genre, ("name",)),
+    "performance": (Performance, ("play", "theatre_hall", "show_time")),
+}
+FORMATS = ("jsonl", "csv")
+
+
+class CatalogueError(Exception):
+    pass
+
+
+def read_records(stream, file_format, model_name=None):
+    """
+    Yield (model name, record) pairs. JSONL records name their model in a
+    "model" key unless model_name is given; CSV files hold a single model.
+    """
+    if file_format == "csv":
+        if model_name is None:
+            raise CatalogueError("CSV files need a model name.")
+        rows = csv.DictReader(stream)
+    else:
+        rows = (json.loads(line) for line in stream if line.strip())
+
+    for line_number, record in enumerate(rows, start=1):
+        name = model_name or record.pop("model", None)
+        if name not in CATALOGUE:
+            raise CatalogueError(
+                f"Record {line_number}: unknown model {name!r}."
+            )
+        record.pop("model", None)
+        yield name, record
+
+
+def build_instance(model_name, record):
+    model, fields = CATALOGUE[model_name]
+    values = {}
+    for name in ("id",) + fields:
+        value = record.get(name)
+        if value in (None, "") and name == "id":
+            continue
+        field = model._meta.get_field(name)
+        if isinstance(field, JSONField) and isinstance(value, str):
+            # CSV cells hold JSON values as text
+            value = json.loads(value) if value else None
+        value = field.to_python(value)
+        if isinstance(value, datetime) and timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        values[field.attname] = value
+    return model(**values)
+
+
+def _save_batch(model_name, instances):
+    model, fields = CATALOGUE[model_name]
+    update_fields = [model._meta.get_field(name).attname for name in fields]
+    if model is Performance:
+        update_fields += ["seat_bitmap", "seat_bitmap_layout"]
+    if model is TheatreHall:
+        for instance in instances:
+            instance.capacity = instance.get_layout().capacity
+        update_fields.append("capacity")
+    model.objects.bulk_create(
+        instances,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=update_fields,
+    )
+    if model in (Play, Actor):
+        index_objects(instances)
+
+
+def import_records(records, batch_size=1000, on_batch=None):
+    """
+    Upsert records by id in batches and return the number saved per model.
+    Pending batches are flushed in catalogue order, so performances are
+    saved after the plays and halls they point to.
+    """
+    batches = {name: [] for name in CATALOGUE}
+    counts = dict.fromkeys(CATALOGUE, 0)
+
+    def flush():
+        for name, instances in batches.items():
+            if instances:
+                _save_batch(name, instances)
+                counts[name] += len(instances)
+                instances.clear()
+        if on_batch is not None:
+            on_batch(counts)
+
+    with transaction.atomic():
+        for model_name, record in records:
+            batches[model_name].append(build_instance(model_name, record))
+            if len(batches[model_name]) >= batch_size:
+                flush()
+        flush()
+
+        imported = [CATALOGUE[name][0] for name in counts if counts[name]]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), imported
+            ):
+                cursor.execute(sql)
+        for model in imported:
+            namespace = model._meta.label_lower
+            transaction.on_commit(
+                lambda namespace=namespace: invalidate_namespace(namespace)
+            )
+        if imported:
+            invalidate_schedule()
+            transaction.on_commit(reset_index)
+    return counts
+
+
+def export_records(model_names, batch_size=1000):
+    """Yield (model name, record) pairs, reading batch_size rows at once."""
+    for model_name in model_names:
+        model, fields = CATALOGUE[model_name]
+        columns = ("id",) + fields
+        rows = (
+            model.objects.order_by("id")
+            .values_list(*columns)
+            .iterator(chunk_size=batch_size)
+        )
+        for row in rows:
+            yield model_name, dict(zip(columns, row))
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return _serialize(value)
+
+
+def write_records(stream, records, file_format):
+    """Write records and return how many were written."""
+    count = 0
+    if file_format == "csv":
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return 0
+        writer = csv.DictWriter(stream, fieldnames=list(first[1]))
+        writer.writeheader()
+        for _, record in chain([first], records):
+            writer.writerow(
+                {key: _csv_value(value) for key, value in record.items()}
+            )
+            count += 1
+        return count
+
+    for model_name, record in records:
+        record = {key: _serialize(value) for key, value in record.items()}
+        stream.write(json.dumps({"model": model_name, **record}) + "\n")
+        count += 1
+    return count
+
+
+def detect_format(path, file_format=None):
+    if file_format:
+        return file_format
+    for candidate in FORMATS:
+        if path.endswith(f".{candidate}"):
+            return candidate
+    raise CatalogueError("Cannot tell the file format, pass --format.")
@@ -0,0 +1,66 @@
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django.utils import timezone
+
+from theatre.models import Performance, Play, Reservation, Ticket
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class PlayFilter(django_filters.FilterSet):
+    actor = django_filters.NumberFilter(field_name="actors")
+    genre = django_filters.NumberFilter(field_name="genres")
+
+    class Meta:
+        model = Play
+        fields = ()
+
+
+class PerformanceFilter(django_filters.FilterSet):
+    date_from = django_filters.DateFilter(method="filter_date_from")
+    date_to = django_filters.DateFilter(method="filter_date_to")
+    title = django_filters.CharFilter(
+        field_name="play__title", lookup_expr="icontains"
+    )
+    actor = django_filters.NumberFilter(field_name="play__actors")
+    genre = django_filters.NumberFilter(field_name="play__genres")
+
+    class Meta:
+        model = Performance
+        fields = ("play", "theatre_hall")
+
+    def filter_date_from(self, queryset, name, value):
+        return queryset.filter(show_time__gte=start_of_day(value))
+
+    def filter_date_to(self, queryset, name, value):
+        return queryset.filter(
+            show_time__lt=start_of_day(value + timedelta(days=1))
+        )
+
+
+class CreatedAtFilter(django_filters.FilterSet):
+    date_from = django_filters.DateFilter(method="filter_date_from")
+    date_to = django_filters.DateFilter(method="filter_date_to")
+
+    def filter_date_from(self, queryset, name, value):
+        return queryset.filter(created_at__gte=start_of_day(value))
+
+    def filter_date_to(self, queryset, name, value):
+        return queryset.filter(
+            created_at__lt=start_of_day(value + timedelta(days=1))
+        )
+
+
+class ReservationFilter(CreatedAtFilter):
+    class Meta:
+        model = Reservation
+        fields = ()
+
+
+class TicketFilter(CreatedAtFilter):
+    class Meta:
+        model = Ticket
+        fields = ("performance",)
@@ -0,0 +1,114 @@
+"""
+Seating plans of theatre halls. A hall stores its plan once, as one
+string per row with one character per seat position: "." where there is
+no seat (an aisle or a missing seat) and otherwise the code of the seat
+category, e.g.
+
+    {"rows": ["AA.AA", "BB.BB"], "categories": {"A": "Stalls", "B": "Rear"}}
+
+get_layout() turns it into an immutable HallLayout with a bitmask of the
+existing seats of every row. Layouts are cached by their content, so all
+performances in a hall (and halls with the same plan) share one.
+"""
+
+import hashlib
+from functools import lru_cache
+from types import MappingProxyType
+
+
+NO_SEAT = "."
+
+
+class HallLayout:
+    """Seat positions and categories of a hall, checked in O(1)."""
+
+    def __init__(self, rows, seats_in_row, plan=None, categories=()):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.plan = plan
+        self.categories = MappingProxyType(dict(categories))
+        if plan is None:
+            self.row_masks = ((1 << seats_in_row) - 1,) * rows
+        else:
+            self._check_plan()
+            self.row_masks = tuple(
+                sum(
+                    1 << index
+                    for index, code in enumerate(line)
+                    if code != NO_SEAT
+                )
+                for line in plan
+            )
+        self.capacity = sum(mask.bit_count() for mask in self.row_masks)
+        # Names the seat positions, stored next to seat bitmaps built for
+        # them so a bitmap of another size or plan is never reused
+        self.key = hashlib.blake2b(
+            repr((rows, seats_in_row, self.row_masks)).encode(),
+            digest_size=8,
+        ).hexdigest()
+
+    def _check_plan(self):
+        if len(self.plan) != self.rows:
+            raise ValueError(
+                f"The layout has {len(self.plan)} rows, "
+                f"the hall has {self.rows}."
+            )
+        for row, line in enumerate(self.plan, start=1):
+            if len(line) != self.seats_in_row:
+                raise ValueError(
+                    f"Row {row} of the layout has {len(line)} positions, "
+                    f"the hall has {self.seats_in_row} seats in a row."
+                )
+            for code in set(line) - {NO_SEAT}:
+                if code not in self.categories:
+                    raise ValueError(
+                        f"Seat code {code!r} in row {row} has no category."
+                    )
+
+    def __contains__(self, seat):
+        row, number = seat
+        return (
+            1 <= row <= self.rows
+            and 1 <= number <= self.seats_in_row
+            and bool(self.row_masks[row - 1] >> (number - 1) & 1)
+        )
+
+    def category(self, row, seat):
+        """Name of the category of an existing seat, None without a plan."""
+        if self.plan is None:
+            return None
+        return self.categories[self.plan[row - 1][seat - 1]]
+
+
+@lru_cache(maxsize=256)
+def _cached_layout(rows, seats_in_row, plan, categories):
+    return HallLayout(rows, seats_in_row, plan, categories)
+
+
+def get_layout(rows, seats_in_row, layout=None):
+    """
+    Return the shared HallLayout of a hall plan, a full rectangle when the
+    hall has none. Raises ValueError when the plan does not fit the hall.
+    """
+    if not layout:
+        return _cached_layout(rows, seats_in_row, None, ())
+    if not isinstance(layout, dict):
+        raise ValueError("The layout must be an object.")
+    plan, categories = layout.get("rows"), layout.get("categories", {})
+    if not isinstance(plan, list) or not all(
+        isinstance(line, str) for line in plan
+    ):
+        raise ValueError("Layout rows must be a list of strings.")
+    if not isinstance(categories, dict) or not all(
+        isinstance(code, str)
+        and len(code) == 1
+        and code != NO_SEAT
+        and isinstance(name, str)
+        for code, name in categories.items()
+    ):
+        raise ValueError(
+            "Layout categories must map single-character codes to names."
+        )
+    return _cached_layout(
+        rows, seats_in_row, tuple(plan), tuple(sorted(categories.items()))
+    )
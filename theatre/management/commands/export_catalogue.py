@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from theatre.catalogue import (
+    CATALOGUE,
+    FORMATS,
+    CatalogueError,
+    detect_format,
+    export_records,
+    write_records,
+)
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", default="-", help="File to write, or - for stdout."
+        )
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument(
+            "--model",
+            choices=list(CATALOGUE),
+            action="append",
+            help="Model to export, may repeat (default: all of them).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        model_names = options["model"] or list(CATALOGUE)
+        start = time.perf_counter()
+        try:
+            file_format = detect_format(
+                output,
+                options["format"] or ("jsonl" if output == "-" else None),
+            )
+            if file_format == "csv" and len(model_names) != 1:
+                raise CatalogueError("CSV files hold a single --model.")
+            records = export_records(model_names, options["batch_size"])
+            if output == "-":
+                self.stdout.ending = ""
+                count = write_records(self.stdout, records, file_format)
+            else:
+                with open(output, "w", newline="") as stream:
+                    count = write_records(stream, records, file_format)
+        except (CatalogueError, OSError) as error:
+            raise CommandError(error)
+
+        elapsed = time.perf_counter() - start
+        self.stderr.write(
+            f"Exported {count} rows in {elapsed:.1f}s "
+            f"({count / max(elapsed, 1e-9):.0f} rows/sec).",
+            style_func=self.style.SUCCESS,
+        )
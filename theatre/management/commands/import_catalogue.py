@@ -0,0 +1,73 @@
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from theatre.catalogue import (
+    CATALOGUE,
+    FORMATS,
+    CatalogueError,
+    detect_format,
+    import_records,
+    read_records,
+)
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to read, or - for stdin.")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument(
+            "--model",
+            choices=list(CATALOGUE),
+            help="Model of every record (required for CSV).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        start = time.perf_counter()
+
+        def report(counts):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{sum(counts.values())} rows saved...")
+
+        try:
+            file_format = detect_format(
+                path, options["format"] or ("jsonl" if path == "-" else None)
+            )
+            if path == "-":
+                stream = nullcontext(sys.stdin)
+            else:
+                stream = open(path, newline="")
+            with stream as stream:
+                counts = import_records(
+                    read_records(stream, file_format, options["model"]),
+                    batch_size=options["batch_size"],
+                    on_batch=report,
+                )
+        except (
+            CatalogueError,
+            OSError,
+            ValueError,
+            ValidationError,
+            IntegrityError,
+        ) as error:
+            raise CommandError(error)
+
+        self.write_summary(counts, time.perf_counter() - start)
+
+    def write_summary(self, counts, elapsed):
+        total = sum(counts.values())
+        for model_name, count in counts.items():
+            if count:
+                self.stdout.write(f"{model_name}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {total} rows in {elapsed:.1f}s "
+                f"({total / max(elapsed, 1e-9):.0f} rows/sec)."
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from theatre.search import rebuild_index
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_index(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} objects."))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from theatre.models import Performance
+from theatre.seat_map import count_tickets_sold, reset_seat_map
+
+
+class Command(BaseCommand):
+    batch_size = 1000
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report performances whose counter is wrong.",
+        )
+
+    def drifted(self, performances):
+        counted = count_tickets_sold(performances)
+        for performance in performances:
+            if performance.tickets_sold != counted[performance.id]:
+                yield performance, counted[performance.id]
+
+    def handle(self, *args, **options):
+        performances = (
+            Performance.objects.select_related("theatre_hall")
+            .only(
+                "tickets_sold",
+                "theatre_hall__rows",
+                "theatre_hall__seats_in_row",
+                "theatre_hall__layout",
+            )
+            .order_by("id")
+        )
+        fixed = 0
+        batch = []
+        for performance in performances.iterator(self.batch_size):
+            batch.append(performance)
+            if len(batch) < self.batch_size:
+                continue
+            fixed += self.reconcile(batch, options["dry_run"])
+            batch = []
+        fixed += self.reconcile(batch, options["dry_run"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled {fixed} performances.")
+        )
+
+    def reconcile(self, performances, dry_run):
+        fixed = 0
+        for performance, counted in self.drifted(performances):
+            self.stdout.write(
+                f"Performance {performance.id}: "
+                f"counter {performance.tickets_sold}, tickets {counted}"
+            )
+            if not dry_run:
+                reset_seat_map(performance.id)
+                fixed += 1
+        return fixed
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from theatre.seat_map import sweep_expired_holds
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep sweeping with this many seconds between runs.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = sweep_expired_holds()
+            self.stdout.write(f"Deleted {deleted} expired seat holds.")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="seat_bitmap",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
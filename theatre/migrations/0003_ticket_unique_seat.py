@@ -0,0 +1,64 @@
+# Generated by Django 5.0.7 on 2026-10-18 17:58
+
+from django.db import migrations, models
+
+
+def remove_duplicate_tickets(apps, schema_editor):
+    """
+    Drop repeated tickets of a seat within one reservation, keeping the
+    first, and stop with a report when a seat was sold to different
+    reservations, which needs a refund or a move rather than a delete.
+    """
+    Ticket = apps.get_model("theatre", "Ticket")
+    duplicates = (
+        Ticket.objects.values("performance_id", "row", "seat")
+        .annotate(
+            tickets=models.Count("id"),
+            reservations=models.Count("reservation_id", distinct=True),
+        )
+        .filter(tickets__gt=1)
+        .order_by("performance_id", "row", "seat")
+    )
+    repeated = []
+    double_booked = []
+    for seat in duplicates:
+        ids = list(
+            Ticket.objects.filter(
+                performance_id=seat["performance_id"],
+                row=seat["row"],
+                seat=seat["seat"],
+            )
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if seat["reservations"] > 1:
+            double_booked.append(
+                f"performance {seat['performance_id']} row {seat['row']} "
+                f"seat {seat['seat']}: tickets {ids}"
+            )
+        else:
+            repeated.extend(ids[1:])
+    if double_booked:
+        raise RuntimeError(
+            "Seats sold more than once, resolve them before migrating:\n"
+            + "\n".join(double_booked)
+        )
+    Ticket.objects.filter(pk__in=repeated).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0002_performance_seat_bitmap"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_tickets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("performance", "row", "seat"),
+                name="unique_ticket_performance_row_seat",
+            ),
+        ),
+    ]
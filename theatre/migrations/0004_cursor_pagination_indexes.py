@@ -0,0 +1,57 @@
+# Generated by Django 5.0.7 on 2026-10-18 18:00
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_reservation_created_at(apps, schema_editor):
+    # Existing tickets were booked with their reservation. One timestamp
+    # for all of them would leave the created_at cursor nothing to seek on
+    Reservation = apps.get_model("theatre", "Reservation")
+    Ticket = apps.get_model("theatre", "Ticket")
+    Ticket.objects.update(
+        created_at=models.Subquery(
+            Reservation.objects.filter(pk=models.OuterRef("reservation_id")).values(
+                "created_at"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0003_ticket_unique_seat"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_reservation_created_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["show_time", "id"], name="performance_show_time_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["created_at", "id"], name="reservation_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["created_at", "id"], name="ticket_created_at_id_idx"
+            ),
+        ),
+    ]
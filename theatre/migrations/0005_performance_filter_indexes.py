@@ -0,0 +1,26 @@
+# Generated by Django 5.0.7 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0004_cursor_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["play", "show_time"], name="performance_play_show_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="performance_hall_show_time_idx",
+            ),
+        ),
+    ]
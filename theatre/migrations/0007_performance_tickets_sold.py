@@ -0,0 +1,32 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:20
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_tickets_sold(apps, schema_editor):
+    Performance = apps.get_model("theatre", "Performance")
+    Ticket = apps.get_model("theatre", "Ticket")
+    tickets_sold = (
+        Ticket.objects.filter(performance=models.OuterRef("pk"))
+        .values("performance")
+        .annotate(count=models.Count("id"))
+        .values("count")
+    )
+    Performance.objects.update(tickets_sold=Coalesce(models.Subquery(tickets_sold), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0006_seat_holds"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_tickets_sold, migrations.RunPython.noop),
+    ]
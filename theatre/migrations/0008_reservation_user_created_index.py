@@ -0,0 +1,21 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0007_performance_tickets_sold"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="reservation_user_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+def set_capacity(apps, schema_editor):
+    TheatreHall = apps.get_model("theatre", "TheatreHall")
+    TheatreHall.objects.update(capacity=models.F("rows") * models.F("seats_in_row"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0008_reservation_user_created_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="theatrehall",
+            name="capacity",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="theatrehall",
+            name="layout",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(set_capacity, migrations.RunPython.noop),
+    ]
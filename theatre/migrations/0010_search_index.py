@@ -0,0 +1,55 @@
+from django.db import migrations
+
+
+CREATE_INDEX = {
+    "postgresql": [
+        "CREATE TABLE theatre_search_index ("
+        "kind varchar(16) NOT NULL, "
+        "object_id bigint NOT NULL, "
+        "title text NOT NULL, "
+        "document tsvector NOT NULL, "
+        "PRIMARY KEY (kind, object_id))",
+        "CREATE INDEX theatre_search_index_document_idx "
+        "ON theatre_search_index USING gin (document)",
+        "INSERT INTO theatre_search_index (kind, object_id, title, document) "
+        "SELECT 'play', id, title, "
+        "setweight(to_tsvector('english', title), 'A') "
+        "|| setweight(to_tsvector('english', description), 'B') "
+        "FROM theatre_play",
+        "INSERT INTO theatre_search_index (kind, object_id, title, document) "
+        "SELECT 'actor', id, first_name || ' ' || last_name, "
+        "setweight(to_tsvector('english', first_name || ' ' || last_name), 'A') "
+        "FROM theatre_actor",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE theatre_search_index USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, title, body, "
+        "tokenize = 'porter unicode61')",
+        "INSERT INTO theatre_search_index (rowid, kind, object_id, title, body) "
+        "SELECT id * 2, 'play', id, title, description FROM theatre_play",
+        "INSERT INTO theatre_search_index (rowid, kind, object_id, title, body) "
+        "SELECT id * 2 + 1, 'actor', id, first_name || ' ' || last_name, '' "
+        "FROM theatre_actor",
+    ],
+}
+
+
+def create_search_index(apps, schema_editor):
+    for sql in CREATE_INDEX.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_INDEX:
+        schema_editor.execute("DROP TABLE theatre_search_index")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0009_hall_layout"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
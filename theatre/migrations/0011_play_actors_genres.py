@@ -0,0 +1,122 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0010_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayActor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="roles",
+                        to="theatre.actor",
+                    ),
+                ),
+                (
+                    "play",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cast",
+                        to="theatre.play",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="play",
+            name="actors",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="plays",
+                through="theatre.PlayActor",
+                to="theatre.actor",
+            ),
+        ),
+        migrations.CreateModel(
+            name="PlayGenre",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "genre",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="play_genres",
+                        to="theatre.genre",
+                    ),
+                ),
+                (
+                    "play",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="play_genres",
+                        to="theatre.play",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="play",
+            name="genres",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="plays",
+                through="theatre.PlayGenre",
+                to="theatre.genre",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playactor",
+            index=models.Index(
+                fields=["actor", "play"], name="play_actor_actor_play_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="playactor",
+            constraint=models.UniqueConstraint(
+                fields=("play", "actor"), name="unique_play_actor"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playgenre",
+            index=models.Index(
+                fields=["genre", "play"], name="play_genre_genre_play_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="playgenre",
+            constraint=models.UniqueConstraint(
+                fields=("play", "genre"), name="unique_play_genre"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-18 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0011_play_actors_genres"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="seat_bitmap_layout",
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
@@ -1,24 +1,82 @@
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from theatre.layouts import get_layout
+
 
 class TheatreHall(models.Model):
     name = models.CharField(max_length=255)
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    # Seating plan described in theatre.layouts, a full grid when empty
+    layout = models.JSONField(null=True, blank=True)
+    capacity = models.PositiveIntegerField(default=0, editable=False)
+
+    def get_layout(self):
+        return get_layout(self.rows, self.seats_in_row, self.layout)
+
+    def clean(self):
+        try:
+            self.get_layout()
+        except ValueError as error:
+            raise ValidationError({"layout": str(error)})
+
+    def save(self, *args, **kwargs):
+        self.capacity = self.get_layout().capacity
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "capacity"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} - {self.rows} rows, {self.seats_in_row} seats/row"
 
 
+def _credits(prefix=""):
+    return (
+        models.Prefetch(
+            f"{prefix}actors",
+            queryset=Actor.objects.order_by("last_name", "first_name", "id"),
+        ),
+        models.Prefetch(
+            f"{prefix}genres", queryset=Genre.objects.order_by("name", "id")
+        ),
+    )
+
+
+class PlayQuerySet(models.QuerySet):
+    def with_credits(self):
+        """Prefetch actors and genres with one query each."""
+        return self.prefetch_related(*_credits())
+
+
 class Play(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
+    actors = models.ManyToManyField(
+        "Actor", through="PlayActor", related_name="plays", blank=True
+    )
+    genres = models.ManyToManyField(
+        "Genre", through="PlayGenre", related_name="plays", blank=True
+    )
+
+    objects = PlayQuerySet.as_manager()
 
     def __str__(self):
         return f"Play: {self.title}"
 
 
+class PerformanceQuerySet(models.QuerySet):
+    def for_listing(self):
+        return self.select_related("play", "theatre_hall").defer(
+            "seat_bitmap", "theatre_hall__layout"
+        )
+
+    def with_credits(self):
+        return self.prefetch_related(*_credits("play__"))
+
+
 class Performance(models.Model):
     play = models.ForeignKey(
         Play,
@@ -31,6 +89,34 @@ class Performance(models.Model):
         related_name="theatre_hall_performances"
     )
     show_time = models.DateTimeField()
+    seat_bitmap = models.BinaryField(null=True, blank=True, editable=False)
+    # HallLayout.key of the seats the bitmap was built for
+    seat_bitmap_layout = models.CharField(
+        max_length=16, blank=True, editable=False
+    )
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = PerformanceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["show_time", "id"],
+                name="performance_show_time_id_idx",
+            ),
+            models.Index(
+                fields=["play", "show_time"],
+                name="performance_play_show_time_idx",
+            ),
+            models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="performance_hall_show_time_idx",
+            ),
+        ]
+
+    @property
+    def tickets_available(self):
+        return self.theatre_hall.capacity - self.tickets_sold
 
     def __str__(self):
         return (
@@ -43,9 +129,13 @@ class Actor(models.Model):
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
 
-    def __str__(self):
+    @property
+    def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
+    def __str__(self):
+        return self.full_name
+
 
 class Genre(models.Model):
     name = models.CharField(max_length=255)
@@ -54,6 +144,63 @@ class Genre(models.Model):
         return f"Genre: {self.name}"
 
 
+# The unique constraint indexes (play, actor) for reading a cast and the
+# index (actor, play) the ?actor= filters; the single column FK indexes
+# would only duplicate them
+class PlayActor(models.Model):
+    play = models.ForeignKey(
+        Play, on_delete=models.CASCADE, related_name="cast", db_index=False
+    )
+    actor = models.ForeignKey(
+        Actor, on_delete=models.CASCADE, related_name="roles", db_index=False
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["play", "actor"], name="unique_play_actor"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["actor", "play"], name="play_actor_actor_play_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"Actor {self.actor_id} in play {self.play_id}"
+
+
+class PlayGenre(models.Model):
+    play = models.ForeignKey(
+        Play,
+        on_delete=models.CASCADE,
+        related_name="play_genres",
+        db_index=False,
+    )
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        related_name="play_genres",
+        db_index=False,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["play", "genre"], name="unique_play_genre"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["genre", "play"], name="play_genre_genre_play_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"Genre {self.genre_id} of play {self.play_id}"
+
+
 class Reservation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
@@ -62,6 +209,18 @@ class Reservation(models.Model):
         related_name="reservations"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="reservation_created_at_id_idx",
+            ),
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="reservation_user_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return (
             f"Reservation: {self.id} "
@@ -73,6 +232,7 @@ class Reservation(models.Model):
 class Ticket(models.Model):
     row = models.IntegerField()
     seat = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
     performance = models.ForeignKey(
         Performance,
         on_delete=models.CASCADE,
@@ -84,9 +244,100 @@ class Ticket(models.Model):
         related_name="tickets"
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["performance", "row", "seat"],
+                name="unique_ticket_performance_row_seat",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="ticket_created_at_id_idx",
+            )
+        ]
+
+    @staticmethod
+    def validate_ticket(row, seat, theatre_hall, error_to_raise):
+        for ticket_attr_value, ticket_attr_name, theatre_hall_attr_name in [
+            (row, "row", "rows"),
+            (seat, "seat", "seats_in_row"),
+        ]:
+            count_attrs = getattr(theatre_hall, theatre_hall_attr_name)
+            if not (1 <= ticket_attr_value <= count_attrs):
+                raise error_to_raise(
+                    {
+                        ticket_attr_name: (
+                            f"{ticket_attr_name} number must be in "
+                            f"available range: (1, {theatre_hall_attr_name})"
+                            f": (1, {count_attrs})"
+                        )
+                    }
+                )
+        if (row, seat) not in theatre_hall.get_layout():
+            raise error_to_raise(
+                {"seat": f"There is no seat {seat} in row {row}."}
+            )
+
+    def clean(self):
+        Ticket.validate_ticket(
+            self.row,
+            self.seat,
+            self.performance.theatre_hall,
+            ValidationError,
+        )
+
     def __str__(self):
         return (
             f"Ticket {self.row}-{self.seat} for "
             f"{self.performance.play.title} on "
             f"{self.performance.show_time.strftime('%Y-%m-%d %H:%M')}"
         )
+
+
+class SeatHold(models.Model):
+    performance = models.ForeignKey(
+        Performance,
+        on_delete=models.CASCADE,
+        related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return (
+            f"Hold {self.id} for performance {self.performance_id} "
+            f"until {self.expires_at.strftime('%Y-%m-%d %H:%M')}"
+        )
+
+
+class HeldSeat(models.Model):
+    hold = models.ForeignKey(
+        SeatHold,
+        on_delete=models.CASCADE,
+        related_name="seats"
+    )
+    performance = models.ForeignKey(
+        Performance,
+        on_delete=models.CASCADE,
+        related_name="held_seats"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["performance", "row", "seat"],
+                name="unique_held_seat_performance_row_seat",
+            )
+        ]
+
+    def __str__(self):
+        return f"Seat {self.row}-{self.seat} held by hold {self.hold_id}"
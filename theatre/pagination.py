@@ -0,0 +1,148 @@
+import json
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from django.db.models import Q
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination on every ordering field at once. The cursor carries
+    the values of all of them for the row it stops at, and a page is the
+    rows after that tuple, e.g. show_time > x OR (show_time = x AND
+    id > y), so it is a range scan of the (show_time, id) index however
+    many rows share a show_time. DRF's cursor keeps the first field only
+    and steps over ties with an OFFSET.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset reading the page with the async ORM."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """The unevaluated query for the requested page plus one row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            self.reverse, self.position = False, None
+        else:
+            self.reverse = self.cursor.reverse
+            self.position = self.cursor.position
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [_invert(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(_after(ordering, self.position))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        position = self.position
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if self.page:
+            self.next_position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+            self.previous_position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        else:
+            self.next_position = self.previous_position = position
+        return self.page
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(
+            self.ordering
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor._replace(position=position)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            field = field.lstrip("-")
+            if isinstance(instance, dict):
+                value = instance[field]
+            else:
+                value = getattr(instance, field)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            position.append(value)
+        return json.dumps(position)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self.next_position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.previous_position)
+        )
+
+
+def _invert(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def _after(ordering, position):
+    """Rows past position in ordering, compared as a tuple."""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    # Bounds the scan on the leading index column as well
+    name = ordering[0].lstrip("-")
+    lookup = "lte" if ordering[0].startswith("-") else "gte"
+    return Q(**{f"{name}__{lookup}": position[0]}) & condition
+
+
+class StandardCursorPagination(KeysetCursorPagination):
+    ordering = ("id",)
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class PerformanceCursorPagination(StandardCursorPagination):
+    ordering = ("show_time", "id")
+
+
+class CreatedAtCursorPagination(StandardCursorPagination):
+    ordering = ("-created_at", "-id")
@@ -0,0 +1,183 @@
+"""
+Calendar of performances: the performances of a date range grouped by
+day with the seats they have left, plus daily and weekly totals. Days
+missing from the response cache are read with one query and cached one
+day (and hall) at a time, so a booking only invalidates the day of its
+performance.
+"""
+
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from rest_framework import serializers
+
+from theatre.cache import get_response_cache
+from theatre.filters import start_of_day
+from theatre.models import Performance
+
+
+NAMESPACE = "theatre.schedule"
+MAX_DAYS = 62
+
+_show_time = serializers.DateTimeField().to_representation
+
+
+def _day_namespace(day):
+    return f"{NAMESPACE}:{day.isoformat()}"
+
+
+def _show_day(show_time):
+    # Instances saved with a string or naive show time still hold it as is
+    show_time = Performance._meta.get_field("show_time").to_python(show_time)
+    if timezone.is_naive(show_time):
+        show_time = timezone.make_aware(show_time)
+    return timezone.localdate(show_time)
+
+
+def invalidate_schedule(*show_times):
+    """
+    Drop the cached days of the given show times, or every cached day when
+    none are given. Like the catalogue cache, entries are dropped again on
+    commit so a request racing the transaction cannot keep stale data.
+    """
+    namespaces = {
+        _day_namespace(_show_day(show_time))
+        for show_time in show_times
+        if show_time is not None
+    } or {NAMESPACE}
+
+    def invalidate():
+        cache = get_response_cache()
+        for namespace in namespaces:
+            cache.invalidate(namespace)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def _cache_keys(cache, days, hall_id):
+    generations = cache.get_generations(
+        [NAMESPACE, *(_day_namespace(day) for day in days)]
+    )
+    return {
+        day: ":".join(
+            (
+                "schedule",
+                str(generations[NAMESPACE]),
+                day.isoformat(),
+                str(generations[_day_namespace(day)]),
+                str(hall_id or ""),
+            )
+        )
+        for day in days
+    }
+
+
+def _query_days(days, hall_id):
+    performances = Performance.objects.filter(
+        show_time__gte=start_of_day(min(days)),
+        show_time__lt=start_of_day(max(days) + timedelta(days=1)),
+    )
+    if hall_id is not None:
+        performances = performances.filter(theatre_hall_id=hall_id)
+    rows = (
+        performances.annotate(
+            day=TruncDate("show_time"),
+            tickets_available=(
+                F("theatre_hall__capacity") - F("tickets_sold")
+            ),
+        )
+        .order_by("show_time", "id")
+        .values_list(
+            "day",
+            "id",
+            "show_time",
+            "play_id",
+            "play__title",
+            "theatre_hall_id",
+            "theatre_hall__name",
+            "tickets_available",
+        )
+    )
+
+    buckets = {day: [] for day in days}
+    for day, *values in rows:
+        if day in buckets:
+            buckets[day].append(values)
+    return buckets
+
+
+def _day(day, rows):
+    performances = [
+        {
+            "id": performance_id,
+            "show_time": _show_time(show_time),
+            "play": play_id,
+            "play_title": play_title,
+            "theatre_hall": hall_id,
+            "theatre_hall_name": hall_name,
+            "tickets_available": tickets_available,
+        }
+        for (
+            performance_id,
+            show_time,
+            play_id,
+            play_title,
+            hall_id,
+            hall_name,
+            tickets_available,
+        ) in rows
+    ]
+    return {
+        "date": day.isoformat(),
+        "performances_count": len(performances),
+        "tickets_available": sum(
+            performance["tickets_available"] for performance in performances
+        ),
+        "performances": performances,
+    }
+
+
+def get_days(date_from, date_to, hall_id=None):
+    """Every day from date_from to date_to, read through the cache."""
+    cache = get_response_cache()
+    days = [
+        date_from + timedelta(days=offset)
+        for offset in range((date_to - date_from).days + 1)
+    ]
+    keys = _cache_keys(cache, days, hall_id)
+    found = cache.get_many(keys.values())
+    cached = {day: found.get(key) for day, key in keys.items()}
+    missing = [day for day, value in cached.items() if value is None]
+    if missing:
+        for day, rows in _query_days(missing, hall_id).items():
+            cached[day] = _day(day, rows)
+            cache.set(keys[day], cached[day])
+    return [cached[day] for day in days]
+
+
+def get_calendar(date_from, date_to, hall_id=None):
+    days = get_days(date_from, date_to, hall_id)
+    weeks = {}
+    for day in days:
+        day_date = date.fromisoformat(day["date"])
+        week_start = day_date - timedelta(days=day_date.weekday())
+        week = weeks.setdefault(
+            week_start,
+            {
+                "week_start": week_start.isoformat(),
+                "performances_count": 0,
+                "tickets_available": 0,
+            },
+        )
+        week["performances_count"] += day["performances_count"]
+        week["tickets_available"] += day["tickets_available"]
+    return {
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "days": days,
+        "weeks": list(weeks.values()),
+    }
@@ -0,0 +1,164 @@
+"""
+Full-text search over plays and actors. Both are indexed in one table,
+theatre_search_index, created by migration 0010 for the database in use:
+on PostgreSQL it holds a weighted tsvector (titles and names weigh more
+than descriptions) behind a GIN index and is ranked with ts_rank, on
+SQLite it is an FTS5 table ranked with bm25. Signals and the catalogue
+import keep it current as plays and actors change.
+"""
+
+import re
+
+from django.db import connection
+
+from theatre.models import Actor, Play
+
+
+KINDS = ("play", "actor")
+
+
+def _document(instance):
+    """(kind, id, title, body) indexed for a play or an actor."""
+    if isinstance(instance, Play):
+        return "play", instance.pk, instance.title, instance.description
+    if isinstance(instance, Actor):
+        name = f"{instance.first_name} {instance.last_name}"
+        return "actor", instance.pk, name, ""
+    raise TypeError(f"{type(instance).__name__} is not searchable.")
+
+
+class PostgresSearchIndex:
+    def index(self, cursor, documents):
+        cursor.executemany(
+            "INSERT INTO theatre_search_index "
+            "(kind, object_id, title, document) "
+            "VALUES (%s, %s, %s, "
+            "setweight(to_tsvector('english', %s), 'A') "
+            "|| setweight(to_tsvector('english', %s), 'B')) "
+            "ON CONFLICT (kind, object_id) DO UPDATE "
+            "SET title = EXCLUDED.title, document = EXCLUDED.document",
+            [
+                (kind, object_id, title, title, body)
+                for kind, object_id, title, body in documents
+            ],
+        )
+
+    def remove(self, cursor, kind, ids):
+        cursor.execute(
+            "DELETE FROM theatre_search_index "
+            "WHERE kind = %s AND object_id = ANY(%s)",
+            [kind, list(ids)],
+        )
+
+    def search(self, cursor, text, kind, offset, limit):
+        cursor.execute(
+            "SELECT kind, object_id, title "
+            "FROM theatre_search_index, "
+            "websearch_to_tsquery('english', %s) query "
+            "WHERE document @@ query AND (%s::text IS NULL OR kind = %s) "
+            "ORDER BY ts_rank(document, query) DESC, kind, object_id "
+            "LIMIT %s OFFSET %s",
+            [text, kind, kind, limit, offset],
+        )
+        return cursor.fetchall()
+
+
+class SQLiteSearchIndex:
+    """
+    FTS5 tables have no unique keys, so rows are addressed by a rowid
+    derived from the kind and the object id.
+    """
+
+    @staticmethod
+    def _rowid(kind, object_id):
+        return object_id * len(KINDS) + KINDS.index(kind)
+
+    def index(self, cursor, documents):
+        documents = list(documents)
+        self.remove_rowids(
+            cursor, [self._rowid(kind, pk) for kind, pk, *_ in documents]
+        )
+        cursor.executemany(
+            "INSERT INTO theatre_search_index "
+            "(rowid, kind, object_id, title, body) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            [
+                (self._rowid(kind, object_id), kind, object_id, title, body)
+                for kind, object_id, title, body in documents
+            ],
+        )
+
+    def remove(self, cursor, kind, ids):
+        self.remove_rowids(cursor, [self._rowid(kind, pk) for pk in ids])
+
+    def remove_rowids(self, cursor, rowids):
+        cursor.executemany(
+            "DELETE FROM theatre_search_index WHERE rowid = %s",
+            [(rowid,) for rowid in rowids],
+        )
+
+    def search(self, cursor, text, kind, offset, limit):
+        # Quote every word so the input cannot use FTS5 query syntax
+        terms = " ".join(f'"{word}"' for word in re.findall(r"\w+", text))
+        if not terms:
+            return []
+        cursor.execute(
+            "SELECT kind, object_id, title FROM theatre_search_index "
+            "WHERE theatre_search_index MATCH %s "
+            "AND (%s IS NULL OR kind = %s) "
+            "ORDER BY bm25(theatre_search_index, 0, 0, 10.0, 1.0), "
+            "kind, object_id "
+            "LIMIT %s OFFSET %s",
+            [terms, kind, kind, limit, offset],
+        )
+        return cursor.fetchall()
+
+
+SEARCH_INDEXES = {
+    "postgresql": PostgresSearchIndex(),
+    "sqlite": SQLiteSearchIndex(),
+}
+
+
+def _search_index():
+    return SEARCH_INDEXES[connection.vendor]
+
+
+def index_objects(instances):
+    """Add or refresh plays and actors in the search index."""
+    documents = [_document(instance) for instance in instances]
+    if documents:
+        with connection.cursor() as cursor:
+            _search_index().index(cursor, documents)
+
+
+def remove_objects(kind, ids):
+    with connection.cursor() as cursor:
+        _search_index().remove(cursor, kind, ids)
+
+
+def rebuild_index(batch_size=1000):
+    """Index every play and actor again and return how many there are."""
+    count = 0
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM theatre_search_index")
+    for model in (Play, Actor):
+        batch = []
+        for instance in model.objects.order_by("id").iterator(batch_size):
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                index_objects(batch)
+                batch = []
+            count += 1
+        index_objects(batch)
+    return count
+
+
+def search(text, kind=None, offset=0, limit=20):
+    """Best matches for text, optionally only plays or actors."""
+    with connection.cursor() as cursor:
+        rows = _search_index().search(cursor, text, kind, offset, limit)
+    return [
+        {"type": hit_kind, "id": object_id, "title": title}
+        for hit_kind, object_id, title in rows
+    ]
@@ -0,0 +1,389 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from theatre.layouts import get_layout
+from theatre.models import (
+    Performance,
+    Reservation,
+    Ticket,
+    SeatHold,
+    HeldSeat,
+)
+from theatre.schedule import invalidate_schedule
+
+
+class SeatTaken(Exception):
+    def __init__(self, performance_id, row, seat):
+        self.performance_id = performance_id
+        self.row = row
+        self.seat = seat
+        super().__init__(
+            f"Seat {row}-{seat} is already taken "
+            f"for performance {performance_id}."
+        )
+
+
+class HoldExpired(Exception):
+    def __init__(self, hold_id):
+        self.hold_id = hold_id
+        super().__init__(f"Seat hold {hold_id} has expired.")
+
+
+class SeatMap:
+    """
+    Occupancy of a performance, one bit per seat position of the hall in
+    row-major order. Which positions hold a seat comes from the shared
+    hall layout.
+    """
+
+    def __init__(self, rows, seats_in_row, bitmap=None, layout=None):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.layout = layout or get_layout(rows, seats_in_row)
+        size = self.bitmap_size(rows, seats_in_row)
+        if bitmap is None:
+            bitmap = bytes(size)
+        if len(bitmap) != size:
+            raise ValueError("Bitmap does not match the hall dimensions.")
+        self.bitmap = bytearray(bitmap)
+
+    @staticmethod
+    def bitmap_size(rows, seats_in_row):
+        return (rows * seats_in_row + 7) // 8
+
+    @property
+    def capacity(self):
+        return self.layout.capacity
+
+    @property
+    def tickets_taken(self):
+        return int.from_bytes(self.bitmap, "big").bit_count()
+
+    @property
+    def tickets_available(self):
+        return self.capacity - self.tickets_taken
+
+    def __contains__(self, seat):
+        return seat in self.layout
+
+    def _position(self, row, seat):
+        if (row, seat) not in self:
+            raise ValueError(f"There is no seat {row}-{seat} in the hall.")
+        index = (row - 1) * self.seats_in_row + seat - 1
+        return index >> 3, 1 << (index & 7)
+
+    def is_taken(self, row, seat):
+        byte, mask = self._position(row, seat)
+        return bool(self.bitmap[byte] & mask)
+
+    def take(self, row, seat):
+        byte, mask = self._position(row, seat)
+        self.bitmap[byte] |= mask
+
+    def release(self, row, seat):
+        byte, mask = self._position(row, seat)
+        self.bitmap[byte] &= ~mask
+
+    def taken_seats(self):
+        for byte, value in enumerate(self.bitmap):
+            if not value:
+                continue
+            for bit in range(8):
+                if value & (1 << bit):
+                    row, number = divmod((byte << 3) + bit, self.seats_in_row)
+                    yield row + 1, number + 1
+
+
+def build_seat_map(performance):
+    """Rebuild the seat map of a performance from its tickets."""
+    hall = performance.theatre_hall
+    seat_map = SeatMap(
+        hall.rows, hall.seats_in_row, layout=hall.get_layout()
+    )
+    tickets = Ticket.objects.filter(performance=performance).values_list(
+        "row", "seat"
+    )
+    for seat in tickets.iterator():
+        if seat in seat_map:
+            seat_map.take(*seat)
+    return seat_map
+
+
+def stored_seat_map(performance):
+    """
+    Return the seat map stored on the performance, or None when it was
+    never built or was built for other hall dimensions or layout.
+    """
+    hall = performance.theatre_hall
+    layout = hall.get_layout()
+    bitmap = performance.seat_bitmap
+    if bitmap is not None and performance.seat_bitmap_layout == layout.key:
+        return SeatMap(hall.rows, hall.seats_in_row, bytes(bitmap), layout)
+    return None
+
+
+def get_seat_map(performance):
+    """
+    Return the seat map of the performance, rebuilding it from tickets
+    only when the stored one is missing or outdated.
+    """
+    seat_map = stored_seat_map(performance)
+    if seat_map is not None:
+        return seat_map
+
+    seat_map = build_seat_map(performance)
+    _save_seat_map(performance, seat_map, sold=None)
+    return seat_map
+
+
+def _lock_performance(performance_id):
+    return (
+        Performance.objects.select_related("theatre_hall")
+        .select_for_update(of=("self",))
+        .filter(pk=performance_id)
+        .first()
+    )
+
+
+def _save_seat_map(performance, seat_map, sold):
+    """
+    Store the seat map and move the sales counter by the number of seats
+    sold (negative when released), or set it from the seat map when sold
+    is None.
+    """
+    performance.seat_bitmap = bytes(seat_map.bitmap)
+    performance.seat_bitmap_layout = seat_map.layout.key
+    if sold is None:
+        tickets_sold = seat_map.tickets_taken
+    else:
+        tickets_sold = F("tickets_sold") + sold
+    Performance.objects.filter(pk=performance.pk).update(
+        seat_bitmap=performance.seat_bitmap,
+        seat_bitmap_layout=performance.seat_bitmap_layout,
+        tickets_sold=tickets_sold,
+    )
+    invalidate_schedule(performance.show_time)
+
+
+def _update_seat_map(performance_id, seats, taken):
+    with transaction.atomic():
+        performance = _lock_performance(performance_id)
+        if performance is None:
+            return None
+
+        seat_map = get_seat_map(performance)
+        sold = 0
+        for seat in seats:
+            if seat not in seat_map or seat_map.is_taken(*seat) == taken:
+                continue
+            if taken:
+                seat_map.take(*seat)
+                sold += 1
+            else:
+                seat_map.release(*seat)
+                sold -= 1
+
+        _save_seat_map(performance, seat_map, sold)
+        return seat_map
+
+
+def occupy_seats(performance_id, seats):
+    """Mark (row, seat) pairs as taken in the performance seat map."""
+    return _update_seat_map(performance_id, seats, taken=True)
+
+
+def release_seats(performance_id, seats):
+    """Mark (row, seat) pairs as free in the performance seat map."""
+    return _update_seat_map(performance_id, seats, taken=False)
+
+
+def count_tickets_sold(performances):
+    """
+    Count the tickets of performances (with their halls loaded) the way
+    seat maps do, leaving out tickets on positions without a seat in the
+    current hall layout. Returns counts by performance id.
+    """
+    layouts = {
+        performance.id: performance.theatre_hall.get_layout()
+        for performance in performances
+    }
+    counts = dict.fromkeys(layouts, 0)
+    tickets = Ticket.objects.filter(performance_id__in=layouts).values_list(
+        "performance_id", "row", "seat"
+    )
+    for performance_id, row, seat in tickets.iterator():
+        if (row, seat) in layouts[performance_id]:
+            counts[performance_id] += 1
+    return counts
+
+
+def reset_seat_map(performance_id):
+    """
+    Rebuild the stored seat map from the tickets and set the tickets sold
+    from it.
+    """
+    with transaction.atomic():
+        performance = _lock_performance(performance_id)
+        if performance is None:
+            return
+        _save_seat_map(performance, build_seat_map(performance), sold=None)
+
+
+def reset_hall_seat_maps(theatre_hall_id):
+    """Reset the seat maps of every performance in a hall."""
+    performances = Performance.objects.filter(theatre_hall_id=theatre_hall_id)
+    for performance_id in performances.values_list("id", flat=True):
+        reset_seat_map(performance_id)
+
+
+def _held_seats(performance_id, seats, exclude_hold_id=None):
+    """Return which of the (row, seat) pairs an active hold is keeping."""
+    held = HeldSeat.objects.filter(
+        performance_id=performance_id,
+        hold__expires_at__gt=timezone.now(),
+        row__in={row for row, _ in seats},
+        seat__in={seat for _, seat in seats},
+    )
+    if exclude_hold_id is not None:
+        held = held.exclude(hold_id=exclude_hold_id)
+    return set(held.values_list("row", "seat"))
+
+
+def book_tickets(tickets, hold_id=None):
+    """
+    Insert unsaved tickets with a single query after checking, under a
+    lock on every affected performance, that none of their seats is taken
+    or held by anyone but the given hold.
+    """
+    seats = defaultdict(list)
+    for ticket in tickets:
+        seats[ticket.performance_id].append((ticket.row, ticket.seat))
+
+    with transaction.atomic():
+        locked = []
+        for performance_id in sorted(seats):
+            performance = _lock_performance(performance_id)
+            seat_map = get_seat_map(performance)
+            held = _held_seats(performance_id, seats[performance_id], hold_id)
+            for row, seat in seats[performance_id]:
+                if seat_map.is_taken(row, seat) or (row, seat) in held:
+                    raise SeatTaken(performance_id, row, seat)
+                seat_map.take(row, seat)
+            locked.append((performance, seat_map))
+
+        tickets = Ticket.objects.bulk_create(tickets)
+        for performance, seat_map in locked:
+            _save_seat_map(
+                performance, seat_map, len(seats[performance.id])
+            )
+    return tickets
+
+
+def move_ticket(ticket):
+    """
+    Save a ticket whose seat or performance may have changed, after
+    checking under a lock on the affected performances that the new seat
+    is neither taken nor held.
+    """
+    current = (ticket.performance_id, ticket.row, ticket.seat)
+    with transaction.atomic():
+        # Locks the ticket row before the performances, in the order a
+        # ticket delete does, so a concurrent move of the same ticket
+        # reads the seat this one leaves
+        previous = (
+            Ticket.objects.select_for_update()
+            .filter(pk=ticket.pk)
+            .values_list("performance_id", "row", "seat")
+            .first()
+        )
+        locked = {
+            performance_id: _lock_performance(performance_id)
+            for performance_id in sorted(
+                {ticket.performance_id, previous and previous[0]} - {None}
+            )
+        }
+        if previous != current:
+            performance_id, row, seat = current
+            seat_map = get_seat_map(locked[performance_id])
+            if seat_map.is_taken(row, seat) or _held_seats(
+                performance_id, [(row, seat)]
+            ):
+                raise SeatTaken(performance_id, row, seat)
+        ticket.save()
+    return ticket
+
+
+def hold_seats(performance_id, user_id, seats, duration):
+    """
+    Keep (row, seat) pairs of a performance for the user until the hold
+    expires. Expired holds of the performance are dropped first, so their
+    seats can be held again before the sweeper runs.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        performance = _lock_performance(performance_id)
+        SeatHold.objects.filter(
+            performance_id=performance_id, expires_at__lte=now
+        ).delete()
+        seat_map = get_seat_map(performance)
+        held = _held_seats(performance_id, seats)
+        for row, seat in seats:
+            if seat_map.is_taken(row, seat) or (row, seat) in held:
+                raise SeatTaken(performance_id, row, seat)
+
+        hold = SeatHold.objects.create(
+            performance=performance, user_id=user_id, expires_at=now + duration
+        )
+        HeldSeat.objects.bulk_create(
+            HeldSeat(hold=hold, performance=performance, row=row, seat=seat)
+            for row, seat in seats
+        )
+    return hold
+
+
+def confirm_hold(hold_id, user_id):
+    """
+    Turn an active hold into a reservation with its tickets. The
+    performance is locked before the hold, in the same order as
+    hold_seats, so the two never wait on each other.
+    """
+    hold = SeatHold.objects.filter(pk=hold_id, user_id=user_id).first()
+    if hold is None:
+        raise HoldExpired(hold_id)
+
+    with transaction.atomic():
+        _lock_performance(hold.performance_id)
+        hold = (
+            SeatHold.objects.select_for_update()
+            .filter(pk=hold_id, expires_at__gt=timezone.now())
+            .first()
+        )
+        if hold is None:
+            raise HoldExpired(hold_id)
+
+        reservation = Reservation.objects.create(user_id=user_id)
+        book_tickets(
+            [
+                Ticket(
+                    reservation=reservation,
+                    performance_id=hold.performance_id,
+                    row=held_seat.row,
+                    seat=held_seat.seat,
+                )
+                for held_seat in hold.seats.all()
+            ],
+            hold_id=hold.id,
+        )
+        hold.delete()
+    return reservation
+
+
+def sweep_expired_holds():
+    """Delete every expired hold and return how many were removed."""
+    _, per_model = SeatHold.objects.filter(
+        expires_at__lte=timezone.now()
+    ).delete()
+    return per_model.get(SeatHold._meta.label, 0)
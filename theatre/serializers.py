@@ -1,5 +1,11 @@
+from datetime import timedelta, timezone
+
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils.timezone import localdate
 
 from theatre.models import (
     TheatreHall,
@@ -9,6 +15,17 @@ from theatre.models import (
     Genre,
     Reservation,
     Ticket,
+    SeatHold,
+    HeldSeat,
+)
+from theatre.layouts import get_layout
+from theatre.schedule import MAX_DAYS
+from theatre.search import KINDS
+from theatre.seat_map import (
+    SeatTaken,
+    book_tickets,
+    hold_seats,
+    move_ticket,
 )
 
 
@@ -16,21 +33,168 @@ User = get_user_model()
 
 
 class TheatreHallSerializer(serializers.ModelSerializer):
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        rows, seats_in_row, layout = (
+            attrs.get(field, getattr(self.instance, field, None))
+            for field in ("rows", "seats_in_row", "layout")
+        )
+        try:
+            get_layout(rows, seats_in_row, layout)
+        except ValueError as error:
+            raise serializers.ValidationError({"layout": str(error)})
+        return data
+
     class Meta:
         model = TheatreHall
-        fields = ("id", "name", "rows", "seats_in_row")
+        fields = ("id", "name", "rows", "seats_in_row", "capacity", "layout")
 
 
 class PlaySerializer(serializers.ModelSerializer):
+    # Declared because DRF makes relations with a through model read only
+    actors = serializers.PrimaryKeyRelatedField(
+        many=True, queryset=Actor.objects.all(), required=False
+    )
+    genres = serializers.PrimaryKeyRelatedField(
+        many=True, queryset=Genre.objects.all(), required=False
+    )
+
     class Meta:
         model = Play
-        fields = ("id", "title", "description")
+        fields = ("id", "title", "description", "actors", "genres")
+
+
+class PlayListSerializer(PlaySerializer):
+    actors = serializers.SlugRelatedField(
+        many=True, read_only=True, slug_field="full_name"
+    )
+    genres = serializers.SlugRelatedField(
+        many=True, read_only=True, slug_field="name"
+    )
 
 
 class PerformanceSerializer(serializers.ModelSerializer):
+    tickets_available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Performance
+        fields = (
+            "id",
+            "play",
+            "theatre_hall",
+            "show_time",
+            "tickets_sold",
+            "tickets_available",
+        )
+
+
+class PerformanceListSerializer(serializers.ModelSerializer):
+    play_title = serializers.CharField(source="play.title", read_only=True)
+    theatre_hall_name = serializers.CharField(
+        source="theatre_hall.name", read_only=True
+    )
+    theatre_hall_capacity = serializers.IntegerField(
+        source="theatre_hall.capacity", read_only=True
+    )
+    tickets_available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Performance
+        fields = (
+            "id",
+            "show_time",
+            "play",
+            "play_title",
+            "theatre_hall",
+            "theatre_hall_name",
+            "theatre_hall_capacity",
+            "tickets_sold",
+            "tickets_available",
+        )
+
+
+class PerformanceDetailSerializer(PerformanceSerializer):
+    play = PlayListSerializer(read_only=True)
+    theatre_hall = TheatreHallSerializer(read_only=True)
+    tickets_available = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = Performance
-        fields = ("id", "play", "theatre_hall", "show_time")
+        fields = (
+            "id",
+            "play",
+            "theatre_hall",
+            "show_time",
+            "tickets_sold",
+            "tickets_available",
+        )
+
+
+class SeatMapSerializer(serializers.Serializer):
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    tickets_available = serializers.IntegerField()
+    taken_seats = serializers.SerializerMethodField()
+
+    def get_taken_seats(self, seat_map):
+        return [
+            {"row": row, "seat": seat}
+            for row, seat in seat_map.taken_seats()
+        ]
+
+
+class PerformanceCalendarQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    to = serializers.DateField(required=False)
+    hall = serializers.IntegerField(required=False, min_value=1)
+
+    def get_fields(self):
+        # "from" is a keyword, so the field cannot be declared by its name
+        fields = super().get_fields()
+        fields["from"] = fields.pop("date_from")
+        return fields
+
+    def validate(self, attrs):
+        date_from = attrs.setdefault("from", localdate())
+        date_to = attrs.setdefault("to", date_from + timedelta(days=6))
+        if date_to < date_from:
+            raise serializers.ValidationError(
+                {"to": "Must not be before from."}
+            )
+        if (date_to - date_from).days >= MAX_DAYS:
+            raise serializers.ValidationError(
+                {"to": f"The calendar covers at most {MAX_DAYS} days."}
+            )
+        return attrs
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    text = serializers.CharField(max_length=200)
+    kind = serializers.ChoiceField(choices=KINDS, required=False)
+    page = serializers.IntegerField(min_value=1, default=1)
+    page_size = serializers.IntegerField(
+        min_value=1, max_value=100, default=api_settings.PAGE_SIZE
+    )
+
+    def get_fields(self):
+        # Served as ?q= and ?type=, names that flake8 does not allow here
+        fields = super().get_fields()
+        fields["q"] = fields.pop("text")
+        fields["type"] = fields.pop("kind")
+        return fields
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    text = serializers.CharField(max_length=100)
+    kind = serializers.ChoiceField(choices=KINDS, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields["q"] = fields.pop("text")
+        fields["type"] = fields.pop("kind")
+        return fields
 
 
 class ActorSerializer(serializers.ModelSerializer):
@@ -45,41 +209,173 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ("id", "name")
 
 
+class PlayDetailSerializer(PlaySerializer):
+    actors = ActorSerializer(many=True, read_only=True)
+    genres = GenreSerializer(many=True, read_only=True)
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("id", "username", "email")
 
 
+class TicketSerializer(serializers.ModelSerializer):
+    performance = serializers.PrimaryKeyRelatedField(
+        queryset=Performance.objects.select_related("theatre_hall")
+    )
+    reservation = serializers.PrimaryKeyRelatedField(
+        queryset=Reservation.objects.all()
+    )
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        row, seat, performance = (
+            attrs.get(field, getattr(self.instance, field, None))
+            for field in ("row", "seat", "performance")
+        )
+        Ticket.validate_ticket(
+            row, seat, performance.theatre_hall, serializers.ValidationError
+        )
+        return data
+
+    def create(self, validated_data):
+        try:
+            return book_tickets([Ticket(**validated_data)])[0]
+        except (SeatTaken, IntegrityError) as error:
+            raise serializers.ValidationError(str(error))
+
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        try:
+            return move_ticket(instance)
+        except (SeatTaken, IntegrityError) as error:
+            raise serializers.ValidationError(str(error))
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "performance", "reservation")
+
+
+class TicketListSerializer(TicketSerializer):
+    play_title = serializers.CharField(
+        source="performance.play.title", read_only=True
+    )
+    theatre_hall_name = serializers.CharField(
+        source="performance.theatre_hall.name", read_only=True
+    )
+    show_time = serializers.DateTimeField(
+        source="performance.show_time", read_only=True
+    )
+
+    class Meta:
+        model = Ticket
+        fields = (
+            "id",
+            "row",
+            "seat",
+            "performance",
+            "reservation",
+            "play_title",
+            "theatre_hall_name",
+            "show_time",
+        )
+
+
+class ReservationTicketSerializer(TicketSerializer):
+    reservation = None
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "performance")
+        validators = []
+
+
 class ReservationSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(
         queryset=get_user_model().objects.all()
     )
     created_at = serializers.DateTimeField(
-        format="%Y-%m-%dT%H:%M:%S%z", read_only=True
+        format="%Y-%m-%dT%H:%M:%SZ",
+        default_timezone=timezone.utc,
+        read_only=True,
     )
+    tickets = ReservationTicketSerializer(many=True, required=False)
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        created_at = instance.created_at
-        representation["created_at"] = (
-            created_at.strftime("%Y-%m-%dT%H:%M:%S") + "Z"
-        )
-        return representation
+    def create(self, validated_data):
+        tickets_data = validated_data.pop("tickets", [])
+        try:
+            with transaction.atomic():
+                reservation = Reservation.objects.create(**validated_data)
+                book_tickets(
+                    [
+                        Ticket(reservation=reservation, **ticket_data)
+                        for ticket_data in tickets_data
+                    ]
+                )
+        except (SeatTaken, IntegrityError) as error:
+            raise serializers.ValidationError({"tickets": str(error)})
+        return reservation
+
+    def update(self, instance, validated_data):
+        if "tickets" in validated_data:
+            raise serializers.ValidationError(
+                {"tickets": "Tickets of a reservation cannot be replaced."}
+            )
+        return super().update(instance, validated_data)
 
     class Meta:
         model = Reservation
-        fields = ("id", "created_at", "user")
+        fields = ("id", "created_at", "user", "tickets")
 
 
-class TicketSerializer(serializers.ModelSerializer):
-    performance = serializers.PrimaryKeyRelatedField(
-        queryset=Performance.objects.all()
-    )
-    reservation = serializers.PrimaryKeyRelatedField(
-        queryset=Reservation.objects.all()
-    )
+class ReservationListSerializer(ReservationSerializer):
+    tickets_count = serializers.IntegerField(read_only=True)
 
     class Meta:
-        model = Ticket
-        fields = ("id", "row", "seat", "performance", "reservation")
+        model = Reservation
+        fields = ("id", "created_at", "user", "tickets_count", "tickets")
+
+
+class UserReservationSerializer(ReservationSerializer):
+    tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class HeldSeatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HeldSeat
+        fields = ("row", "seat")
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    seats = HeldSeatSerializer(many=True)
+
+    def validate_seats(self, seats):
+        if not seats:
+            raise serializers.ValidationError("Hold at least one seat.")
+        seats = [(seat["row"], seat["seat"]) for seat in seats]
+        if len(set(seats)) != len(seats):
+            raise serializers.ValidationError("Seats must not repeat.")
+        theatre_hall = self.context["performance"].theatre_hall
+        for row, seat in seats:
+            Ticket.validate_ticket(
+                row, seat, theatre_hall, serializers.ValidationError
+            )
+        return seats
+
+    def create(self, validated_data):
+        try:
+            return hold_seats(
+                validated_data["performance"].id,
+                validated_data["user_id"],
+                validated_data["seats"],
+                timedelta(minutes=settings.SEAT_HOLD_MINUTES),
+            )
+        except (SeatTaken, IntegrityError) as error:
+            raise serializers.ValidationError({"seats": str(error)})
+
+    class Meta:
+        model = SeatHold
+        fields = ("id", "performance", "seats", "created_at", "expires_at")
+        read_only_fields = ("performance", "created_at", "expires_at")
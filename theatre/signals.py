@@ -0,0 +1,200 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from theatre import autocomplete
+from theatre.cache import invalidate_namespace
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Actor,
+    Genre,
+    PlayActor,
+    PlayGenre,
+    Ticket,
+)
+from theatre.schedule import invalidate_schedule
+from theatre.search import index_objects, remove_objects
+from theatre.seat_map import (
+    occupy_seats,
+    release_seats,
+    reset_hall_seat_maps,
+    reset_seat_map,
+)
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_seat(sender, instance, raw, **kwargs):
+    instance._previous_seat = None
+    if instance.pk and not raw:
+        instance._previous_seat = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values_list("performance_id", "row", "seat")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def occupy_ticket_seat(sender, instance, raw, **kwargs):
+    if raw:
+        reset_seat_map(instance.performance_id)
+        return
+
+    current = (instance.performance_id, instance.row, instance.seat)
+    previous = getattr(instance, "_previous_seat", None)
+    if previous == current:
+        return
+    if previous:
+        release_seats(previous[0], [previous[1:]])
+    occupy_seats(instance.performance_id, [(instance.row, instance.seat)])
+
+
+class SeatReleases:
+    """
+    Seats of the tickets removed by one delete() call. Deleting a hall,
+    play, user or reservation cascades to many tickets, and their seats
+    are freed with one seat map update per performance instead of one
+    per ticket. Performances deleted by the same call are left alone.
+    """
+
+    def __init__(self):
+        self.seats = defaultdict(list)
+        self.deleted_performances = set()
+
+    @classmethod
+    def of(cls, origin):
+        # The origin is the instance or queryset delete() was called on
+        releases = getattr(origin, "_seat_releases", None)
+        if releases is None:
+            releases = origin._seat_releases = cls()
+        return releases
+
+    def release(self):
+        seats, self.seats = self.seats, defaultdict(list)
+        for performance_id in sorted(seats):
+            if performance_id not in self.deleted_performances:
+                release_seats(performance_id, seats[performance_id])
+
+
+@receiver(pre_delete, sender=Performance)
+def remember_deleted_performance(sender, instance, origin=None, **kwargs):
+    if origin is not None:
+        SeatReleases.of(origin).deleted_performances.add(instance.pk)
+
+
+@receiver(pre_delete, sender=Ticket)
+def remember_released_seat(sender, instance, origin=None, **kwargs):
+    if origin is not None:
+        SeatReleases.of(origin).seats[instance.performance_id].append(
+            (instance.row, instance.seat)
+        )
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket_seat(sender, instance, origin=None, **kwargs):
+    if origin is None:
+        release_seats(instance.performance_id, [(instance.row, instance.seat)])
+        return
+    # Every pre_delete of the call comes before the first post_delete and
+    # all the tickets are gone by then, so the first one frees every seat
+    SeatReleases.of(origin).release()
+
+
+@receiver(pre_save, sender=TheatreHall)
+def remember_hall_seats(sender, instance, raw, **kwargs):
+    instance._previous_seats = None
+    if instance.pk and not raw:
+        instance._previous_seats = (
+            TheatreHall.objects.filter(pk=instance.pk)
+            .values_list("rows", "seats_in_row", "layout")
+            .first()
+        )
+
+
+@receiver(post_save, sender=TheatreHall)
+def reset_resized_hall_seat_maps(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        return
+    seats = (instance.rows, instance.seats_in_row, instance.layout)
+    if raw or getattr(instance, "_previous_seats", None) != seats:
+        # Seats were added, removed or moved, so every bitmap and counter
+        # of the hall is rebuilt from the tickets
+        reset_hall_seat_maps(instance.pk)
+
+
+@receiver(pre_save, sender=Performance)
+def remember_performance_show_time(sender, instance, raw, **kwargs):
+    instance._previous_show_time = None
+    if instance.pk and not raw:
+        instance._previous_show_time = (
+            Performance.objects.filter(pk=instance.pk)
+            .values_list("show_time", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Performance)
+def invalidate_performance_days(sender, instance, raw, **kwargs):
+    if raw:
+        invalidate_schedule()
+        return
+    invalidate_schedule(
+        instance.show_time, getattr(instance, "_previous_show_time", None)
+    )
+
+
+@receiver(post_delete, sender=Performance)
+def invalidate_deleted_performance_day(sender, instance, **kwargs):
+    invalidate_schedule(instance.show_time)
+
+
+@receiver(post_save, sender=Play)
+@receiver(post_save, sender=Actor)
+def index_searchable(sender, instance, **kwargs):
+    index_objects([instance])
+    transaction.on_commit(lambda: autocomplete.index_object(instance))
+
+
+@receiver(post_delete, sender=Play)
+@receiver(post_delete, sender=Actor)
+def remove_searchable(sender, instance, **kwargs):
+    kind, pk = sender._meta.model_name, instance.pk
+    remove_objects(kind, [pk])
+    transaction.on_commit(lambda: autocomplete.remove_object(kind, pk))
+
+
+def invalidate_catalogue_cache(sender, **kwargs):
+    namespaces = {sender._meta.label_lower}
+    if sender in (Actor, Genre, PlayActor, PlayGenre):
+        # Actor and genre names are embedded in play responses
+        namespaces.add(Play._meta.label_lower)
+    for namespace in namespaces:
+        invalidate_namespace(namespace)
+        transaction.on_commit(
+            lambda namespace=namespace: invalidate_namespace(namespace)
+        )
+    if sender in (TheatreHall, Play):
+        # Hall names and capacities and play titles are part of every day
+        invalidate_schedule()
+
+
+for catalogue_model in (TheatreHall, Play, Actor, Genre, PlayActor, PlayGenre):
+    post_save.connect(invalidate_catalogue_cache, sender=catalogue_model)
+    post_delete.connect(invalidate_catalogue_cache, sender=catalogue_model)
+
+
+@receiver(m2m_changed, sender=PlayActor)
+@receiver(m2m_changed, sender=PlayGenre)
+def invalidate_play_credits(sender, action, **kwargs):
+    # add(), remove() and set() write the through rows without save signals
+    if action.startswith("post_"):
+        invalidate_catalogue_cache(sender)
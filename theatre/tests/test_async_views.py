@@ -0,0 +1,180 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket,
+)
+from theatre_service.throttling import get_bucket_store
+
+
+User = get_user_model()
+
+
+class AsyncViewsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.api_client = APIClient()
+        self.api_client.force_authenticate(self.user)
+        play = Play.objects.create(title="Hamlet", description="Tragedy")
+        theatre_hall = TheatreHall.objects.create(
+            name="Main Hall", rows=5, seats_in_row=5
+        )
+        show_time = timezone.now()
+        self.performances = [
+            Performance.objects.create(
+                play=play,
+                theatre_hall=theatre_hall,
+                show_time=show_time + timezone.timedelta(hours=hours % 2),
+            )
+            for hours in range(5)
+        ]
+        self.reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            row=1,
+            seat=2,
+            performance=self.performances[0],
+            reservation=self.reservation,
+        )
+
+    def test_performance_list_matches_sync_endpoint(self):
+        url = reverse("theatre:async_performance_list") + "?page_size=2"
+        results = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            results.extend(response.json()["results"])
+            url = response.json()["next"]
+
+        expected = self.api_client.get(
+            reverse("theatre:performances-list")
+        ).json()["results"]
+        self.assertEqual(results, expected)
+
+    def test_performance_pages_match_sync_endpoint(self):
+        query = "?page_size=2"
+        sync_page = self.api_client.get(
+            reverse("theatre:performances-list") + query
+        ).json()
+        response = self.client.get(
+            reverse("theatre:async_performance_list") + query
+        )
+        self.assertEqual(response.json()["results"], sync_page["results"])
+
+        response = self.client.get(response.json()["next"])
+        page = response.json()
+        self.assertEqual(set(page), {"next", "previous", "results"})
+        self.assertIsNotNone(page["previous"])
+        previous = self.client.get(page["previous"]).json()
+        self.assertEqual(previous["results"], sync_page["results"])
+
+    @override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"anon": "1/min", "user": "1/min"},
+        }
+    )
+    def test_throttles_apply(self):
+        get_bucket_store().clear()
+        self.addCleanup(get_bucket_store().clear)
+        url = reverse("theatre:async_performance_list")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        response = self.client.get(url)
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", response)
+
+    def test_performance_list_filters_match_sync_endpoint(self):
+        query = f"?theatre_hall={self.performances[0].theatre_hall_id}"
+        expected = self.api_client.get(
+            reverse("theatre:performances-list") + query
+        ).json()
+        response = self.client.get(
+            reverse("theatre:async_performance_list") + query
+        )
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(len(expected["results"]), 5)
+
+        response = self.client.get(
+            reverse("theatre:async_performance_list") + "?theatre_hall=0"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_performance_list_rejects_invalid_cursor(self):
+        response = self.client.get(
+            reverse("theatre:async_performance_list") + "?cursor=broken"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_seat_map_matches_sync_endpoint(self):
+        kwargs = {"pk": self.performances[0].pk}
+        response = self.client.get(
+            reverse("theatre:async_performance_seat_map", kwargs=kwargs)
+        )
+        expected = self.api_client.get(
+            reverse("theatre:performances-seat-map", kwargs=kwargs)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected.json())
+
+    def test_reservation_requires_token(self):
+        url = reverse(
+            "theatre:async_reservation_detail",
+            kwargs={"pk": self.reservation.pk},
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        expected = self.client.get(
+            reverse(
+                "theatre:reservations-detail",
+                kwargs={"pk": self.reservation.pk},
+            )
+        )
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(
+            response["WWW-Authenticate"], expected["WWW-Authenticate"]
+        )
+
+        response = self.client.get(
+            url, HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["tickets"]), 1)
+
+    def test_reservation_with_jwt(self):
+        response = self.client.get(
+            reverse(
+                "theatre:async_reservation_detail",
+                kwargs={"pk": self.reservation.pk},
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_reservation_of_other_user_is_hidden(self):
+        other = User.objects.create_user(
+            username="other", password="testpassword"
+        )
+        token = Token.objects.create(user=other)
+        response = self.client.get(
+            reverse(
+                "theatre:async_reservation_detail",
+                kwargs={"pk": self.reservation.pk},
+            ),
+            HTTP_AUTHORIZATION=f"Token {token.key}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
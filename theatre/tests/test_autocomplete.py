@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre import autocomplete
+from theatre.autocomplete import PrefixIndex
+from theatre.models import Actor, Play
+
+
+class PrefixIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex(
+            [
+                ("play", 1, "King Lear"),
+                ("play", 2, "Hamlet"),
+                ("play", 3, "The Winter's Tale"),
+                ("actor", 1, "Judi Dench"),
+                ("actor", 2, "Laurence Olivier"),
+            ]
+        )
+
+    def test_matches_any_word_start(self):
+        self.assertEqual(
+            self.index.complete("la"), [("actor", 2, "Laurence Olivier")]
+        )
+        self.assertEqual(self.index.complete("le"), [("play", 1, "King Lear")])
+        self.assertEqual(
+            self.index.complete("  KING   l"), [("play", 1, "King Lear")]
+        )
+        self.assertEqual(self.index.complete("ear"), [])
+
+    def test_limit_and_kind(self):
+        self.assertEqual(len(self.index.complete("", limit=3)), 3)
+        self.assertEqual(self.index.complete("h"), [("play", 2, "Hamlet")])
+        self.assertEqual(self.index.complete("h", kind="actor"), [])
+
+    def test_update_and_remove(self):
+        self.index.update("play", 2, "Macbeth")
+        self.assertEqual(self.index.complete("ham"), [])
+        self.assertEqual(self.index.complete("mac"), [("play", 2, "Macbeth")])
+
+        self.index.remove("actor", 1)
+        self.assertEqual(self.index.complete("dench"), [])
+        self.assertEqual(len(self.index), 4)
+
+
+class AutocompleteAPITest(APITestCase):
+    def setUp(self):
+        autocomplete.reset_index()
+        self.addCleanup(autocomplete.reset_index)
+        self.url = reverse("theatre:autocomplete")
+        self.play = Play.objects.create(
+            title="King Lear", description="Tragedy"
+        )
+        self.actor = Actor.objects.create(first_name="Ian", last_name="King")
+
+    def complete(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()["results"]
+
+    def test_suggestions_without_database(self):
+        self.complete(q="k")
+        with self.assertNumQueries(0):
+            results = self.complete(q="kin", type="actor")
+        self.assertEqual(
+            results,
+            [{"type": "actor", "id": self.actor.id, "label": "Ian King"}],
+        )
+
+    def test_signals_update_the_index(self):
+        self.complete(q="k")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.play.title = "Macbeth"
+            self.play.save()
+            self.actor.delete()
+            hamlet = Play.objects.create(title="Hamlet", description="")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.complete(q="k"), [])
+            self.assertEqual(
+                [result["id"] for result in self.complete(q="m")],
+                [self.play.id],
+            )
+            self.assertEqual(
+                [result["id"] for result in self.complete(q="ham")],
+                [hamlet.id],
+            )
+
+    @override_settings(AUTOCOMPLETE_REFRESH=0)
+    def test_index_is_rebuilt_in_the_background(self):
+        self.complete(q="k")
+        Play.objects.filter(pk=self.play.pk).update(title="Othello")
+
+        with mock.patch.object(autocomplete, "run_in_background") as run:
+            # The request is answered from the current index
+            with self.assertNumQueries(0):
+                self.assertEqual(self.complete(q="oth"), [])
+                self.complete(q="oth")
+            run.assert_called_once()
+
+            run.call_args.args[0]()
+            self.assertEqual(self.complete(q="oth")[0]["id"], self.play.id)
+
+    def test_rebuild_keeps_changes_made_meanwhile(self):
+        self.complete(q="k")
+        build_index = autocomplete.build_index
+
+        def build_while_saving():
+            index = build_index()
+            autocomplete.index_object(Play(pk=self.play.pk, title="Tempest"))
+            return index
+
+        with mock.patch.object(
+            autocomplete, "build_index", build_while_saving
+        ):
+            autocomplete.rebuild_index()
+        self.assertEqual(self.complete(q="temp")[0]["id"], self.play.id)
+        self.assertEqual(self.complete(q="lear"), [])
+
+    def test_query_is_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,19 @@
+from django.test import TestCase
+
+from benchmarks import data
+from theatre.models import Performance, Ticket
+from theatre.seat_map import build_seat_map, stored_seat_map
+
+
+class BenchmarkDataTest(TestCase):
+    def test_generated_seat_maps_match_tickets(self):
+        data.generate(halls=2, plays=3, performances=5, tickets=300, users=3)
+
+        self.assertEqual(Ticket.objects.count(), 300)
+        for performance in Performance.objects.select_related("theatre_hall"):
+            seat_map = stored_seat_map(performance)
+            if seat_map is None:
+                continue
+            self.assertEqual(
+                seat_map.bitmap, build_seat_map(performance).bitmap
+            )
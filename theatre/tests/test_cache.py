@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.cache import get_response_cache, reset_response_cache
+from theatre.models import Play
+
+
+User = get_user_model()
+
+
+# Keeps the cache in memory, so the query counts are the views' own
+@override_settings(
+    RESPONSE_CACHE={"BACKEND": "theatre.cache.LocalResponseCache"}
+)
+class CatalogueResponseCacheTest(APITestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.play = Play.objects.create(title="Hamlet", description="Tragedy")
+        self.url = reverse("theatre:plays-list")
+
+    def test_cached_response_skips_database(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+
+    def test_save_invalidates_cache(self):
+        self.client.get(self.url)
+        self.play.title = "Macbeth"
+        self.play.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["results"][0]["title"], "Macbeth")
+
+    def test_delete_invalidates_detail_cache(self):
+        url = reverse("theatre:plays-detail", kwargs={"pk": self.play.pk})
+        self.client.get(url)
+        self.play.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    @override_settings(
+        RESPONSE_CACHE={
+            "BACKEND": "theatre.cache.DjangoResponseCache",
+            "OPTIONS": {"alias": "default", "timeout": 60},
+        }
+    )
+    def test_django_cache_backend(self):
+        get_response_cache().clear()
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+        Play.objects.create(title="Othello", description="Tragedy")
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+
+class DefaultResponseCacheTest(APITestCase):
+    def test_responses_are_shared_between_workers(self):
+        get_response_cache().clear()
+        url = reverse("theatre:genres-list")
+        first = self.client.get(url)
+        # A fresh backend instance stands in for another worker
+        reset_response_cache(setting="RESPONSE_CACHE")
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(url)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertFalse(
+            any("theatre_genre" in query["sql"] for query in queries)
+        )
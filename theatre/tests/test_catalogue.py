@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from theatre.models import TheatreHall, Play, Performance, Genre
+
+
+RECORDS = [
+    {
+        "model": "theatre_hall",
+        "id": 3,
+        "name": "Main Hall",
+        "rows": 10,
+        "seats_in_row": 15,
+    },
+    {"model": "play", "id": 7, "title": "Hamlet", "description": "Tragedy"},
+    {"model": "genre", "name": "Drama"},
+    {
+        "model": "performance",
+        "id": 11,
+        "play": 7,
+        "theatre_hall": 3,
+        "show_time": "2024-08-21T19:00:00+00:00",
+    },
+]
+
+
+class CatalogueCommandsTest(TestCase):
+    def write_file(self, suffix, content):
+        temporary = tempfile.NamedTemporaryFile(
+            "w", suffix=suffix, delete=False
+        )
+        with temporary:
+            temporary.write(content)
+        self.addCleanup(os.remove, temporary.name)
+        return temporary.name
+
+    def import_catalogue(self, *args):
+        out = StringIO()
+        call_command("import_catalogue", *args, stdout=out)
+        return out.getvalue()
+
+    def import_jsonl(self, records, *args):
+        content = "".join(json.dumps(record) + "\n" for record in records)
+        return self.import_catalogue(self.write_file(".jsonl", content), *args)
+
+    def test_import_jsonl(self):
+        output = self.import_jsonl(RECORDS, "--batch-size", "2")
+
+        self.assertIn("Imported 4 rows", output)
+        self.assertIn("rows/sec", output)
+        performance = Performance.objects.get(pk=11)
+        self.assertEqual(performance.play.title, "Hamlet")
+        self.assertEqual(performance.theatre_hall_id, 3)
+        self.assertEqual(
+            performance.show_time.isoformat(), "2024-08-21T19:00:00+00:00"
+        )
+        self.assertEqual(Genre.objects.get().name, "Drama")
+
+    def test_import_updates_existing_rows(self):
+        self.import_jsonl(RECORDS)
+        self.import_jsonl(
+            [
+                {
+                    "model": "play",
+                    "id": 7,
+                    "title": "Macbeth",
+                    "description": "Tragedy",
+                }
+            ]
+        )
+        self.assertEqual(Play.objects.get().title, "Macbeth")
+
+    def test_ids_keep_counting_after_import(self):
+        self.import_jsonl(RECORDS)
+        play = Play.objects.create(title="Othello", description="Tragedy")
+        self.assertGreater(play.id, 7)
+
+    def test_import_csv(self):
+        path = self.write_file(
+            ".csv",
+            "name,rows,seats_in_row\nSmall Hall,5,8\nBig Hall,20,30\n",
+        )
+        self.import_catalogue(path, "--model", "theatre_hall")
+        self.assertEqual(
+            list(TheatreHall.objects.values_list("name", "rows")),
+            [("Small Hall", 5), ("Big Hall", 20)],
+        )
+
+    def test_invalid_record_rolls_back(self):
+        records = RECORDS + [{"model": "play", "id": "x"}]
+        with self.assertRaises(CommandError):
+            self.import_jsonl(records)
+        self.assertFalse(Play.objects.exists())
+
+    def test_unknown_model_is_rejected(self):
+        with self.assertRaises(CommandError):
+            self.import_jsonl([{"model": "ticket", "row": 1}])
+
+    def test_export_jsonl_round_trip(self):
+        self.import_jsonl(RECORDS)
+        out = StringIO()
+        call_command("export_catalogue", stdout=out, stderr=StringIO())
+
+        exported = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(exported), 4)
+        self.assertEqual(exported[1], RECORDS[1])
+        self.assertEqual(exported[3], RECORDS[3])
+
+        Performance.objects.all().delete()
+        self.import_jsonl(exported)
+        self.assertTrue(Performance.objects.filter(pk=11).exists())
+
+    def test_export_csv(self):
+        self.import_jsonl(RECORDS)
+        path = self.write_file(".csv", "")
+        call_command(
+            "export_catalogue",
+            "--output",
+            path,
+            "--model",
+            "play",
+            stderr=StringIO(),
+        )
+        with open(path) as exported:
+            self.assertEqual(
+                exported.read().splitlines(),
+                ["id,title,description", "7,Hamlet,Tragedy"],
+            )
+
+    def test_export_csv_needs_single_model(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "export_catalogue", "--format", "csv", stdout=StringIO()
+            )
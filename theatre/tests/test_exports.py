@@ -0,0 +1,159 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket,
+)
+from theatre.views import TicketViewSet
+
+
+User = get_user_model()
+
+
+class StreamingExportTest(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(
+            username="staff", password="testpassword", is_staff=True
+        )
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(self.staff)
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=5, seats_in_row=5
+            ),
+            show_time=datetime(2024, 8, 21, 19, tzinfo=dt_timezone.utc),
+        )
+        self.reservations = []
+        for day, seats in ((1, (1, 2)), (2, (3,))):
+            reservation = Reservation.objects.create(user=self.user)
+            for seat in seats:
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    performance=self.performance,
+                    reservation=reservation,
+                )
+            created_at = datetime(2024, 8, day, 12, tzinfo=dt_timezone.utc)
+            Reservation.objects.filter(pk=reservation.pk).update(
+                created_at=created_at
+            )
+            reservation.tickets.update(created_at=created_at)
+            self.reservations.append(reservation)
+
+    def export(self, url_name, export_format, **params):
+        response = self.client.get(
+            reverse(url_name), {"format": export_format, **params}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ticket_csv_export(self):
+        content = self.export("theatre:tickets-list", "csv")
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            rows[0],
+            {
+                "id": str(Ticket.objects.get(seat=1).id),
+                "created_at": "2024-08-01T12:00:00+00:00",
+                "reservation": str(self.reservations[0].id),
+                "user": str(self.user.id),
+                "performance": str(self.performance.id),
+                "play_title": "Hamlet",
+                "theatre_hall_name": "Main Hall",
+                "show_time": "2024-08-21T19:00:00+00:00",
+                "row": "1",
+                "seat": "1",
+            },
+        )
+
+    def test_reservation_jsonl_export(self):
+        content = self.export("theatre:reservations-list", "jsonl")
+
+        records = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(
+            [record["tickets_count"] for record in records], [2, 1]
+        )
+        self.assertEqual(records[0]["username"], "testuser")
+
+    def test_export_date_range(self):
+        content = self.export(
+            "theatre:tickets-list",
+            "jsonl",
+            date_from="2024-08-02",
+            date_to="2024-08-02",
+        )
+        records = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([record["seat"] for record in records], [3])
+
+    def test_export_requires_staff(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            reverse("theatre:tickets-list"), {"format": "csv"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_json_list_is_unchanged(self):
+        response = self.client.get(
+            reverse("theatre:tickets-list"), {"date_from": "2024-08-02"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class AsyncStreamingExportTest(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(
+            username="staff", password="testpassword", is_staff=True
+        )
+        self.token = Token.objects.create(user=self.staff)
+        performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=5, seats_in_row=5
+            ),
+            show_time=datetime(2024, 8, 21, 19, tzinfo=dt_timezone.utc),
+        )
+        reservation = Reservation.objects.create(user=self.staff)
+        for seat in range(1, 6):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                performance=performance,
+                reservation=reservation,
+            )
+
+    @mock.patch.object(TicketViewSet, "export_chunk_size", 2)
+    async def test_export_streams_chunks_under_asgi(self):
+        response = await self.async_client.get(
+            reverse("theatre:tickets-list"),
+            {"format": "csv"},
+            headers={"Authorization": f"Token {self.token.key}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # An async iterator is sent chunk by chunk instead of being
+        # collected into a list first
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 3)
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual([row["seat"] for row in rows], list("12345"))
@@ -0,0 +1,116 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.filters import PerformanceFilter
+from theatre.models import TheatreHall, Play, Performance
+
+
+User = get_user_model()
+
+
+class PerformanceFilterTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.hamlet = Play.objects.create(
+            title="Hamlet", description="Tragedy"
+        )
+        self.othello = Play.objects.create(
+            title="Othello", description="Tragedy"
+        )
+        self.main_hall = TheatreHall.objects.create(
+            name="Main Hall", rows=10, seats_in_row=10
+        )
+        self.small_hall = TheatreHall.objects.create(
+            name="Small Hall", rows=5, seats_in_row=5
+        )
+        self.tonight = Performance.objects.create(
+            play=self.hamlet,
+            theatre_hall=self.main_hall,
+            show_time="2024-08-20T19:00:00Z",
+        )
+        self.tomorrow = Performance.objects.create(
+            play=self.othello,
+            theatre_hall=self.small_hall,
+            show_time="2024-08-21T19:00:00Z",
+        )
+        self.url = reverse("theatre:performances-list")
+
+    def get_ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [performance["id"] for performance in response.data["results"]]
+
+    def test_filter_by_play(self):
+        self.assertEqual(
+            self.get_ids({"play": self.othello.id}), [self.tomorrow.id]
+        )
+
+    def test_filter_by_theatre_hall(self):
+        self.assertEqual(
+            self.get_ids({"theatre_hall": self.main_hall.id}),
+            [self.tonight.id],
+        )
+
+    def test_filter_by_date_range(self):
+        self.assertEqual(
+            self.get_ids({"date_from": "2024-08-20", "date_to": "2024-08-20"}),
+            [self.tonight.id],
+        )
+        self.assertEqual(
+            self.get_ids({"date_from": "2024-08-21"}), [self.tomorrow.id]
+        )
+
+    def test_filter_by_title(self):
+        self.assertEqual(self.get_ids({"title": "haml"}), [self.tonight.id])
+
+
+@skipUnless(connection.vendor == "postgresql", "Requires PostgreSQL plans")
+class PerformanceFilterIndexTest(APITestCase):
+    """
+    Seq scans are disabled so the planner shows which index it would use
+    on a table large enough to make scanning it too expensive.
+    """
+
+    def setUp(self):
+        self.play = Play.objects.create(title="Hamlet", description="Tragedy")
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Main Hall", rows=10, seats_in_row=10
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def explain(self, params):
+        queryset = PerformanceFilter(
+            params, queryset=Performance.objects.all()
+        ).qs
+        return queryset.order_by("show_time", "id").explain()
+
+    def test_date_range_uses_show_time_index(self):
+        plan = self.explain(
+            {"date_from": "2024-08-20", "date_to": "2024-08-20"}
+        )
+        self.assertIn("performance_show_time_id_idx", plan)
+
+    def test_play_and_date_use_composite_index(self):
+        plan = self.explain(
+            {"play": self.play.id, "date_from": timezone.now().date()}
+        )
+        self.assertIn("performance_play_show_time_idx", plan)
+
+    def test_hall_and_date_use_composite_index(self):
+        plan = self.explain(
+            {
+                "theatre_hall": self.theatre_hall.id,
+                "date_from": timezone.now().date(),
+            }
+        )
+        self.assertIn("performance_hall_show_time_idx", plan)
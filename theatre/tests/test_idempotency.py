@@ -0,0 +1,196 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import Performance, Play, Reservation, TheatreHall, Ticket
+from theatre_service.idempotency import (
+    DjangoIdempotencyStore,
+    LocalIdempotencyStore,
+    StoredResponse,
+    get_idempotency_store,
+)
+
+
+User = get_user_model()
+
+RESPONSE = StoredResponse("fingerprint", 201, b"{}", "application/json")
+
+
+class LocalIdempotencyStoreTest(SimpleTestCase):
+    def test_duplicates_wait_for_the_running_request(self):
+        store = LocalIdempotencyStore()
+        self.assertTrue(store.claim("key"))
+        self.assertFalse(store.claim("key"))
+
+        replies = []
+        waiter = threading.Thread(
+            target=lambda: replies.append(store.wait("key"))
+        )
+        waiter.start()
+        store.complete("key", RESPONSE)
+        waiter.join()
+        self.assertEqual(replies, [RESPONSE])
+        self.assertFalse(store.claim("key"))
+
+    def test_failed_requests_release_the_key(self):
+        store = LocalIdempotencyStore()
+        store.claim("key")
+        store.complete("key", None)
+        self.assertIsNone(store.wait("key"))
+        self.assertTrue(store.claim("key"))
+
+    def test_storage_is_bounded(self):
+        store = LocalIdempotencyStore(maxsize=2)
+        for key in ("a", "b", "c"):
+            store.claim(key)
+            store.complete(key, RESPONSE)
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(store.get("c"), RESPONSE)
+
+
+class IdempotentBookingTest(APITestCase):
+    def setUp(self):
+        get_idempotency_store().clear()
+        self.addCleanup(get_idempotency_store().clear)
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=5, seats_in_row=5
+            ),
+            show_time=timezone.now(),
+        )
+        self.url = reverse("theatre:reservations-list")
+
+    def book(self, seat=1, key="retry-1"):
+        headers = {"Idempotency-Key": key} if key else {}
+        return self.client.post(
+            self.url,
+            {
+                "user": self.user.id,
+                "tickets": [
+                    {
+                        "row": 1,
+                        "seat": seat,
+                        "performance": self.performance.id,
+                    }
+                ],
+            },
+            format="json",
+            headers=headers,
+        )
+
+    def test_retries_replay_the_first_response(self):
+        first = self.book()
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        # Only the lookup in the shared cache table, the view does not run
+        with self.assertNumQueries(1):
+            retry = self.book()
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_keys_are_scoped_to_the_user(self):
+        self.book()
+        other = User.objects.create_user(
+            username="other", password="testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(other)}"
+        )
+        response = self.book()
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_key_reused_for_another_body(self):
+        self.book()
+        response = self.book(seat=2)
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_failed_requests_are_not_stored(self):
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+        self.assertEqual(self.book().status_code, status.HTTP_400_BAD_REQUEST)
+        Ticket.objects.all().delete()
+        self.assertEqual(self.book().status_code, status.HTTP_201_CREATED)
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        self.book(seat=1, key=None)
+        self.book(seat=2, key=None)
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    @override_settings(
+        IDEMPOTENCY={
+            "BACKEND": "theatre_service.idempotency.LocalIdempotencyStore",
+            "OPTIONS": {"wait_timeout": 0},
+        }
+    )
+    def test_key_in_progress(self):
+        with mock.patch.object(
+            LocalIdempotencyStore, "claim", return_value=False
+        ):
+            response = self.book()
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_responses_are_shared_between_workers(self):
+        self.assertIsInstance(get_idempotency_store(), DjangoIdempotencyStore)
+        first = self.book()
+        # A fresh store, as in another worker, finds the stored response
+        with mock.patch(
+            "theatre_service.idempotency._idempotency_store",
+            DjangoIdempotencyStore(),
+        ):
+            retry = self.book()
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.content, first.content)
+
+    @override_settings(
+        IDEMPOTENCY={
+            "BACKEND": "theatre_service.idempotency.LocalIdempotencyStore",
+            "OPTIONS": {"timeout": 60},
+        }
+    )
+    def test_local_backend(self):
+        get_idempotency_store().clear()
+        first = self.book()
+        retry = self.book()
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_ticket_creation(self):
+        url = reverse("theatre:tickets-list")
+        data = {
+            "row": 2,
+            "seat": 2,
+            "performance": self.performance.id,
+            "reservation": Reservation.objects.create(user=self.user).id,
+        }
+        for _ in range(2):
+            response = self.client.post(
+                url, data, headers={"Idempotency-Key": "ticket-1"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.count(), 1)
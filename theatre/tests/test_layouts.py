@@ -0,0 +1,139 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.layouts import get_layout
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+)
+from theatre.seat_map import get_seat_map
+
+
+User = get_user_model()
+
+LAYOUT = {
+    "rows": ["AA.AA", "BB.BB", ".B.B."],
+    "categories": {"A": "Stalls", "B": "Rear"},
+}
+
+
+class HallLayoutTest(SimpleTestCase):
+    def test_seats_and_categories(self):
+        layout = get_layout(3, 5, LAYOUT)
+        self.assertEqual(layout.capacity, 10)
+        self.assertIn((1, 2), layout)
+        self.assertNotIn((1, 3), layout)
+        self.assertNotIn((3, 1), layout)
+        self.assertNotIn((4, 1), layout)
+        self.assertEqual(layout.category(1, 1), "Stalls")
+        self.assertEqual(layout.category(3, 2), "Rear")
+
+    def test_rectangle_without_plan(self):
+        layout = get_layout(3, 5)
+        self.assertEqual(layout.capacity, 15)
+        self.assertIn((3, 5), layout)
+        self.assertNotIn((3, 6), layout)
+        self.assertIsNone(layout.category(1, 1))
+
+    def test_layouts_are_shared(self):
+        self.assertIs(get_layout(3, 5, LAYOUT), get_layout(3, 5, LAYOUT))
+        self.assertIs(get_layout(3, 5), get_layout(3, 5, None))
+
+    def test_invalid_layouts(self):
+        for layout in (
+            {"rows": ["AAAAA", "AAAAA"], "categories": {"A": "Stalls"}},
+            {"rows": ["AAAA", "AAAAA", "AAAAA"], "categories": {"A": "S"}},
+            {"rows": ["AAAAA", "AAAAA", "AAAAX"], "categories": {"A": "S"}},
+            {"rows": "AAAAA", "categories": {"A": "Stalls"}},
+            {"rows": ["....."] * 3, "categories": {"AB": "Stalls"}},
+            ["AAAAA"] * 3,
+        ):
+            with self.assertRaises(ValueError):
+                get_layout(3, 5, layout)
+
+
+class TheatreHallLayoutTest(TestCase):
+    def setUp(self):
+        self.hall = TheatreHall.objects.create(
+            name="Main Hall", rows=3, seats_in_row=5, layout=LAYOUT
+        )
+
+    def test_capacity_follows_layout(self):
+        self.assertEqual(self.hall.capacity, 10)
+        self.hall.layout = None
+        self.hall.save(update_fields=["layout"])
+        self.hall.refresh_from_db()
+        self.assertEqual(self.hall.capacity, 15)
+
+    def test_clean_rejects_layout_of_another_size(self):
+        self.hall.rows = 4
+        with self.assertRaises(ValidationError):
+            self.hall.clean()
+
+    def test_seat_map_uses_layout(self):
+        performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=self.hall,
+            show_time=timezone.now(),
+        )
+        seat_map = get_seat_map(performance)
+        self.assertIs(seat_map.layout, self.hall.get_layout())
+        self.assertEqual(seat_map.tickets_available, 10)
+        with self.assertRaises(ValueError):
+            seat_map.take(1, 3)
+
+
+class LayoutAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="admin", password="testpassword", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.hall = TheatreHall.objects.create(
+            name="Main Hall", rows=3, seats_in_row=5, layout=LAYOUT
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=self.hall,
+            show_time=timezone.now(),
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def book(self, row, seat):
+        return self.client.post(
+            reverse("theatre:tickets-list"),
+            {
+                "row": row,
+                "seat": seat,
+                "performance": self.performance.id,
+                "reservation": self.reservation.id,
+            },
+        )
+
+    def test_tickets_are_validated_against_layout(self):
+        response = self.book(1, 3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat", response.data)
+        self.assertEqual(self.book(1, 4).status_code, status.HTTP_201_CREATED)
+
+    def test_hall_layout_is_validated(self):
+        url = reverse(
+            "theatre:theatre_halls-detail", kwargs={"pk": self.hall.pk}
+        )
+        response = self.client.patch(url, {"rows": 4}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("layout", response.data)
+
+        layout = {"rows": ["A.A.A"], "categories": {"A": "Stalls"}}
+        response = self.client.patch(
+            url, {"rows": 1, "layout": layout}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["capacity"], 3)
@@ -0,0 +1,140 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.models import TheatreHall, Play, Performance
+from theatre_service.metrics import registry
+
+
+User = get_user_model()
+
+
+@override_settings(
+    MIDDLEWARE=[
+        "theatre_service.metrics.RequestMetricsMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+)
+class RequestMetricsTest(APITestCase):
+    def setUp(self):
+        registry.clear()
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=5, seats_in_row=5
+            ),
+            show_time=timezone.now(),
+        )
+        self.url = reverse(
+            "theatre:performances-seat-map",
+            kwargs={"pk": self.performance.pk},
+        )
+
+    def test_server_timing_header_and_log(self):
+        with self.assertLogs("theatre_service.metrics", "INFO") as logs:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("render;dur=", timing)
+        self.assertIn("app;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["route"], "theatre:performances-seat-map")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["db_queries"], 0)
+        self.assertLessEqual(
+            record["db_ms"] + record["render_ms"] + record["app_ms"],
+            record["duration_ms"] + 0.02,
+        )
+
+    async def test_async_requests_are_measured(self):
+        url = reverse(
+            "theatre:async_performance_seat_map",
+            kwargs={"pk": self.performance.pk},
+        )
+        with self.assertLogs("theatre_service.metrics", "INFO") as logs:
+            response = await self.async_client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Server-Timing", response)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["route"], "theatre:async_performance_seat_map")
+        self.assertGreater(record["db_queries"], 0)
+
+    def test_metrics_endpoint(self):
+        with self.assertLogs("theatre_service.metrics", "INFO"):
+            self.client.get(self.url)
+            self.client.get(self.url)
+
+        self.client.force_authenticate(
+            User.objects.create_user(
+                username="admin", password="testpassword", is_staff=True
+            )
+        )
+        with self.assertLogs("theatre_service.metrics", "INFO"):
+            response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        content = response.content.decode()
+        self.assertIn(
+            "# TYPE theatre_request_duration_seconds histogram", content
+        )
+        self.assertIn(
+            'theatre_db_queries_count{method="GET",'
+            'route="theatre:performances-seat-map"} 2.0',
+            content,
+        )
+        self.assertIn(
+            'theatre_request_duration_seconds_bucket{le="+Inf",'
+            'method="GET",route="theatre:performances-seat-map"} 2.0',
+            content,
+        )
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.force_authenticate(
+            User.objects.create_user(username="user", password="testpassword")
+        )
+        with self.assertLogs("theatre_service.metrics", "INFO"):
+            response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+OBSERVE = """
+import django
+django.setup()
+from theatre_service.metrics import registry
+registry.observe({"method": "GET", "route": "x"}, {"db_queries": 3})
+print(registry.render().decode())
+"""
+
+
+class MultiprocessMetricsTest(SimpleTestCase):
+    def test_workers_share_histograms(self):
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": metrics_dir}
+            for _ in range(2):
+                output = subprocess.run(
+                    [sys.executable, "-c", OBSERVE],
+                    env=env,
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                ).stdout
+        # The second worker serves what both of them observed
+        self.assertIn(
+            'theatre_db_queries_count{method="GET",route="x"} 2.0', output
+        )
@@ -0,0 +1,146 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.cache import get_response_cache
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+
+User = get_user_model()
+
+
+class PlayCreditsTest(APITestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.addCleanup(get_response_cache().clear)
+        self.dench = Actor.objects.create(first_name="Judi", last_name="Dench")
+        self.olivier = Actor.objects.create(
+            first_name="Laurence", last_name="Olivier"
+        )
+        self.tragedy = Genre.objects.create(name="Tragedy")
+        self.comedy = Genre.objects.create(name="Comedy")
+        self.hamlet = Play.objects.create(title="Hamlet", description="")
+        self.hamlet.actors.set([self.olivier, self.dench])
+        self.hamlet.genres.set([self.tragedy])
+        self.twelfth_night = Play.objects.create(
+            title="Twelfth Night", description=""
+        )
+        self.twelfth_night.actors.set([self.dench])
+        self.twelfth_night.genres.set([self.comedy])
+        hall = TheatreHall.objects.create(
+            name="Main Hall", rows=5, seats_in_row=5
+        )
+        self.performances = [
+            Performance.objects.create(
+                play=play, theatre_hall=hall, show_time=timezone.now()
+            )
+            for play in (self.hamlet, self.twelfth_night)
+        ]
+
+    def get_results(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()["results"]
+
+    def test_list_embeds_names(self):
+        plays = self.get_results(reverse("theatre:plays-list"))
+        self.assertEqual(
+            plays[0]["actors"], ["Judi Dench", "Laurence Olivier"]
+        )
+        self.assertEqual(plays[0]["genres"], ["Tragedy"])
+
+    def test_detail_embeds_actors_and_genres(self):
+        response = self.client.get(
+            reverse("theatre:plays-detail", kwargs={"pk": self.hamlet.pk})
+        )
+        self.assertEqual(
+            response.json()["genres"],
+            [{"id": self.tragedy.id, "name": "Tragedy"}],
+        )
+        self.assertEqual(
+            [actor["id"] for actor in response.json()["actors"]],
+            [self.dench.id, self.olivier.id],
+        )
+
+    def test_performance_detail_embeds_names(self):
+        response = self.client.get(
+            reverse(
+                "theatre:performances-detail",
+                kwargs={"pk": self.performances[1].pk},
+            )
+        )
+        self.assertEqual(response.json()["play"]["actors"], ["Judi Dench"])
+        self.assertEqual(response.json()["play"]["genres"], ["Comedy"])
+
+    def test_filter_plays(self):
+        url = reverse("theatre:plays-list")
+        self.assertEqual(
+            [
+                play["id"]
+                for play in self.get_results(url, actor=self.dench.id)
+            ],
+            [self.hamlet.id, self.twelfth_night.id],
+        )
+        self.assertEqual(
+            [
+                play["id"]
+                for play in self.get_results(
+                    url, actor=self.dench.id, genre=self.comedy.id
+                )
+            ],
+            [self.twelfth_night.id],
+        )
+        self.assertEqual(self.get_results(url, actor=0), [])
+
+    def test_filter_performances(self):
+        url = reverse("theatre:performances-list")
+        self.assertEqual(
+            [
+                performance["id"]
+                for performance in self.get_results(url, actor=self.olivier.id)
+            ],
+            [self.performances[0].id],
+        )
+        self.assertEqual(
+            [
+                performance["id"]
+                for performance in self.get_results(url, genre=self.comedy.id)
+            ],
+            [self.performances[1].id],
+        )
+
+    def test_credit_changes_invalidate_cached_plays(self):
+        url = reverse("theatre:plays-detail", kwargs={"pk": self.hamlet.pk})
+        self.client.get(url)
+
+        self.hamlet.genres.add(self.comedy)
+        self.assertEqual(len(self.client.get(url).json()["genres"]), 2)
+
+        self.dench.last_name = "Dame"
+        self.dench.save()
+        self.assertEqual(
+            self.client.get(url).json()["actors"][0]["last_name"], "Dame"
+        )
+
+    def test_staff_set_credits_by_id(self):
+        self.client.force_authenticate(
+            User.objects.create_user(
+                username="admin", password="testpassword", is_staff=True
+            )
+        )
+        response = self.client.post(
+            reverse("theatre:plays-list"),
+            {
+                "title": "Macbeth",
+                "description": "Tragedy",
+                "actors": [self.olivier.id],
+                "genres": [self.tragedy.id],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["actors"], [self.olivier.id])
+        macbeth = Play.objects.get(pk=response.data["id"])
+        self.assertEqual(list(macbeth.genres.all()), [self.tragedy])
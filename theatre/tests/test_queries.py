@@ -0,0 +1,155 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Actor,
+    Genre,
+    Performance,
+    Reservation,
+    Ticket,
+)
+
+
+User = get_user_model()
+
+
+class QueryCountTestCase(APITestCase):
+    """
+    Checks that an endpoint runs the same number of queries however many
+    rows it returns, so a lazily loaded relation shows up as a failure.
+    """
+
+    page_sizes = (2, 20)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context)
+
+    def assert_constant_queries(self, url, create_rows):
+        create_rows(2)
+        few_rows_queries = self.count_queries(url)
+        create_rows(20)
+        many_rows_queries = self.count_queries(url)
+        self.assertEqual(few_rows_queries, many_rows_queries)
+
+    def assert_constant_page_queries(self, url, create_rows):
+        create_rows(max(self.page_sizes))
+        queries = {
+            self.count_queries(f"{url}?page_size={page_size}")
+            for page_size in self.page_sizes
+        }
+        self.assertEqual(len(queries), 1)
+
+
+class TheatreQueryCountTest(QueryCountTestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.client.force_login(self.user)
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Main Hall", rows=30, seats_in_row=30
+        )
+        self.play = Play.objects.create(title="Hamlet", description="Tragedy")
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time=timezone.now(),
+        )
+        self.seats = (
+            (row, seat) for row in range(1, 31) for seat in range(1, 31)
+        )
+
+    def create_performances(self, count):
+        for _ in range(count):
+            Performance.objects.create(
+                play=Play.objects.create(title="Play", description="Play"),
+                theatre_hall=TheatreHall.objects.create(
+                    name="Hall", rows=5, seats_in_row=5
+                ),
+                show_time=timezone.now(),
+            )
+
+    def create_plays(self, count):
+        for _ in range(count):
+            play = Play.objects.create(title="Play", description="Play")
+            play.actors.set(
+                Actor.objects.create(first_name="Actor", last_name=str(number))
+                for number in range(2)
+            )
+            play.genres.add(Genre.objects.create(name="Genre"))
+
+    def create_reservations(self, count):
+        for _ in range(count):
+            reservation = Reservation.objects.create(user=self.user)
+            for _ in range(2):
+                row, seat = next(self.seats)
+                Ticket.objects.create(
+                    row=row,
+                    seat=seat,
+                    performance=self.performance,
+                    reservation=reservation,
+                )
+
+    def test_performance_list(self):
+        self.assert_constant_queries(
+            reverse("theatre:performances-list"), self.create_performances
+        )
+
+    def test_play_list(self):
+        self.assert_constant_queries(
+            reverse("theatre:plays-list"), self.create_plays
+        )
+
+    def test_reservation_list(self):
+        self.assert_constant_queries(
+            reverse("theatre:reservations-list"), self.create_reservations
+        )
+
+    def test_ticket_list(self):
+        self.assert_constant_queries(
+            reverse("theatre:tickets-list"), self.create_reservations
+        )
+
+    def test_performance_admin_list(self):
+        self.assert_constant_queries(
+            reverse("admin:theatre_performance_changelist"),
+            self.create_performances,
+        )
+
+    def test_reservation_admin_list(self):
+        self.assert_constant_queries(
+            reverse("admin:theatre_reservation_changelist"),
+            self.create_reservations,
+        )
+
+    def test_ticket_admin_list(self):
+        self.assert_constant_queries(
+            reverse("admin:theatre_ticket_changelist"),
+            self.create_reservations,
+        )
+
+    def test_performance_list_page_size(self):
+        self.assert_constant_page_queries(
+            reverse("theatre:performances-list"), self.create_performances
+        )
+
+    def test_reservation_list_page_size(self):
+        self.assert_constant_page_queries(
+            reverse("theatre:reservations-list"), self.create_reservations
+        )
+
+    def test_ticket_list_page_size(self):
+        self.assert_constant_page_queries(
+            reverse("theatre:tickets-list"), self.create_reservations
+        )
@@ -0,0 +1,126 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from theatre.models import Play
+from theatre_service import parsers, renderers
+from theatre_service.parsers import FastJSONParser
+from theatre_service.renderers import FastJSONRenderer
+from user.models import User
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assert_renders_like_json_renderer(self, data, **kwargs):
+        self.assertEqual(
+            FastJSONRenderer().render(data, **kwargs),
+            JSONRenderer().render(data, **kwargs),
+        )
+
+    def test_matches_json_renderer(self):
+        self.assert_renders_like_json_renderer(
+            {
+                "id": 1,
+                "title": "Hamlet \u2028 Prince of Denmark \u2029 é",
+                "ratio": 0.1,
+                "price": Decimal("12.50"),
+                "uuid": uuid.UUID(int=1),
+                "created_at": datetime.datetime(
+                    2024, 5, 1, 19, 30, 0, 123456, tzinfo=datetime.timezone.utc
+                ),
+                "naive": datetime.datetime(2024, 5, 1, 19, 30),
+                "date": datetime.date(2024, 5, 1),
+                "time": datetime.time(19, 30),
+                "duration": datetime.timedelta(hours=2),
+                "label": gettext_lazy("Theatre"),
+                "tickets": [{"row": 1, "seat": 2}, None, True],
+                3: "non string key",
+            }
+        )
+
+    def test_none_and_big_integers(self):
+        self.assert_renders_like_json_renderer(None)
+        self.assert_renders_like_json_renderer({"id": 2**70})
+
+    def test_indent_falls_back_to_json_renderer(self):
+        self.assert_renders_like_json_renderer(
+            {"id": 1}, accepted_media_type="application/json; indent=4"
+        )
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assert_renders_like_json_renderer(
+                {"id": 1, "title": "Hamlet"}
+            )
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, body, encoding="utf-8"):
+        return FastJSONParser().parse(
+            io.BytesIO(body), parser_context={"encoding": encoding}
+        )
+
+    def test_matches_json_parser(self):
+        body = '{"title": "Гамлет", "rows": [1, 2.5, null, true]}'.encode()
+        self.assertEqual(
+            self.parse(body),
+            JSONParser().parse(
+                io.BytesIO(body), parser_context={"encoding": "utf-8"}
+            ),
+        )
+
+    def test_invalid_json_raises_parse_error(self):
+        for body in (b"{", b'{"seat": NaN}'):
+            with self.assertRaises(ParseError):
+                self.parse(body)
+
+    def test_other_encodings_fall_back_to_json_parser(self):
+        body = '{"title": "Гамлет"}'.encode("utf-16")
+        self.assertEqual(self.parse(body, "utf-16"), {"title": "Гамлет"})
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(parsers, "orjson", None):
+            self.assertEqual(self.parse(b'{"seat": 1}'), {"seat": 1})
+
+
+class FastJSONAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(
+                username="admin", password="testpassword", is_staff=True
+            )
+        )
+
+    def test_api_uses_fast_json(self):
+        response = self.client.post(
+            reverse("theatre:plays-list"),
+            '{"title": "Гамлет", "description": "Drama"}',
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        play = Play.objects.get()
+        self.assertEqual(play.title, "Гамлет")
+        self.assertEqual(
+            response.content,
+            JSONRenderer().render(
+                {
+                    "id": play.id,
+                    "title": "Гамлет",
+                    "description": "Drama",
+                    "actors": [],
+                    "genres": [],
+                }
+            ),
+        )
@@ -0,0 +1,129 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket,
+)
+from theatre.seat_map import book_tickets
+
+
+User = get_user_model()
+
+
+class SalesCounterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Main Hall", rows=10, seats_in_row=15
+        )
+        self.play = Play.objects.create(title="Hamlet", description="Tragedy")
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time=timezone.now(),
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def create_ticket(self, row, seat, performance=None):
+        return Ticket.objects.create(
+            row=row,
+            seat=seat,
+            performance=performance or self.performance,
+            reservation=self.reservation,
+        )
+
+    def tickets_sold(self, performance=None):
+        performance = performance or self.performance
+        performance.refresh_from_db(fields=["tickets_sold"])
+        return performance.tickets_sold
+
+    def test_ticket_creation_and_deletion(self):
+        first = self.create_ticket(1, 1)
+        self.create_ticket(1, 2)
+        self.assertEqual(self.tickets_sold(), 2)
+
+        first.delete()
+        self.assertEqual(self.tickets_sold(), 1)
+
+    def test_bulk_booking(self):
+        book_tickets(
+            [
+                Ticket(
+                    row=2,
+                    seat=seat,
+                    performance=self.performance,
+                    reservation=self.reservation,
+                )
+                for seat in range(1, 5)
+            ]
+        )
+        self.assertEqual(self.tickets_sold(), 4)
+
+    def test_ticket_moved_to_other_performance(self):
+        other = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time=timezone.now(),
+        )
+        ticket = self.create_ticket(1, 1)
+        ticket.seat = 2
+        ticket.save()
+        self.assertEqual(self.tickets_sold(), 1)
+
+        ticket.performance = other
+        ticket.save()
+        self.assertEqual(self.tickets_sold(), 0)
+        self.assertEqual(self.tickets_sold(other), 1)
+
+    def test_reconcile_command(self):
+        self.create_ticket(1, 1)
+        Performance.objects.update(tickets_sold=7)
+
+        out = StringIO()
+        call_command("reconcile_tickets_sold", "--dry-run", stdout=out)
+        self.assertIn("counter 7, tickets 1", out.getvalue())
+        self.assertEqual(self.tickets_sold(), 7)
+
+        call_command("reconcile_tickets_sold", stdout=StringIO())
+        self.assertEqual(self.tickets_sold(), 1)
+
+    def test_reconcile_counts_seats_of_current_layout(self):
+        self.create_ticket(1, 1)
+        self.create_ticket(2, 2)
+        self.theatre_hall.rows = 1
+        self.theatre_hall.save()
+        self.assertEqual(self.tickets_sold(), 1)
+
+        out = StringIO()
+        for _ in range(2):
+            call_command("reconcile_tickets_sold", stdout=out)
+            self.assertEqual(self.tickets_sold(), 1)
+        self.assertNotIn("Performance", out.getvalue())
+
+    def test_listing_is_a_single_query_without_grouping(self):
+        for seat in range(1, 4):
+            self.create_ticket(1, seat)
+
+        with CaptureQueriesContext(connection) as context:
+            response = APIClient().get(reverse("theatre:performances-list"))
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn("GROUP BY", context.captured_queries[0]["sql"])
+        self.assertEqual(response.data["results"][0]["tickets_sold"], 3)
+        self.assertEqual(
+            response.data["results"][0]["tickets_available"], 147
+        )
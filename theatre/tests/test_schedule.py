@@ -0,0 +1,197 @@
+from datetime import date, datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.cache import get_response_cache
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket,
+)
+from theatre.seat_map import book_tickets
+
+
+User = get_user_model()
+
+
+def show_time(day, hour):
+    return timezone.make_aware(datetime(2024, 5, day, hour))
+
+
+# Keeps the cache in memory, so the query counts are the calendar's own
+@override_settings(
+    RESPONSE_CACHE={"BACKEND": "theatre.cache.LocalResponseCache"}
+)
+class PerformanceCalendarTest(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.url = reverse("theatre:performances-calendar")
+        self.main_hall = TheatreHall.objects.create(
+            name="Main Hall", rows=10, seats_in_row=15
+        )
+        self.small_hall = TheatreHall.objects.create(
+            name="Small Hall", rows=2, seats_in_row=5
+        )
+        self.play = Play.objects.create(title="Hamlet", description="Tragedy")
+        self.first = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.main_hall,
+            show_time=show_time(6, 19),
+        )
+        self.second = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.small_hall,
+            show_time=show_time(6, 21),
+        )
+        self.third = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.main_hall,
+            show_time=show_time(13, 19),
+        )
+        self.reservation = Reservation.objects.create(
+            user=User.objects.create_user(
+                username="testuser", password="testpassword"
+            )
+        )
+
+    def get_calendar(self, **params):
+        params = {"from": "2024-05-06", "to": "2024-05-13", **params}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_days_and_weeks(self):
+        Ticket.objects.create(
+            row=1, seat=1, performance=self.first, reservation=self.reservation
+        )
+
+        calendar = self.get_calendar()
+
+        self.assertEqual(len(calendar["days"]), 8)
+        monday = calendar["days"][0]
+        self.assertEqual(monday["date"], "2024-05-06")
+        self.assertEqual(monday["performances_count"], 2)
+        self.assertEqual(monday["tickets_available"], 149 + 10)
+        self.assertEqual(
+            monday["performances"][0],
+            {
+                "id": self.first.id,
+                "show_time": "2024-05-06T19:00:00Z",
+                "play": self.play.id,
+                "play_title": "Hamlet",
+                "theatre_hall": self.main_hall.id,
+                "theatre_hall_name": "Main Hall",
+                "tickets_available": 149,
+            },
+        )
+        self.assertEqual(calendar["days"][1]["performances"], [])
+        self.assertEqual(
+            calendar["weeks"],
+            [
+                {
+                    "week_start": "2024-05-06",
+                    "performances_count": 2,
+                    "tickets_available": 159,
+                },
+                {
+                    "week_start": "2024-05-13",
+                    "performances_count": 1,
+                    "tickets_available": 150,
+                },
+            ],
+        )
+
+    def test_hall_filter(self):
+        calendar = self.get_calendar(hall=self.small_hall.id)
+        performances = [
+            performance["id"]
+            for day in calendar["days"]
+            for performance in day["performances"]
+        ]
+        self.assertEqual(performances, [self.second.id])
+
+    def test_days_are_read_in_one_query_and_cached(self):
+        with self.assertNumQueries(1):
+            first = self.get_calendar()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_calendar(), first)
+        with self.assertNumQueries(1):
+            self.get_calendar(to="2024-05-20")
+
+    @override_settings(
+        RESPONSE_CACHE={"BACKEND": "theatre.cache.DjangoResponseCache"}
+    )
+    def test_shared_cache_reads_cached_days_at_once(self):
+        get_response_cache().clear()
+        first = self.get_calendar()
+        # One query for the generations and one for the days
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get_calendar(), first)
+
+    def test_booking_invalidates_only_its_day(self):
+        self.get_calendar()
+        book_tickets(
+            [
+                Ticket(
+                    row=1,
+                    seat=1,
+                    performance=self.third,
+                    reservation=self.reservation,
+                )
+            ]
+        )
+
+        with self.assertNumQueries(0):
+            self.get_calendar(to="2024-05-12")
+        calendar = self.get_calendar()
+        self.assertEqual(calendar["days"][-1]["tickets_available"], 149)
+
+    def test_moving_a_performance_invalidates_both_days(self):
+        self.get_calendar()
+        self.first.show_time = show_time(8, 19)
+        self.first.save()
+
+        calendar = self.get_calendar()
+        self.assertEqual(calendar["days"][0]["performances_count"], 1)
+        self.assertEqual(calendar["days"][2]["performances_count"], 1)
+
+    def test_renaming_a_play_invalidates_every_day(self):
+        self.get_calendar()
+        self.play.title = "Macbeth"
+        self.play.save()
+
+        calendar = self.get_calendar()
+        self.assertEqual(
+            calendar["days"][-1]["performances"][0]["play_title"], "Macbeth"
+        )
+
+    def test_defaults_to_the_coming_week(self):
+        calendar = self.client.get(self.url).json()
+        self.assertEqual(calendar["from"], timezone.localdate().isoformat())
+        self.assertEqual(len(calendar["days"]), 7)
+
+    def test_invalid_ranges(self):
+        for params in (
+            {"from": "2024-05-06", "to": "2024-05-05"},
+            {"from": "2024-05-06", "to": "2024-08-06"},
+            {"from": "yesterday"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_week_starts_on_monday(self):
+        calendar = self.get_calendar(**{"from": "2024-05-08"})
+        self.assertEqual(
+            [week["week_start"] for week in calendar["weeks"]],
+            [date(2024, 5, 6).isoformat(), date(2024, 5, 13).isoformat()],
+        )
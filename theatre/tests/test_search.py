@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.catalogue import import_records, read_records
+from theatre.models import Actor, Play
+from theatre.search import rebuild_index, search
+
+
+class SearchTest(APITestCase):
+    def setUp(self):
+        self.url = reverse("theatre:search")
+        self.hamlet = Play.objects.create(
+            title="Hamlet",
+            description="The prince of Denmark avenges his father.",
+        )
+        self.lear = Play.objects.create(
+            title="King Lear", description="An old king divides his kingdom."
+        )
+        self.tempest = Play.objects.create(
+            title="The Tempest",
+            description="A magician and a king's ship wrecked by a storm.",
+        )
+        self.actor = Actor.objects.create(first_name="Judi", last_name="Dench")
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_title_matches_rank_first(self):
+        results = self.search(q="king")["results"]
+        self.assertEqual(
+            [(hit["type"], hit["id"]) for hit in results],
+            [("play", self.lear.id), ("play", self.tempest.id)],
+        )
+        self.assertEqual(results[0]["title"], "King Lear")
+
+    def test_words_are_stemmed_and_combined(self):
+        results = self.search(q="Denmark princes")["results"]
+        self.assertEqual([hit["id"] for hit in results], [self.hamlet.id])
+        self.assertEqual(self.search(q="Denmark storm")["results"], [])
+
+    def test_actors_and_type_filter(self):
+        self.assertEqual(
+            self.search(q="dench")["results"],
+            [{"type": "actor", "id": self.actor.id, "title": "Judi Dench"}],
+        )
+        self.assertEqual(self.search(q="dench", type="play")["results"], [])
+
+    def test_pagination(self):
+        first = self.search(q="king", page_size=1)
+        self.assertEqual(first["results"][0]["id"], self.lear.id)
+        self.assertIsNone(first["previous"])
+
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(second["results"][0]["id"], self.tempest.id)
+        self.assertIsNone(second["next"])
+        self.assertIsNotNone(second["previous"])
+
+    def test_index_follows_changes(self):
+        self.hamlet.title = "Macbeth"
+        self.hamlet.save()
+        self.assertEqual(self.search(q="hamlet")["results"], [])
+        self.assertEqual(len(self.search(q="macbeth")["results"]), 1)
+
+        self.actor.delete()
+        self.assertEqual(self.search(q="dench")["results"], [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        response = self.client.get(self.url, {"q": 'king" OR ("lear'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.search(q="!!!")["results"], [])
+
+    def test_query_is_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", response.data)
+
+    def test_catalogue_import_and_rebuild(self):
+        import_records(
+            read_records(
+                StringIO(
+                    '{"model": "actor", "first_name": "Ian", '
+                    '"last_name": "McKellen"}\n'
+                ),
+                "jsonl",
+            )
+        )
+        self.assertEqual(len(search("mckellen")), 1)
+
+        self.assertEqual(rebuild_index(batch_size=2), 5)
+        self.assertEqual(len(search("king")), 2)
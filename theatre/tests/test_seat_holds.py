@@ -0,0 +1,231 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket,
+    SeatHold,
+)
+from theatre.seat_map import get_seat_map
+
+
+User = get_user_model()
+
+
+class SeatHoldTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.other = User.objects.create_user(
+            username="other", password="testpassword"
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=5, seats_in_row=5
+            ),
+            show_time=timezone.now(),
+        )
+        self.url = reverse(
+            "theatre:performances-holds", kwargs={"pk": self.performance.pk}
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def hold(self, seats):
+        return self.client.post(
+            self.url,
+            {"seats": [{"row": row, "seat": seat} for row, seat in seats]},
+            format="json",
+        )
+
+    def test_hold_seats(self):
+        response = self.hold([(1, 1), (1, 2)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["seats"],
+            [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}],
+        )
+        hold = SeatHold.objects.get()
+        self.assertEqual(hold.user, self.user)
+        self.assertGreater(hold.expires_at, timezone.now())
+
+    def test_held_seat_cannot_be_held_or_booked_again(self):
+        self.hold([(1, 1)])
+
+        self.client.force_authenticate(self.other)
+        response = self.hold([(1, 1)])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            reverse("theatre:reservations-list"),
+            {
+                "user": self.other.id,
+                "tickets": [
+                    {"row": 1, "seat": 1, "performance": self.performance.id}
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_taken_seat_cannot_be_held(self):
+        Ticket.objects.create(
+            row=2,
+            seat=3,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.other),
+        )
+        response = self.hold([(2, 3)])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_seat_outside_hall_is_rejected(self):
+        response = self.hold([(6, 1)])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_hold_releases_seats(self):
+        self.hold([(1, 1)])
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(1))
+
+        self.client.force_authenticate(self.other)
+        response = self.hold([(1, 1)])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.other)
+
+    def test_confirm_creates_reservation(self):
+        hold_id = self.hold([(3, 4), (3, 5)]).data["id"]
+
+        response = self.client.post(
+            reverse("theatre:holds-confirm", kwargs={"pk": hold_id})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tickets"]), 2)
+        reservation = Reservation.objects.get()
+        self.assertEqual(reservation.user, self.user)
+        self.assertFalse(SeatHold.objects.exists())
+        self.performance.refresh_from_db()
+        seat_map = get_seat_map(self.performance)
+        self.assertEqual(list(seat_map.taken_seats()), [(3, 4), (3, 5)])
+
+    def test_confirm_expired_hold_fails(self):
+        hold_id = self.hold([(1, 1)]).data["id"]
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(1))
+
+        response = self.client.post(
+            reverse("theatre:holds-confirm", kwargs={"pk": hold_id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_expired_holds_are_not_listed(self):
+        active_id = self.hold([(1, 1)]).data["id"]
+        expired_id = self.hold([(1, 2)]).data["id"]
+        SeatHold.objects.filter(pk=expired_id).update(
+            expires_at=timezone.now() - timedelta(1)
+        )
+
+        response = self.client.get(reverse("theatre:holds-list"))
+        self.assertEqual(
+            [hold["id"] for hold in response.data["results"]], [active_id]
+        )
+        response = self.client.get(
+            reverse("theatre:holds-detail", kwargs={"pk": expired_id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_confirm_fails_when_seat_was_taken(self):
+        hold_id = self.hold([(1, 1)]).data["id"]
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.other),
+        )
+
+        response = self.client.post(
+            reverse("theatre:holds-confirm", kwargs={"pk": hold_id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_ticket_cannot_be_moved_onto_held_or_taken_seat(self):
+        self.hold([(1, 1)])
+        Ticket.objects.create(
+            row=1,
+            seat=2,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+        ticket = Ticket.objects.create(
+            row=2,
+            seat=1,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.other),
+        )
+        self.client.force_authenticate(self.other)
+        url = reverse("theatre:tickets-detail", kwargs={"pk": ticket.pk})
+
+        for seat in (1, 2):
+            response = self.client.patch(url, {"row": 1, "seat": seat})
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+        ticket.refresh_from_db()
+        self.assertEqual((ticket.row, ticket.seat), (2, 1))
+
+        response = self.client.patch(url, {"row": 1, "seat": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            list(get_seat_map(self.performance).taken_seats()),
+            [(1, 2), (1, 3)],
+        )
+
+    def test_holds_of_other_users_are_hidden(self):
+        hold_id = self.hold([(1, 1)]).data["id"]
+
+        self.client.force_authenticate(self.other)
+        url = reverse("theatre:holds-detail", kwargs={"pk": hold_id})
+        self.assertEqual(
+            self.client.get(url).status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(
+            self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_release_hold(self):
+        hold_id = self.hold([(1, 1)]).data["id"]
+        response = self.client.delete(
+            reverse("theatre:holds-detail", kwargs={"pk": hold_id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_sweeper_deletes_expired_holds(self):
+        self.hold([(1, 1)])
+        self.hold([(1, 2)])
+        SeatHold.objects.filter(seats__seat=1).update(
+            expires_at=timezone.now() - timedelta(1)
+        )
+
+        out = StringIO()
+        call_command("sweep_seat_holds", stdout=out)
+
+        self.assertIn("Deleted 1 expired seat holds.", out.getvalue())
+        self.assertEqual(SeatHold.objects.get().seats.get().seat, 2)
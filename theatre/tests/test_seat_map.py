@@ -0,0 +1,225 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket,
+)
+from theatre.seat_map import SeatMap, get_seat_map, release_seats
+
+
+User = get_user_model()
+
+
+class SeatMapTest(TestCase):
+    def test_take_and_release_seat(self):
+        seat_map = SeatMap(rows=3, seats_in_row=5)
+        seat_map.take(2, 4)
+        self.assertTrue(seat_map.is_taken(2, 4))
+        self.assertEqual(seat_map.tickets_available, 14)
+        self.assertEqual(list(seat_map.taken_seats()), [(2, 4)])
+
+        seat_map.release(2, 4)
+        self.assertFalse(seat_map.is_taken(2, 4))
+        self.assertEqual(seat_map.tickets_available, 15)
+
+    def test_bitmap_is_compact(self):
+        seat_map = SeatMap(rows=10, seats_in_row=20)
+        self.assertEqual(len(seat_map.bitmap), 25)
+
+    def test_seat_outside_hall(self):
+        seat_map = SeatMap(rows=3, seats_in_row=5)
+        with self.assertRaises(ValueError):
+            seat_map.take(4, 1)
+
+
+class SeatMapSignalsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=10, seats_in_row=15
+            ),
+            show_time=timezone.now(),
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def get_seat_map(self):
+        self.performance.refresh_from_db()
+        return get_seat_map(self.performance)
+
+    def test_ticket_creation_takes_seat(self):
+        Ticket.objects.create(
+            row=3,
+            seat=7,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+        self.assertTrue(self.get_seat_map().is_taken(3, 7))
+
+    def test_ticket_update_moves_seat(self):
+        ticket = Ticket.objects.create(
+            row=3,
+            seat=7,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+        ticket.seat = 8
+        ticket.save()
+        seat_map = self.get_seat_map()
+        self.assertFalse(seat_map.is_taken(3, 7))
+        self.assertTrue(seat_map.is_taken(3, 8))
+
+    def test_ticket_deletion_releases_seat(self):
+        ticket = Ticket.objects.create(
+            row=3,
+            seat=7,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+        ticket.delete()
+        self.assertFalse(self.get_seat_map().is_taken(3, 7))
+
+    def test_cascade_releases_seats_once_per_performance(self):
+        other = Performance.objects.create(
+            play=self.performance.play,
+            theatre_hall=self.performance.theatre_hall,
+            show_time=timezone.now(),
+        )
+        for performance, row, seat in (
+            (self.performance, 1, 1),
+            (self.performance, 1, 2),
+            (other, 2, 1),
+        ):
+            Ticket.objects.create(
+                row=row,
+                seat=seat,
+                performance=performance,
+                reservation=self.reservation,
+            )
+
+        with mock.patch(
+            "theatre.signals.release_seats", wraps=release_seats
+        ) as release:
+            self.reservation.delete()
+
+        self.assertEqual(
+            release.call_args_list,
+            [
+                mock.call(self.performance.id, [(1, 1), (1, 2)]),
+                mock.call(other.id, [(2, 1)]),
+            ],
+        )
+        self.assertEqual(list(self.get_seat_map().taken_seats()), [])
+        self.assertEqual(self.performance.tickets_sold, 0)
+
+    def test_deleting_a_hall_skips_its_seat_maps(self):
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+        with mock.patch("theatre.signals.release_seats") as release:
+            self.performance.theatre_hall.delete()
+        release.assert_not_called()
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_seat_map_is_read_without_tickets_query(self):
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+        performance = Performance.objects.select_related("theatre_hall").get(
+            pk=self.performance.pk
+        )
+        with self.assertNumQueries(0):
+            seat_map = get_seat_map(performance)
+        self.assertEqual(seat_map.tickets_available, 149)
+
+    def test_hall_resize_rebuilds_seat_map(self):
+        Ticket.objects.create(
+            row=2,
+            seat=1,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+        hall = self.performance.theatre_hall
+        # 15x10 has as many positions as 10x15, so the old bitmap has the
+        # same size but puts the ticket at 2-6
+        hall.rows, hall.seats_in_row = 15, 10
+        hall.save()
+        seat_map = self.get_seat_map()
+        self.assertTrue(seat_map.is_taken(2, 1))
+        self.assertFalse(seat_map.is_taken(2, 6))
+        self.assertEqual(self.performance.tickets_sold, 1)
+
+    def test_bitmap_of_other_layout_is_not_reused(self):
+        Ticket.objects.create(
+            row=2,
+            seat=1,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+        self.get_seat_map()
+        TheatreHall.objects.filter(pk=self.performance.theatre_hall_id).update(
+            rows=15, seats_in_row=10
+        )
+        seat_map = self.get_seat_map()
+        self.assertTrue(seat_map.is_taken(2, 1))
+        self.assertFalse(seat_map.is_taken(2, 6))
+
+
+class PerformanceSeatMapViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=2, seats_in_row=3
+            ),
+            show_time=timezone.now(),
+        )
+        Ticket.objects.create(
+            row=2,
+            seat=1,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+
+    def test_retrieve_seat_map(self):
+        response = self.client.get(
+            reverse(
+                "theatre:performances-seat-map",
+                kwargs={"pk": self.performance.pk},
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "performance": self.performance.id,
+                "rows": 2,
+                "seats_in_row": 3,
+                "capacity": 6,
+                "tickets_available": 5,
+                "taken_seats": [{"row": 2, "seat": 1}],
+            },
+        )
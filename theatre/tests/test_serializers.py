@@ -72,6 +72,8 @@ class TestSerializer(BaseSerializerTestCase):
             "name": "Main Hall",
             "rows": 10,
             "seats_in_row": 20,
+            "capacity": 200,
+            "layout": None,
         }
         self.assert_serialized_equal(
             TheatreHallSerializer, self.theatre_hall, expected_data
@@ -82,6 +84,8 @@ class TestSerializer(BaseSerializerTestCase):
             "id": self.play.id,
             "title": "Hamlet",
             "description": "A Shakespearean play",
+            "actors": [],
+            "genres": [],
         }
         self.assert_serialized_equal(PlaySerializer, self.play, expected_data)
 
@@ -91,6 +95,8 @@ class TestSerializer(BaseSerializerTestCase):
             "play": self.play.id,
             "theatre_hall": self.theatre_hall.id,
             "show_time": "2024-08-12T00:00:00Z",
+            "tickets_sold": 0,
+            "tickets_available": self.theatre_hall.capacity,
         }
         self.assert_serialized_equal(
             PerformanceSerializer, self.performance, expected_data
@@ -123,6 +129,14 @@ class TestSerializer(BaseSerializerTestCase):
             )
             + "Z",
             "user": self.user.id,
+            "tickets": [
+                {
+                    "id": self.ticket.id,
+                    "row": 5,
+                    "seat": 10,
+                    "performance": self.performance.id,
+                }
+            ],
         }
         self.assert_serialized_equal(
             ReservationSerializer, self.reservation, expected_data
@@ -0,0 +1,158 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import Performance, Play, Reservation, TheatreHall
+from theatre_service.throttling import (
+    LocalBucketStore,
+    TokenBucketThrottle,
+    get_bucket_store,
+)
+
+
+User = get_user_model()
+
+
+def throttle_rates(**rates):
+    return override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                "anon": "100/min",
+                "user": "100/min",
+                "booking": "100/min",
+                **rates,
+            },
+        }
+    )
+
+
+class LocalBucketStoreTest(SimpleTestCase):
+    def test_burst_then_refill(self):
+        store = LocalBucketStore()
+        for _ in range(3):
+            self.assertEqual(store.take("client", 3, 0.5, 100.0), 0)
+        self.assertEqual(store.take("client", 3, 0.5, 100.0), 2.0)
+        self.assertEqual(store.take("client", 3, 0.5, 101.0), 1.0)
+        self.assertEqual(store.take("client", 3, 0.5, 102.0), 0)
+        self.assertEqual(store.take("other", 3, 0.5, 102.0), 0)
+
+    def test_buckets_are_bounded(self):
+        store = LocalBucketStore(maxsize=2)
+        for client in ("a", "b", "c"):
+            store.take(client, 1, 1.0, 0.0)
+        self.assertEqual(len(store._buckets), 2)
+
+
+class ThrottlingAPITest(APITestCase):
+    def setUp(self):
+        get_bucket_store().clear()
+        self.addCleanup(get_bucket_store().clear)
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.plays_url = reverse("theatre:plays-list")
+
+    def authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+
+    @throttle_rates(anon="2/min")
+    def test_anonymous_clients_get_retry_after(self):
+        for _ in range(2):
+            response = self.client.get(self.plays_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.plays_url)
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(response["Retry-After"], "30")
+
+        self.authenticate(self.user)
+        response = self.client.get(self.plays_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @throttle_rates(user="2/min")
+    def test_tokens_refill_over_time(self):
+        self.authenticate(self.user)
+        now = timezone.now().timestamp()
+        with mock.patch.object(TokenBucketThrottle, "timer") as timer:
+            timer.return_value = now
+            self.client.get(self.plays_url)
+            self.client.get(self.plays_url)
+            response = self.client.get(self.plays_url)
+            self.assertEqual(
+                response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+            )
+
+            timer.return_value = now + 30
+            response = self.client.get(self.plays_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        other = User.objects.create_user(
+            username="other", password="testpassword"
+        )
+        self.authenticate(other)
+        response = self.client.get(self.plays_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @throttle_rates(booking="1/hour")
+    def test_booking_scope_limits_writes_only(self):
+        self.authenticate(self.user)
+        performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=5, seats_in_row=5
+            ),
+            show_time=timezone.now(),
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        url = reverse("theatre:tickets-list")
+        for seat, expected in (
+            (1, status.HTTP_201_CREATED),
+            (2, status.HTTP_429_TOO_MANY_REQUESTS),
+        ):
+            response = self.client.post(
+                url,
+                {
+                    "row": 1,
+                    "seat": seat,
+                    "performance": performance.id,
+                    "reservation": reservation.id,
+                },
+            )
+            self.assertEqual(response.status_code, expected)
+        self.assertEqual(response["Retry-After"], "3600")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    @throttle_rates(anon="1/min")
+    def test_view_rates_use_their_own_buckets(self):
+        self.client.get(self.plays_url)
+        response = self.client.get(reverse("theatre:autocomplete"), {"q": "h"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @throttle_rates(anon="1/min")
+    @override_settings(
+        THROTTLE_BUCKETS={
+            "BACKEND": "theatre_service.throttling.DjangoBucketStore",
+            "OPTIONS": {"alias": "default"},
+        }
+    )
+    def test_django_cache_backend(self):
+        get_bucket_store().clear()
+        self.client.get(self.plays_url)
+        response = self.client.get(self.plays_url)
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(response["Retry-After"], "60")
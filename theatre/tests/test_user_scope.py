@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket,
+)
+
+
+User = get_user_model()
+
+
+class UserScopedReservationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.other = User.objects.create_user(
+            username="other", password="testpassword"
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main Hall", rows=10, seats_in_row=10
+            ),
+            show_time=timezone.now(),
+        )
+        self.own = self.create_reservation(self.user, row=1)
+        self.foreign = self.create_reservation(self.other, row=2)
+        self.client.force_authenticate(self.user)
+
+    def create_reservation(self, user, row, seats=2):
+        reservation = Reservation.objects.create(user=user)
+        for seat in range(1, seats + 1):
+            Ticket.objects.create(
+                row=row,
+                seat=seat,
+                performance=self.performance,
+                reservation=reservation,
+            )
+        return reservation
+
+    def get_ids(self, url_name):
+        response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item["id"] for item in response.data["results"]}
+
+    def test_anonymous_users_cannot_read(self):
+        self.client.force_authenticate(None)
+        for url_name in ("theatre:reservations-list", "theatre:tickets-list"):
+            response = self.client.get(reverse(url_name))
+            self.assertEqual(
+                response.status_code, status.HTTP_401_UNAUTHORIZED
+            )
+
+    def test_users_see_only_their_rows(self):
+        self.assertEqual(
+            self.get_ids("theatre:reservations-list"), {self.own.id}
+        )
+        self.assertEqual(
+            self.get_ids("theatre:tickets-list"),
+            set(self.own.tickets.values_list("id", flat=True)),
+        )
+        response = self.client.get(
+            reverse(
+                "theatre:reservations-detail", kwargs={"pk": self.foreign.pk}
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_staff_see_every_row(self):
+        self.client.force_authenticate(
+            User.objects.create_user(
+                username="staff", password="testpassword", is_staff=True
+            )
+        )
+        self.assertEqual(
+            self.get_ids("theatre:reservations-list"),
+            {self.own.id, self.foreign.id},
+        )
+        self.assertEqual(len(self.get_ids("theatre:tickets-list")), 4)
+
+    def test_users_cannot_book_for_others(self):
+        response = self.client.post(
+            reverse("theatre:reservations-list"),
+            {"user": self.other.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.post(
+            reverse("theatre:tickets-list"),
+            {
+                "row": 5,
+                "seat": 5,
+                "performance": self.performance.id,
+                "reservation": self.foreign.id,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Ticket.objects.filter(row=5).exists())
+
+    def test_my_reservations(self):
+        url = reverse("theatre:reservations-mine")
+        self.client.get(url)
+        for row in range(3, 8):
+            self.create_reservation(self.user, row=row, seats=3)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[0]["tickets"][0]["play_title"], "Hamlet")
+        self.assertEqual(
+            results[0]["tickets"][0]["theatre_hall_name"], "Main Hall"
+        )
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket,
+)
+from theatre.views import (
+    PerformanceViewSet,
+    ReservationViewSet,
+    TicketViewSet,
+)
+
+
+User = get_user_model()
+
+
+class ValuesSerializerOutputTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        halls = [
+            TheatreHall.objects.create(
+                name=f"Hall {number}", rows=5 + number, seats_in_row=8
+            )
+            for number in range(2)
+        ]
+        plays = [
+            Play.objects.create(title=title, description="Tragedy")
+            for title in ("Hamlet", "Macbeth é")
+        ]
+        now = timezone.now()
+        performances = [
+            Performance.objects.create(
+                play=plays[number % 2],
+                theatre_hall=halls[number % 2],
+                show_time=now + timezone.timedelta(hours=number % 3),
+            )
+            for number in range(7)
+        ]
+        Reservation.objects.create(user=self.user)
+        for number, performance in enumerate(performances):
+            reservation = Reservation.objects.create(user=self.user)
+            for seat in range(1, number % 3 + 2):
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    performance=performance,
+                    reservation=reservation,
+                )
+
+    def get_pages(self, url_name):
+        url = reverse(url_name) + "?page_size=3"
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.content)
+            url = response.json()["next"]
+        return pages
+
+    def assert_identical_output(self, viewset, url_name):
+        values_pages = self.get_pages(url_name)
+        with mock.patch.object(viewset, "values_serializer_class", None):
+            model_pages = self.get_pages(url_name)
+        self.assertGreater(len(values_pages), 1)
+        self.assertEqual(values_pages, model_pages)
+
+    def test_performance_list(self):
+        self.assert_identical_output(
+            PerformanceViewSet, "theatre:performances-list"
+        )
+
+    def test_ticket_list(self):
+        self.assert_identical_output(TicketViewSet, "theatre:tickets-list")
+
+    def test_reservation_list(self):
+        self.assert_identical_output(
+            ReservationViewSet, "theatre:reservations-list"
+        )
+
+    def test_filters_apply(self):
+        response = self.client.get(
+            reverse("theatre:performances-list"), {"title": "macbeth"}
+        )
+        self.assertEqual(len(response.json()["results"]), 3)
@@ -1,6 +1,8 @@
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient, APITestCase
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
@@ -15,6 +17,7 @@ from theatre.models import (
     Reservation,
     Ticket,
 )
+from theatre.pagination import StandardCursorPagination
 
 
 User = get_user_model()
@@ -316,6 +319,60 @@ class PrivateReservationTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_create_reservation_with_tickets(self):
+        data = {
+            "user": self.user.id,
+            "tickets": [
+                {"row": 1, "seat": seat, "performance": self.performance.id}
+                for seat in range(1, 7)
+            ],
+        }
+        response = self.client.post(
+            self.reservations_list_url, data=data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tickets"]), 6)
+        self.assertEqual(
+            Ticket.objects.filter(
+                reservation_id=response.data["id"]
+            ).count(),
+            6,
+        )
+
+    def test_create_reservation_rejects_taken_seat(self):
+        Ticket.objects.create(
+            row=1,
+            seat=2,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+        data = {
+            "user": self.user.id,
+            "tickets": [
+                {"row": 1, "seat": 1, "performance": self.performance.id},
+                {"row": 1, "seat": 2, "performance": self.performance.id},
+            ],
+        }
+        response = self.client.post(
+            self.reservations_list_url, data=data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_create_reservation_rejects_seat_outside_hall(self):
+        data = {
+            "user": self.user.id,
+            "tickets": [
+                {"row": 11, "seat": 1, "performance": self.performance.id},
+            ],
+        }
+        response = self.client.post(
+            self.reservations_list_url, data=data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Reservation.objects.count(), 1)
+
     def test_update_reservation_detail(self):
         data = {"user": self.user.id}
         response = self.client.put(
@@ -383,6 +440,18 @@ class PrivateTicketTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_create_ticket_for_taken_seat(self):
+        data = {
+            "row": 1,
+            "seat": 1,
+            "performance": self.performance.id,
+            "reservation": self.reservation.id,
+        }
+        response = self.client.post(
+            self.tickets_list_url, data=data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_update_ticket_detail(self):
         data = {
             "row": 3,
@@ -398,3 +467,92 @@ class PrivateTicketTest(APITestCase):
     def test_delete_ticket_detail(self):
         response = self.client.delete(self.tickets_detail_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class CursorPaginationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        play = Play.objects.create(title="Hamlet", description="Tragedy")
+        theatre_hall = TheatreHall.objects.create(
+            name="Main Hall", rows=10, seats_in_row=10
+        )
+        show_time = timezone.now()
+        self.performances = [
+            Performance.objects.create(
+                play=play,
+                theatre_hall=theatre_hall,
+                show_time=show_time + timezone.timedelta(hours=hours % 3),
+            )
+            for hours in range(7)
+        ]
+
+    def test_pages_follow_show_time_and_id(self):
+        url = reverse("theatre:performances-list") + "?page_size=3"
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 3)
+            ids.extend(
+                performance["id"] for performance in response.data["results"]
+            )
+            url = response.data["next"]
+
+        expected = sorted(
+            self.performances,
+            key=lambda performance: (performance.show_time, performance.id),
+        )
+        self.assertEqual(ids, [performance.id for performance in expected])
+
+    def test_cursor_is_a_show_time_and_id_tuple(self):
+        url = reverse("theatre:performances-list") + "?page_size=3"
+        first = self.client.get(url).data
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(first["next"]).data
+        page_query = queries[-1]["sql"]
+        self.assertIn("ORDER BY", page_query)
+        self.assertNotIn("OFFSET", page_query)
+
+        previous = self.client.get(second["previous"]).data
+        self.assertEqual(previous["results"], first["results"])
+        self.assertIsNone(previous["previous"])
+
+    def test_descending_cursor_with_equal_timestamps(self):
+        reservations = [
+            Reservation.objects.create(user=self.user) for _ in range(5)
+        ]
+        Reservation.objects.update(created_at=timezone.now())
+        url = reverse("theatre:reservations-list") + "?page_size=2"
+        ids = []
+        while url:
+            response = self.client.get(url)
+            ids.extend(
+                reservation["id"] for reservation in response.data["results"]
+            )
+            url = response.data["next"]
+        self.assertEqual(
+            ids, sorted((r.id for r in reservations), reverse=True)
+        )
+
+    def test_page_size_is_capped(self):
+        performance = self.performances[0]
+        Performance.objects.bulk_create(
+            Performance(
+                play_id=performance.play_id,
+                theatre_hall_id=performance.theatre_hall_id,
+                show_time=performance.show_time,
+            )
+            for _ in range(StandardCursorPagination.max_page_size)
+        )
+        response = self.client.get(
+            reverse("theatre:performances-list") + "?page_size=1000"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(response.data["results"]),
+            StandardCursorPagination.max_page_size,
+        )
+        self.assertIsNotNone(response.data["next"])
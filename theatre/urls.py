@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from theatre import async_views
 from theatre.views import (
     TheatreHallViewSet,
     PlayViewSet,
@@ -9,6 +10,9 @@ from theatre.views import (
     GenreViewSet,
     ReservationViewSet,
     TicketViewSet,
+    SeatHoldViewSet,
+    SearchView,
+    AutocompleteView,
 )
 
 
@@ -22,7 +26,29 @@ router.register("actors", ActorViewSet, basename="actors")
 router.register("genres", GenreViewSet, basename="genres")
 router.register("reservations", ReservationViewSet, basename="reservations")
 router.register("tickets", TicketViewSet, basename="tickets")
+router.register("holds", SeatHoldViewSet, basename="holds")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path("search/", SearchView.as_view(), name="search"),
+    path(
+        "autocomplete/", AutocompleteView.as_view(), name="autocomplete"
+    ),
+    path(
+        "async/performances/",
+        async_views.performance_list,
+        name="async_performance_list",
+    ),
+    path(
+        "async/performances/<int:pk>/seat-map/",
+        async_views.performance_seat_map,
+        name="async_performance_seat_map",
+    ),
+    path(
+        "async/reservations/<int:pk>/",
+        async_views.reservation_detail,
+        name="async_reservation_detail",
+    ),
+]
 
 app_name = "theatre"
@@ -0,0 +1,158 @@
+"""
+Read-only serializers that build list responses straight from .values()
+rows. Each field is a precomputed accessor over the row, so no model
+instances or per-field serializer objects are created. The output is the
+same as the ModelSerializer a viewset uses for its list action.
+"""
+
+from collections import defaultdict
+from datetime import timezone
+from operator import itemgetter
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from theatre.models import Ticket
+
+
+def datetime_field(lookup, **kwargs):
+    to_representation = serializers.DateTimeField(**kwargs).to_representation
+    get = itemgetter(lookup)
+    return lambda row: to_representation(get(row))
+
+
+class ValuesSerializer:
+    """
+    Subclasses list their output fields as (name, lookup) pairs, or
+    (name, lookups, accessor) when the value is computed from the row.
+    """
+
+    fields = ()
+
+    def __init__(self):
+        self.lookups = []
+        self.accessors = []
+        for field in self.fields:
+            if len(field) == 2:
+                name, lookup = field
+                lookups, accessor = (lookup,), itemgetter(lookup)
+            else:
+                name, lookups, accessor = field
+            self.lookups.extend(
+                lookup for lookup in lookups if lookup not in self.lookups
+            )
+            self.accessors.append((name, accessor))
+
+    def get_queryset(self, queryset, extra_lookups=()):
+        lookups = self.lookups + [
+            lookup for lookup in extra_lookups if lookup not in self.lookups
+        ]
+        return queryset.prefetch_related(None).values(*lookups)
+
+    def to_representation(self, rows):
+        accessors = self.accessors
+        return [
+            {name: accessor(row) for name, accessor in accessors}
+            for row in rows
+        ]
+
+
+class PerformanceListValuesSerializer(ValuesSerializer):
+    fields = (
+        ("id", "id"),
+        ("show_time", ("show_time",), datetime_field("show_time")),
+        ("play", "play_id"),
+        ("play_title", "play__title"),
+        ("theatre_hall", "theatre_hall_id"),
+        ("theatre_hall_name", "theatre_hall__name"),
+        ("theatre_hall_capacity", "theatre_hall__capacity"),
+        ("tickets_sold", "tickets_sold"),
+        (
+            "tickets_available",
+            ("theatre_hall__capacity", "tickets_sold"),
+            lambda row: row["theatre_hall__capacity"] - row["tickets_sold"],
+        ),
+    )
+
+
+class TicketListValuesSerializer(ValuesSerializer):
+    fields = (
+        ("id", "id"),
+        ("row", "row"),
+        ("seat", "seat"),
+        ("performance", "performance_id"),
+        ("reservation", "reservation_id"),
+        ("play_title", "performance__play__title"),
+        ("theatre_hall_name", "performance__theatre_hall__name"),
+        (
+            "show_time",
+            ("performance__show_time",),
+            datetime_field("performance__show_time"),
+        ),
+    )
+
+
+class ReservationListValuesSerializer(ValuesSerializer):
+    fields = (
+        ("id", "id"),
+        (
+            "created_at",
+            ("created_at",),
+            datetime_field(
+                "created_at",
+                format="%Y-%m-%dT%H:%M:%SZ",
+                default_timezone=timezone.utc,
+            ),
+        ),
+        ("user", "user_id"),
+        ("tickets_count", "tickets_count"),
+    )
+    ticket_fields = ("id", "row", "seat", "performance")
+
+    def to_representation(self, rows):
+        reservations = super().to_representation(rows)
+        tickets = defaultdict(list)
+        ticket_rows = Ticket.objects.filter(
+            reservation_id__in=[reservation["id"] for reservation in rows]
+        ).values_list(
+            "reservation_id", "id", "row", "seat", "performance_id"
+        )
+        for reservation_id, *values in ticket_rows:
+            tickets[reservation_id].append(
+                dict(zip(self.ticket_fields, values))
+            )
+        for reservation in reservations:
+            reservation["tickets"] = tickets[reservation["id"]]
+        return reservations
+
+
+class ValuesListMixin:
+    """
+    Serve the list action from .values() rows with values_serializer_class
+    when the viewset sets one. The rows also carry the pagination ordering
+    fields, which cursor pagination reads from the last row of a page.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None or self.action != "list":
+            return super().list(request, *args, **kwargs)
+
+        values_serializer = self.values_serializer_class()
+        queryset = self.get_values_queryset(values_serializer)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(values_serializer.to_representation(queryset))
+        return self.get_paginated_response(
+            values_serializer.to_representation(page)
+        )
+
+    def get_values_queryset(self, values_serializer):
+        ordering = getattr(self.paginator, "ordering", ())
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return values_serializer.get_queryset(
+            self.filter_queryset(self.get_queryset()),
+            [field.lstrip("-") for field in ordering],
+        )
@@ -1,4 +1,12 @@
-from rest_framework import viewsets, permissions
+from django.db.models import Count, Prefetch
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 
 from theatre.models import (
     TheatreHall,
@@ -7,17 +15,59 @@ from theatre.models import (
     Actor,
     Genre,
     Reservation,
-    Ticket
+    Ticket,
+    SeatHold,
 )
 from theatre.serializers import (
     TheatreHallSerializer,
     PlaySerializer,
+    PlayListSerializer,
+    PlayDetailSerializer,
     PerformanceSerializer,
+    PerformanceListSerializer,
+    PerformanceDetailSerializer,
+    PerformanceCalendarQuerySerializer,
+    SearchQuerySerializer,
+    AutocompleteQuerySerializer,
+    SeatMapSerializer,
     ActorSerializer,
     GenreSerializer,
     ReservationSerializer,
-    TicketSerializer
+    ReservationListSerializer,
+    UserReservationSerializer,
+    TicketSerializer,
+    TicketListSerializer,
+    SeatHoldSerializer,
 )
+from theatre.autocomplete import get_index
+from theatre.cache import CachedResponseMixin
+from theatre.exports import StreamingExportMixin
+from theatre.values_serializers import (
+    ValuesListMixin,
+    PerformanceListValuesSerializer,
+    ReservationListValuesSerializer,
+    TicketListValuesSerializer,
+)
+from theatre.filters import (
+    PerformanceFilter,
+    PlayFilter,
+    ReservationFilter,
+    TicketFilter,
+)
+from theatre.pagination import (
+    CreatedAtCursorPagination,
+    PerformanceCursorPagination,
+)
+from theatre.schedule import get_calendar
+from theatre.search import search
+from theatre.seat_map import (
+    HoldExpired,
+    SeatTaken,
+    confirm_hold,
+    get_seat_map,
+)
+from theatre_service.idempotency import IdempotentCreateMixin
+from theatre_service.throttling import BookingThrottleMixin
 
 
 class StaffRequiredPermission(permissions.BasePermission):
@@ -27,49 +77,329 @@ class StaffRequiredPermission(permissions.BasePermission):
         return request.user and request.user.is_staff
 
 
-class IsAuthenticatedOrReadOnly(permissions.BasePermission):
-    def has_permission(self, request, view):
-        if request.method in permissions.SAFE_METHODS:
-            return True
-        return request.user and request.user.is_authenticated
-
-
 class BaseViewSet(viewsets.ModelViewSet):
     permission_classes = [StaffRequiredPermission]
 
 
-class TheatreHallViewSet(BaseViewSet):
+class UserScopedViewSet(BaseViewSet):
+    """Staff see every row, other users only the rows they own."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    user_lookup = "user_id"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(**{self.user_lookup: self.request.user.id})
+
+    def check_owner(self, user_id):
+        if not self.request.user.is_staff and user_id != self.request.user.id:
+            raise PermissionDenied("You can only book for yourself.")
+
+
+class TheatreHallViewSet(CachedResponseMixin, BaseViewSet):
     queryset = TheatreHall.objects.all()
     serializer_class = TheatreHallSerializer
 
 
-class PlayViewSet(BaseViewSet):
+class PlayViewSet(CachedResponseMixin, BaseViewSet):
     queryset = Play.objects.all()
     serializer_class = PlaySerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PlayFilter
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            return queryset.with_credits()
+        return queryset
 
-class PerformanceViewSet(BaseViewSet):
+    def get_serializer_class(self):
+        if self.action == "list":
+            return PlayListSerializer
+        if self.action == "retrieve":
+            return PlayDetailSerializer
+        return PlaySerializer
+
+
+class PerformanceViewSet(BookingThrottleMixin, ValuesListMixin, BaseViewSet):
     queryset = Performance.objects.all()
     serializer_class = PerformanceSerializer
+    values_serializer_class = PerformanceListValuesSerializer
+    pagination_class = PerformanceCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PerformanceFilter
+    booking_actions = ("holds",)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            return queryset.for_listing()
+        if self.action == "retrieve":
+            return queryset.for_listing().with_credits()
+        if self.action in ("seat_map", "holds"):
+            return queryset.select_related("theatre_hall")
+        return queryset
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return PerformanceListSerializer
+        if self.action == "retrieve":
+            return PerformanceDetailSerializer
+        return PerformanceSerializer
 
-class ActorViewSet(BaseViewSet):
+    @action(detail=False, methods=["get"])
+    def calendar(self, request):
+        """Performances of ?from= to ?to= (optionally one ?hall=) by day."""
+        serializer = PerformanceCalendarQuerySerializer(
+            data=request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        return Response(
+            get_calendar(query["from"], query["to"], query.get("hall"))
+        )
+
+    @action(detail=True, methods=["get"], url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        performance = self.get_object()
+        serializer = SeatMapSerializer(get_seat_map(performance))
+        data = {"performance": performance.id, **serializer.data}
+        return Response(data)
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def holds(self, request, pk=None):
+        performance = self.get_object()
+        context = self.get_serializer_context()
+        context["performance"] = performance
+        serializer = SeatHoldSerializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(performance=performance, user_id=request.user.id)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class ActorViewSet(CachedResponseMixin, BaseViewSet):
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
 
 
-class GenreViewSet(BaseViewSet):
+class GenreViewSet(CachedResponseMixin, BaseViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
 
 
-class ReservationViewSet(BaseViewSet):
+class SearchView(APIView):
+    """Plays and actors matching ?q=, best matches first."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        serializer = SearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        page, page_size = query["page"], query["page_size"]
+        # One extra hit tells whether there is a next page without counting
+        hits = search(
+            query["q"],
+            query.get("type"),
+            offset=(page - 1) * page_size,
+            limit=page_size + 1,
+        )
+        url = request.build_absolute_uri()
+        return Response(
+            {
+                "next": (
+                    replace_query_param(url, "page", page + 1)
+                    if len(hits) > page_size
+                    else None
+                ),
+                "previous": (
+                    replace_query_param(url, "page", page - 1)
+                    if page > 1
+                    else None
+                ),
+                "results": hits[:page_size],
+            }
+        )
+
+
+class AutocompleteView(APIView):
+    """
+    Plays and actors whose title or name has a word starting with ?q=,
+    answered from the in-process prefix index.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    # Clients ask once per keystroke, so suggestions get their own buckets
+    throttle_rates = {"anon": "1200/min"}
+
+    def get(self, request):
+        serializer = AutocompleteQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        matches = get_index().complete(
+            query["q"], query["limit"], query.get("type")
+        )
+        return Response(
+            {
+                "results": [
+                    {"type": kind, "id": object_id, "label": label}
+                    for kind, object_id, label in matches
+                ]
+            }
+        )
+
+
+class ReservationViewSet(
+    IdempotentCreateMixin,
+    BookingThrottleMixin,
+    StreamingExportMixin,
+    ValuesListMixin,
+    UserScopedViewSet,
+):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    values_serializer_class = ReservationListValuesSerializer
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ReservationFilter
+    export_columns = (
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("user", "user_id"),
+        ("username", "user__username"),
+        ("tickets_count", "tickets_count"),
+    )
+
+    def get_export_queryset(self):
+        return (
+            super()
+            .get_export_queryset()
+            .annotate(tickets_count=Count("tickets"))
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            # ReservationListValuesSerializer reads the tickets itself
+            return queryset.annotate(tickets_count=Count("tickets"))
+        if self.action == "retrieve":
+            return queryset.prefetch_related("tickets")
+        if self.action == "mine":
+            tickets = Ticket.objects.select_related(
+                "performance__play", "performance__theatre_hall"
+            ).defer(
+                "performance__seat_bitmap", "performance__theatre_hall__layout"
+            )
+            return queryset.filter(
+                user_id=self.request.user.id
+            ).prefetch_related(Prefetch("tickets", queryset=tickets))
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return ReservationListSerializer
+        if self.action == "mine":
+            return UserReservationSerializer
+        return ReservationSerializer
+
+    def perform_create(self, serializer):
+        self.check_owner(serializer.validated_data["user"].id)
+        serializer.save()
 
+    def perform_update(self, serializer):
+        if "user" in serializer.validated_data:
+            self.check_owner(serializer.validated_data["user"].id)
+        serializer.save()
 
-class TicketViewSet(BaseViewSet):
+    @action(detail=False, methods=["get"])
+    def mine(self, request):
+        """Reservations of the current user with tickets and performances."""
+        return self.list(request)
+
+
+class TicketViewSet(
+    IdempotentCreateMixin,
+    BookingThrottleMixin,
+    StreamingExportMixin,
+    ValuesListMixin,
+    UserScopedViewSet,
+):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    values_serializer_class = TicketListValuesSerializer
+    user_lookup = "reservation__user_id"
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TicketFilter
+    export_columns = (
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("reservation", "reservation_id"),
+        ("user", "reservation__user_id"),
+        ("performance", "performance_id"),
+        ("play_title", "performance__play__title"),
+        ("theatre_hall_name", "performance__theatre_hall__name"),
+        ("show_time", "performance__show_time"),
+        ("row", "row"),
+        ("seat", "seat"),
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            return queryset.select_related(
+                "performance__play", "performance__theatre_hall"
+            ).defer(
+                "performance__seat_bitmap", "performance__theatre_hall__layout"
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in ("list", "retrieve"):
+            return TicketListSerializer
+        return TicketSerializer
+
+    def perform_create(self, serializer):
+        self.check_owner(serializer.validated_data["reservation"].user_id)
+        serializer.save()
+
+    def perform_update(self, serializer):
+        if "reservation" in serializer.validated_data:
+            self.check_owner(serializer.validated_data["reservation"].user_id)
+        serializer.save()
+
+
+class SeatHoldViewSet(
+    BookingThrottleMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    serializer_class = SeatHoldSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    booking_actions = ("confirm",)
+
+    def get_queryset(self):
+        return SeatHold.objects.filter(
+            user_id=self.request.user.id, expires_at__gt=timezone.now()
+        ).prefetch_related("seats")
+
+    @action(detail=True, methods=["post"])
+    def confirm(self, request, pk=None):
+        hold = self.get_object()
+        try:
+            reservation = confirm_hold(hold.id, request.user.id)
+        except (HoldExpired, SeatTaken) as error:
+            raise ValidationError(str(error))
+        return Response(
+            ReservationSerializer(reservation).data,
+            status=status.HTTP_201_CREATED,
+        )
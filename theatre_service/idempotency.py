@@ -0,0 +1,240 @@
+"""
+Idempotency-Key support for create endpoints. The first response to a
+POST carrying the header is stored under the key, the client and the
+path, and a retry with the same key gets that response back, marked with
+an Idempotent-Replayed header, without running the view again. A retry
+that arrives while the first request is still running waits for it
+instead of racing it, and reusing a key for a different body is refused.
+
+Responses are kept for IDEMPOTENCY["OPTIONS"]["timeout"] seconds in the
+"shared" Django cache alias (DjangoIdempotencyStore), so a retry finds
+them whichever worker it reaches. LocalIdempotencyStore keeps them in
+process memory instead and only fits a single worker. Requests that
+raise, such as invalid ones, are not stored.
+
+Keys are scoped to the user, or to the client address for anonymous
+requests, and to the path.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, RawPostDataException
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.throttling import BaseThrottle
+
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+StoredResponse = namedtuple(
+    "StoredResponse", ("fingerprint", "status_code", "content", "content_type")
+)
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is in progress."
+    default_code = "idempotency_key_in_use"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was used for another request."
+    default_code = "idempotency_key_reused"
+
+
+class LocalIdempotencyStore:
+    """Responses private to every worker, in an LRU cache with a TTL."""
+
+    def __init__(self, maxsize=10_000, timeout=86_400, wait_timeout=10):
+        self._responses = TTLCache(maxsize=maxsize, ttl=timeout)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._wait_timeout = wait_timeout
+
+    def get(self, key):
+        with self._lock:
+            return self._responses.get(key)
+
+    def claim(self, key):
+        """Whether the caller should run the request for key."""
+        with self._lock:
+            if key in self._responses or key in self._in_flight:
+                return False
+            self._in_flight[key] = threading.Event()
+            return True
+
+    def wait(self, key):
+        """The response for key once a running request has finished."""
+        with self._lock:
+            event = self._in_flight.get(key)
+        if event is not None:
+            event.wait(self._wait_timeout)
+        return self.get(key)
+
+    def complete(self, key, response):
+        """Store the response of a claimed key, None to give it up."""
+        with self._lock:
+            if response is not None:
+                self._responses[key] = response
+            event = self._in_flight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+
+
+class DjangoIdempotencyStore:
+    """
+    Responses stored in a Django cache alias, shared between workers.
+    Running requests hold a lock entry that expires after wait_timeout,
+    and duplicates poll for the response until then.
+    """
+
+    poll_interval = 0.05
+
+    def __init__(self, alias="shared", timeout=86_400, wait_timeout=10):
+        self._cache = caches[alias]
+        self._timeout = timeout
+        self._wait_timeout = wait_timeout
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def claim(self, key):
+        if self._cache.get(key) is not None:
+            return False
+        if not self._cache.add(f"{key}:lock", 1, self._wait_timeout):
+            return False
+        # The response may have been stored just before the lock was taken
+        if self._cache.get(key) is not None:
+            self._cache.delete(f"{key}:lock")
+            return False
+        return True
+
+    def wait(self, key):
+        deadline = time.monotonic() + self._wait_timeout
+        while True:
+            response = self._cache.get(key)
+            if (
+                response is not None
+                or self._cache.get(f"{key}:lock") is None
+                or time.monotonic() > deadline
+            ):
+                return response
+            time.sleep(self.poll_interval)
+
+    def complete(self, key, response):
+        if response is not None:
+            self._cache.set(key, response, self._timeout)
+        self._cache.delete(f"{key}:lock")
+
+    def clear(self):
+        self._cache.clear()
+
+
+_idempotency_store = None
+
+
+def get_idempotency_store():
+    global _idempotency_store
+    if _idempotency_store is None:
+        config = settings.IDEMPOTENCY
+        backend = import_string(config["BACKEND"])
+        _idempotency_store = backend(**config.get("OPTIONS", {}))
+    return _idempotency_store
+
+
+@receiver(setting_changed)
+def reset_idempotency_store(setting, **kwargs):
+    global _idempotency_store
+    if setting == "IDEMPOTENCY":
+        _idempotency_store = None
+
+
+def _fingerprint(request):
+    try:
+        body = request.body
+    except RawPostDataException:
+        # The body was already parsed, so compare what it parsed to
+        body = repr(sorted(request.data.items())).encode()
+    return hashlib.sha256(body).hexdigest()
+
+
+def _replay(stored, fingerprint):
+    if stored.fingerprint != fingerprint:
+        raise IdempotencyKeyReused()
+    response = HttpResponse(
+        stored.content,
+        content_type=stored.content_type,
+        status=stored.status_code,
+    )
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+class IdempotentCreateMixin:
+    """Replays the stored response of creates repeated with a key."""
+
+    def create(self, request, *args, **kwargs):
+        handler = functools.partial(super().create, request, *args, **kwargs)
+        idempotency_key = request.headers.get(HEADER)
+        if idempotency_key is None:
+            return handler()
+        if not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            raise ValidationError(
+                {HEADER: f"Use 1 to {MAX_KEY_LENGTH} characters."}
+            )
+
+        if request.user.is_authenticated:
+            client = f"user:{request.user.id}"
+        else:
+            # Anonymous clients picking the same key must not share it
+            client = f"anon:{BaseThrottle().get_ident(request)}"
+        key = "idempotency:" + hashlib.md5(
+            f"{client} {request.path} {idempotency_key}".encode()
+        ).hexdigest()
+        fingerprint = _fingerprint(request)
+        store = get_idempotency_store()
+
+        stored = store.get(key)
+        if stored is None and not store.claim(key):
+            stored = store.wait(key)
+            # The first request failed, so this one may run instead
+            if stored is None and not store.claim(key):
+                raise IdempotencyKeyInUse()
+        if stored is not None:
+            return _replay(stored, fingerprint)
+
+        try:
+            response = handler()
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+        except BaseException:
+            store.complete(key, None)
+            raise
+        store.complete(
+            key,
+            StoredResponse(
+                fingerprint,
+                response.status_code,
+                response.content,
+                response["Content-Type"],
+            ),
+        )
+        return response
@@ -0,0 +1,215 @@
+"""
+Opt-in request instrumentation. RequestMetricsMiddleware measures the
+wall time, database queries and time, and response rendering time of
+every request, reports them in a Server-Timing header and a JSON log line,
+and feeds per-route prometheus_client histograms that MetricsView serves
+in the Prometheus text format. Serializers are not timed on their own:
+views read serializer.data before the response exists, so that time is
+part of "app", the wall time left after the queries and the rendering.
+
+With PROMETHEUS_MULTIPROC_DIR set, as gunicorn.conf.py does when
+REQUEST_METRICS is on, every worker writes its histograms to files in
+that directory and MetricsView adds up all of them, so a scrape sees the
+whole server whichever worker answers it.
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.db import connections
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class MetricsRegistry:
+    METRICS = {
+        "request_duration_seconds": (
+            "Wall time of requests.",
+            DURATION_BUCKETS,
+        ),
+        "db_duration_seconds": (
+            "Time spent in database queries per request.",
+            DURATION_BUCKETS,
+        ),
+        "db_queries": ("Database queries per request.", QUERY_BUCKETS),
+        "response_render_duration_seconds": (
+            "Time spent rendering response bodies, after the view built "
+            "the data.",
+            DURATION_BUCKETS,
+        ),
+        "app_duration_seconds": (
+            "Wall time of requests outside database queries and "
+            "rendering, mostly views building data with serializers.",
+            DURATION_BUCKETS,
+        ),
+    }
+    LABELS = ("method", "route")
+
+    def __init__(self, prefix="theatre"):
+        self.prefix = prefix
+        self.clear()
+
+    def clear(self):
+        self._registry = CollectorRegistry()
+        self._histograms = {
+            name: Histogram(
+                f"{self.prefix}_{name}",
+                description,
+                self.LABELS,
+                buckets=buckets,
+                registry=self._registry,
+            )
+            for name, (description, buckets) in self.METRICS.items()
+        }
+
+    def observe(self, labels, values):
+        for name, value in values.items():
+            self._histograms[name].labels(**labels).observe(value)
+
+    def render(self):
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            registry = CollectorRegistry()
+            MultiProcessCollector(registry)
+        else:
+            registry = self._registry
+        return generate_latest(registry)
+
+
+registry = MetricsRegistry()
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class RequestMetricsMiddleware:
+    """Runs in the mode of the handler, so ASGI requests stay async."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = QueryTimer()
+        request._render_duration = 0.0
+        start = time.perf_counter()
+        with self.timed_queries(timer):
+            response = self.get_response(request)
+        return self.report(request, response, timer, start)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        request._render_duration = 0.0
+        start = time.perf_counter()
+        # Connections belong to threads, so the wrappers go on those of
+        # the thread that runs the request's sync_to_async calls
+        stack = await sync_to_async(self.timed_queries)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, timer, start)
+
+    def timed_queries(self, timer):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        return stack
+
+    def report(self, request, response, timer, start):
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        route = match.view_name if match else "unmatched"
+        render = request._render_duration
+        app = max(duration - timer.duration - render, 0.0)
+        response["Server-Timing"] = (
+            f'db;dur={timer.duration * 1000:.2f};desc="{timer.count} queries"'
+            f", render;dur={render * 1000:.2f}"
+            f", app;dur={app * 1000:.2f}"
+            f", total;dur={duration * 1000:.2f}"
+        )
+        registry.observe(
+            {"route": route, "method": request.method},
+            {
+                "request_duration_seconds": duration,
+                "db_duration_seconds": timer.duration,
+                "db_queries": timer.count,
+                "response_render_duration_seconds": render,
+                "app_duration_seconds": app,
+            },
+        )
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "route": route,
+                    "status": response.status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "db_queries": timer.count,
+                    "db_ms": round(timer.duration * 1000, 2),
+                    "render_ms": round(render * 1000, 2),
+                    "app_ms": round(app * 1000, 2),
+                }
+            )
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def finish_render(response):
+            request._render_duration += time.perf_counter() - start
+
+        response.add_post_render_callback(finish_render)
+        return response
+
+
+class MetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            registry.render(), content_type=CONTENT_TYPE_LATEST
+        )
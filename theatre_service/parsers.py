@@ -0,0 +1,30 @@
+"""
+JSON parser backed by orjson, falling back to DRF's JSONParser for
+request bodies that are not UTF-8, non-strict JSON settings and installs
+without orjson.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from theatre_service.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if (
+            orjson is None
+            or not self.strict
+            or encoding.lower().replace("-", "") != "utf8"
+        ):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,47 @@
+"""
+JSON renderer backed by orjson. The output is byte for byte what DRF's
+JSONRenderer produces with the default COMPACT_JSON and UNICODE_JSON
+settings; other settings, indented output (e.g. the browsable API) and
+installs without orjson go through the standard library renderer.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Dates, times, Decimals, lazy strings and querysets are handed back to
+# DRF's encoder so they are encoded the way JSONRenderer encodes them
+_default = JSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            # Integers wider than 64 bits and other values orjson rejects
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, so the output is safe to embed in
+        # a <script> tag
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 import os
+from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -30,9 +31,11 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your_fallback_secret_key")
 
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv("DEBUG", "true") == "true"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host
+]
 
 
 # Application definition
@@ -45,7 +48,9 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "django_filters",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "rest_framework.authtoken",
     "theatre_service",
     "theatre",
@@ -55,11 +60,129 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.TokenAuthentication",
+        "rest_framework_simplejwt.authentication."
+        "JWTStatelessUserAuthentication",
+        "user.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_PAGINATION_CLASS": (
+        "theatre.pagination.StandardCursorPagination"
+    ),
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "20")),
+    # orjson-backed JSON with the same output as DRF's JSONRenderer
+    "DEFAULT_RENDERER_CLASSES": (
+        "theatre_service.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "theatre_service.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    # Token buckets from theatre_service.throttling; booking applies to
+    # reservation and ticket writes, seat holds and their confirmation
+    "DEFAULT_THROTTLE_CLASSES": (
+        "theatre_service.throttling.AnonBucketThrottle",
+        "theatre_service.throttling.UserBucketThrottle",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.getenv("THROTTLE_ANON_RATE", "300/min"),
+        "user": os.getenv("THROTTLE_USER_RATE", "1200/min"),
+        "booking": os.getenv("THROTTLE_BOOKING_RATE", "30/min"),
+    },
+}
+
+# JWT access tokens carry the user claims, so the theatre API can
+# authenticate them without touching the database. Refreshing reloads
+# the user, and logout blacklists the refresh token.
+SIMPLE_JWT = {
+    "ACCESS_TOKEN_LIFETIME": timedelta(
+        minutes=int(os.getenv("JWT_ACCESS_TOKEN_MINUTES", "5"))
+    ),
+    "REFRESH_TOKEN_LIFETIME": timedelta(
+        days=int(os.getenv("JWT_REFRESH_TOKEN_DAYS", "1"))
+    ),
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "user.serializers.TokenObtainPairWithClaimsSerializer"
+    ),
+    "TOKEN_REFRESH_SERIALIZER": (
+        "user.serializers.TokenRefreshWithClaimsSerializer"
+    ),
+}
+
+# DRF token -> user entries kept for TIMEOUT seconds in a cache alias.
+# It must be shared by the workers, or a logged out token stays valid on
+# the workers that cached it.
+TOKEN_AUTH_CACHE = {
+    "ALIAS": os.getenv("TOKEN_AUTH_CACHE_ALIAS", "shared"),
+    "TIMEOUT": int(os.getenv("TOKEN_AUTH_CACHE_TIMEOUT", "60")),
+}
+
+# Minutes seats stay held during checkout before they are released
+SEAT_HOLD_MINUTES = int(os.getenv("SEAT_HOLD_MINUTES", "10"))
+
+# Seconds before a worker rebuilds its autocomplete index in the
+# background, picking up play and actor changes saved by other processes
+AUTOCOMPLETE_REFRESH = int(os.getenv("AUTOCOMPLETE_REFRESH", "300"))
+
+# Throttle buckets. Use "theatre_service.throttling.DjangoBucketStore"
+# with an "alias" option to share them between workers.
+THROTTLE_BUCKETS = {
+    "BACKEND": os.getenv(
+        "THROTTLE_BUCKETS_BACKEND",
+        "theatre_service.throttling.LocalBucketStore",
+    ),
+}
+
+# "default" stays private to every worker. "shared" is seen by all the
+# workers, in the database unless SHARED_CACHE_BACKEND points elsewhere,
+# e.g. django.core.cache.backends.redis.RedisCache with a redis:// URL.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": os.getenv(
+            "SHARED_CACHE_BACKEND",
+            "django.core.cache.backends.db.DatabaseCache",
+        ),
+        "LOCATION": os.getenv("SHARED_CACHE_LOCATION", "shared_cache"),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(
+                os.getenv("SHARED_CACHE_MAX_ENTRIES", "100000")
+            ),
+        },
+    },
+}
+
+# Responses of reservation, ticket and registration POSTs sent with an
+# Idempotency-Key header, replayed to retries for "timeout" seconds. The
+# store must be shared by all the workers, or a retry landing on another
+# worker books again; LocalIdempotencyStore is only fit for a single
+# process.
+IDEMPOTENCY = {
+    "BACKEND": os.getenv(
+        "IDEMPOTENCY_BACKEND",
+        "theatre_service.idempotency.DjangoIdempotencyStore",
+    ),
+    "OPTIONS": {
+        "timeout": int(os.getenv("IDEMPOTENCY_TIMEOUT", "86400")),
+    },
+}
+
+# Rendered responses of catalogue endpoints (halls, plays, actors, genres)
+# and the days of the performance calendar. DjangoResponseCache keeps them
+# in the "shared" cache, so a write seen by one worker invalidates them for
+# all of them; LocalResponseCache is only fit for a single process.
+RESPONSE_CACHE = {
+    "BACKEND": os.getenv(
+        "RESPONSE_CACHE_BACKEND", "theatre.cache.DjangoResponseCache"
+    ),
+    "OPTIONS": {
+        "timeout": int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300")),
+    },
 }
 
 MIDDLEWARE = [
@@ -72,6 +195,25 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Server-Timing headers, JSON request logs and Prometheus histograms
+# served to staff at /metrics/
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "false") == "true"
+if REQUEST_METRICS:
+    MIDDLEWARE.insert(0, "theatre_service.metrics.RequestMetricsMiddleware")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "theatre_service.metrics": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
 ROOT_URLCONF = "theatre_service.urls"
 
 TEMPLATES = [
@@ -111,9 +253,35 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "theatre"),
         "HOST": os.getenv("POSTGRES_HOST", POSTGRES_HOST),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": int(os.getenv("POSTGRES_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": (
+            os.getenv("POSTGRES_CONN_HEALTH_CHECKS", "false") == "true"
+        ),
     }
 }
 
+# Opt-in psycopg 3 connection pool. It replaces persistent connections,
+# so CONN_MAX_AGE has to stay 0 while it is enabled; CONN_HEALTH_CHECKS
+# makes the pool check connections before handing them out.
+if os.getenv("POSTGRES_POOL", "false") == "true":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", "10")),
+        }
+    }
+
+# Local stand-in for running the service or benchmarks without Postgres
+if os.getenv("DB_ENGINE") == "sqlite":
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": DATABASES["default"]["CONN_MAX_AGE"],
+        "CONN_HEALTH_CHECKS": DATABASES["default"]["CONN_HEALTH_CHECKS"],
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
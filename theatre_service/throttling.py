@@ -0,0 +1,197 @@
+"""
+Token-bucket request throttling. A "num/period" rate gives every client a
+bucket of num tokens that refills continuously at num tokens per period;
+each request takes one token and is refused with a Retry-After header
+while the bucket is empty, so short bursts pass and steady floods do not.
+
+Buckets live in process memory by default (LocalBucketStore), so a check
+costs a dictionary lookup under a lock and no database query. Set the
+THROTTLE_BUCKETS backend to DjangoBucketStore to share them between
+workers through a Django cache alias.
+
+Views add or override rates per scope with a throttle_rates attribute,
+e.g. {"anon": "300/min"}; such a view gets buckets of its own.
+"""
+
+import math
+import threading
+import time
+from functools import lru_cache
+
+from cachetools import LRUCache
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """(requests, seconds) of a "100/min" style rate."""
+    num, period = rate.split("/")
+    return int(num), DURATIONS[period[0]]
+
+
+def take_token(bucket, capacity, refill, now):
+    """
+    Take a token from bucket, a (tokens, updated_at) pair or None for a
+    full one. Returns the new bucket and the seconds to wait, 0 when the
+    token was taken.
+    """
+    if bucket is None:
+        tokens = capacity
+    else:
+        tokens, updated_at = bucket
+        tokens = min(capacity, tokens + (now - updated_at) * refill)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / refill
+
+
+class LocalBucketStore:
+    """
+    Buckets private to every worker. Past maxsize the least recently used
+    bucket is dropped, which is most likely full again anyway.
+    """
+
+    def __init__(self, maxsize=100_000):
+        self._buckets = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill, now):
+        with self._lock:
+            self._buckets[key], wait = take_token(
+                self._buckets.get(key), capacity, refill, now
+            )
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class DjangoBucketStore:
+    """
+    Buckets stored in a Django cache alias, shared between workers.
+    Reading and writing a bucket are separate cache calls, so concurrent
+    requests of one client may now and then both get the last token.
+    """
+
+    def __init__(self, alias="default"):
+        self._cache = caches[alias]
+
+    def take(self, key, capacity, refill, now):
+        bucket, wait = take_token(self._cache.get(key), capacity, refill, now)
+        # Expire once full again, a missing bucket counts as full
+        timeout = math.ceil((capacity - bucket[0]) / refill) + 1
+        self._cache.set(key, bucket, timeout)
+        return wait
+
+    def clear(self):
+        self._cache.clear()
+
+
+_bucket_store = None
+
+
+def get_bucket_store():
+    global _bucket_store
+    if _bucket_store is None:
+        config = settings.THROTTLE_BUCKETS
+        backend = import_string(config["BACKEND"])
+        _bucket_store = backend(**config.get("OPTIONS", {}))
+    return _bucket_store
+
+
+@receiver(setting_changed)
+def reset_bucket_store(setting, **kwargs):
+    global _bucket_store
+    if setting == "THROTTLE_BUCKETS":
+        _bucket_store = None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle of one scope, rated by DEFAULT_THROTTLE_RATES."""
+
+    scope = None
+    timer = time.time
+
+    def get_ident_key(self, request):
+        """Who the bucket belongs to, None to skip throttling."""
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        view_rates = getattr(view, "throttle_rates", {})
+        if self.scope in view_rates:
+            rate = view_rates[self.scope]
+            prefix = f"throttle:{self.scope}:{type(view).__name__}"
+        else:
+            rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+            prefix = f"throttle:{self.scope}"
+        ident = self.get_ident_key(request)
+        if rate is None or ident is None:
+            return True
+
+        num, duration = parse_rate(rate)
+        wait = get_bucket_store().take(
+            f"{prefix}:{ident}", num, num / duration, self.timer()
+        )
+        if wait:
+            self.wait_time = math.ceil(wait)
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class AnonBucketThrottle(TokenBucketThrottle):
+    """Anonymous requests, one bucket per client address."""
+
+    scope = "anon"
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    """Authenticated requests, one bucket per user."""
+
+    scope = "user"
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.id
+        return None
+
+
+class BookingBucketThrottle(TokenBucketThrottle):
+    """Booking writes, on top of the anon or user scope."""
+
+    scope = "booking"
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.id}"
+        return self.get_ident(request)
+
+
+class BookingThrottleMixin:
+    """Applies the booking scope to the booking_actions of a viewset."""
+
+    booking_actions = ("create", "update", "partial_update")
+
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action in self.booking_actions:
+            throttles.append(BookingBucketThrottle())
+        return throttles
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenUserCache:
+    """
+    DRF token keys mapped to (user, token) in the Django cache alias of
+    TOKEN_AUTH_CACHE, shared by all the workers, so a revoked token is
+    refused by every one of them at once. Each get unpickles fresh
+    instances, which a request may change without touching other ones.
+    """
+
+    def _cache(self):
+        return caches[settings.TOKEN_AUTH_CACHE["ALIAS"]]
+
+    def get(self, key):
+        return self._cache().get(f"auth-token:{key}")
+
+    def set(self, key, user, token):
+        self._cache().set_many(
+            {
+                f"auth-token:{key}": (user, token),
+                f"auth-token-user:{user.pk}": key,
+            },
+            settings.TOKEN_AUTH_CACHE["TIMEOUT"],
+        )
+
+    def invalidate(self, key):
+        self._cache().delete(f"auth-token:{key}")
+
+    def invalidate_user(self, user_id):
+        """Call after changing users with QuerySet.update(), no signals."""
+        cache = self._cache()
+        key = cache.get(f"auth-token-user:{user_id}")
+        if key is not None:
+            cache.delete_many(
+                [f"auth-token:{key}", f"auth-token-user:{user_id}"]
+            )
+
+    def clear(self):
+        self._cache().clear()
+
+
+token_user_cache = TokenUserCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    DRF token authentication that skips the token/user query for keys
+    seen within the last TOKEN_AUTH_CACHE["TIMEOUT"] seconds. Entries are
+    dropped when the token is deleted (logout) or its user is saved
+    (e.g. password change).
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_user_cache.get(key)
+        if cached is not None:
+            return cached
+        user, token = super().authenticate_credentials(key)
+        token_user_cache.set(key, user, token)
+        return user, token
@@ -1,5 +1,11 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -31,3 +37,44 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+def add_user_claims(token, user):
+    """The claims the theatre API needs to authorize without the DB."""
+    token["username"] = user.username
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    return token
+
+
+class TokenObtainPairWithClaimsSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class TokenRefreshWithClaimsSerializer(TokenRefreshSerializer):
+    """
+    Issues access tokens with the claims of the user as they are now, so
+    deactivated users and revoked staff rights do not outlive a refresh.
+    """
+
+    default_error_messages = {
+        "no_active_account": "No active account found for the given token."
+    }
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.get(jwt_settings.USER_ID_CLAIM)
+        user = (
+            get_user_model()
+            .objects.filter(**{jwt_settings.USER_ID_FIELD: user_id})
+            .first()
+        )
+        if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account",
+            )
+        add_user_claims(refresh, user)
+        return super().validate({"refresh": str(refresh)})
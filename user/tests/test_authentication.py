@@ -0,0 +1,147 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import token_user_cache
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+    def setUp(self):
+        token_user_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("theatre:genres-list")
+
+    def test_repeated_requests_skip_token_lookup(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + "?page_size=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            [query for query in queries if "authtoken_token" in query["sql"]]
+        )
+
+    def test_entries_are_shared_and_fresh(self):
+        self.client.get(self.url)
+        # Other workers read the same entry, each get a user of its own
+        self.assertIsNotNone(
+            caches["shared"].get(f"auth-token:{self.token.key}")
+        )
+        first, _ = token_user_cache.get(self.token.key)
+        second, _ = token_user_cache.get(self.token.key)
+        self.assertEqual(first, self.user)
+        self.assertIsNot(first, second)
+
+    def test_bulk_update_is_invalidated_explicitly(self):
+        self.client.get(self.url)
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False
+        )
+        token_user_cache.invalidate_user(self.user.pk)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_invalidates_token(self):
+        self.client.get(self.url)
+        response = self.client.post(reverse("user:logout"))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(self.url, {"name": "Drama"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_change_invalidates_cached_user(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class JWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="testpassword", is_staff=True
+        )
+        response = self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.access = response.data["access"]
+        self.refresh = response.data["refresh"]
+
+    @override_settings(
+        RESPONSE_CACHE={"BACKEND": "theatre.cache.LocalResponseCache"}
+    )
+    def test_theatre_api_is_stateless(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        url = reverse("theatre:genres-list")
+        with self.assertNumQueries(1):
+            response = self.client.post(url, {"name": "Drama"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_refresh_token(self):
+        response = self.client.post(
+            reverse("user:token_refresh"), {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+
+    def test_refresh_reloads_the_user(self):
+        self.user.is_staff = False
+        self.user.username = "renamed"
+        self.user.save()
+
+        response = self.client.post(
+            reverse("user:token_refresh"), {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        access = AccessToken(response.data["access"])
+        self.assertEqual(access["username"], "renamed")
+        self.assertFalse(access["is_staff"])
+
+    def test_refresh_refused_for_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.post(
+            reverse("user:token_refresh"), {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_blacklists_refresh_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        response = self.client.post(
+            reverse("user:logout"), {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(
+            reverse("user:token_refresh"), {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_with_invalid_refresh_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        response = self.client.post(
+            reverse("user:logout"), {"refresh": "invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_manage_user_with_jwt(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        response = self.client.get(reverse("user:manage_user"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "testuser")
@@ -1,6 +1,16 @@
 from django.test import SimpleTestCase
 from django.urls import reverse, resolve
-from user.views import CreateUserView, LoginUserView, ManageUserView
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView,
+    TokenRefreshView,
+)
+
+from user.views import (
+    CreateUserView,
+    LoginUserView,
+    LogoutUserView,
+    ManageUserView,
+)
 
 
 class TestURLs(SimpleTestCase):
@@ -16,3 +26,15 @@ class TestURLs(SimpleTestCase):
     def test_manage_user_url(self):
         url = reverse("user:manage_user")
         self.assertEqual(resolve(url).func.view_class, ManageUserView)
+
+    def test_logout_user_url(self):
+        url = reverse("user:logout")
+        self.assertEqual(resolve(url).func.view_class, LogoutUserView)
+
+    def test_token_obtain_pair_url(self):
+        url = reverse("user:token_obtain_pair")
+        self.assertEqual(resolve(url).func.view_class, TokenObtainPairView)
+
+    def test_token_refresh_url(self):
+        url = reverse("user:token_refresh")
+        self.assertEqual(resolve(url).func.view_class, TokenRefreshView)
@@ -22,6 +22,38 @@ class UserViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data["username"], "newuser")
 
+    def test_create_user_retry_is_replayed(self):
+        url = reverse("user:create")
+        data = {"username": "newuser", "password": "newpassword"}
+        headers = {"Idempotency-Key": "register-newuser"}
+        first = self.client.post(url, data, format="json", headers=headers)
+        retry = self.client.post(url, data, format="json", headers=headers)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(
+            self.User.objects.filter(username="newuser").count(), 1
+        )
+
+    def test_anonymous_retry_keys_are_scoped_to_the_client(self):
+        url = reverse("user:create")
+        headers = {"Idempotency-Key": "register"}
+        for username, address in (
+            ("first", "10.0.0.1"),
+            ("second", "10.0.0.2"),
+        ):
+            response = APIClient(REMOTE_ADDR=address).post(
+                url,
+                {"username": username, "password": "newpassword"},
+                format="json",
+                headers=headers,
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(
+            self.User.objects.filter(username__in=("first", "second")).count(),
+            2,
+        )
+
     def test_login_user(self):
         url = reverse("user:get_token")
         data = {"username": "testuser", "password": "testpassword"}
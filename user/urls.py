@@ -1,11 +1,25 @@
 from django.urls import path
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView,
+    TokenRefreshView,
+    TokenVerifyView,
+)
 
-from user.views import CreateUserView, LoginUserView, ManageUserView
+from user.views import (
+    CreateUserView,
+    LoginUserView,
+    LogoutUserView,
+    ManageUserView,
+)
 
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="create"),
     path("login/", LoginUserView.as_view(), name="get_token"),
+    path("logout/", LogoutUserView.as_view(), name="logout"),
+    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
     path("me/", ManageUserView.as_view(), name="manage_user"),
 ]
 
@@ -1,12 +1,20 @@
-from rest_framework import generics, authentication, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenBlacklistSerializer
 
+from theatre_service.idempotency import IdempotentCreateMixin
+from user.authentication import CachedTokenAuthentication
 from user.serializers import UserSerializer
 
 
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(IdempotentCreateMixin, generics.CreateAPIView):
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
 
@@ -15,9 +23,30 @@ class LoginUserView(ObtainAuthToken):
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
 
+class LogoutUserView(APIView):
+    """
+    Deletes the DRF token of the user and blacklists the JWT refresh
+    token sent as "refresh", if any. Access tokens already issued stay
+    valid until they expire.
+    """
+
+    authentication_classes = (JWTAuthentication, CachedTokenAuthentication)
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request):
+        if "refresh" in request.data:
+            serializer = TokenBlacklistSerializer(data=request.data)
+            try:
+                serializer.is_valid(raise_exception=True)
+            except TokenError as error:
+                raise InvalidToken(error.args[0])
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (JWTAuthentication, CachedTokenAuthentication)
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_object(self):